@@ -0,0 +1,87 @@
+"""Solve times of the NxN engines on generated 16x16 / 25x25 puzzles.
+
+Puzzles are built reproducibly from ``--seed``: a random full grid (the
+diagonal boxes are filled with random permutations and completed by
+``bits``), then clues are removed in random order while the solution stays
+unique, down to ``--clues`` (0: until no clue can be removed, i.e. a
+minimal puzzle). Each puzzle is solved by every ``--method``; the script
+checks that they agree and prints nodes and best-of-``--repeat`` wall time.
+
+Building minimal puzzles takes a solve per cell, so it is slow for 25x25;
+give a clue target there.
+
+Usage: python benchmarks/nxn_boards.py --size 16 --clues 120 0 --count 4 --method bits cp
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from sudoku_solver.board.geometry import geometry
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.solver import SOLVERS, solve_bitset
+from sudoku_solver.verify.verify import verify
+
+
+def full_grid(size: int, rng: random.Random) -> List[List[int]]:
+    box = geometry(size).box
+    cells = [[0] * size for _ in range(size)]
+    for b in range(box):
+        for k, v in enumerate(rng.sample(range(1, size + 1), size)):
+            cells[b * box + k // box][b * box + k % box] = v
+    sr, _ = solve_bitset(Grid(cells), max_solutions=1)
+    return sr.solution
+
+
+def make_puzzle(size: int, clues: int, rng: random.Random) -> List[List[int]]:
+    cells = full_grid(size, rng)
+    order = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(order)
+    left = size * size
+    for r, c in order:
+        if left <= clues:
+            break
+        v, cells[r][c] = cells[r][c], 0
+        sr, _ = solve_bitset(Grid(cells))
+        if sr.status == "unique":
+            left -= 1
+        else:
+            cells[r][c] = v
+    return cells
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size", type=int, default=16, choices=[4, 9, 16, 25])
+    ap.add_argument("--clues", type=int, nargs="+", default=[120, 0])
+    ap.add_argument("--count", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--method", nargs="+", default=["bits"], choices=sorted(SOLVERS))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    for clues in args.clues:
+        for i in range(args.count):
+            t0 = time.perf_counter()
+            cells = make_puzzle(args.size, clues, random.Random(f"{args.seed}/{clues}/{i}"))
+            built = time.perf_counter() - t0
+            n = sum(1 for row in cells for v in row if v)
+            line = [f"{args.size}x{args.size} clues={n:<4d} build={built:.1f}s"]
+            expected = None
+            for method in args.method:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    sr, _ = SOLVERS[method](Grid([row[:] for row in cells]))
+                    best = min(best, time.perf_counter() - t0)
+                assert sr.status == "unique" and verify(Grid(cells), sr.solution), method
+                assert expected is None or sr.solution == expected, method
+                expected = sr.solution
+                line.append(f"{method}: {best * 1000:8.1f}ms nodes={sr.stats.calls}")
+            print("  ".join(line), flush=True)
+
+
+if __name__ == "__main__":
+    main()
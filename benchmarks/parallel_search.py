@@ -0,0 +1,45 @@
+"""Scaling of the parallel single-puzzle search (`solve --jobs N`).
+
+Solves each puzzle with serial ``bt`` and with `solve_parallel` for every
+``--jobs`` value, checks that status, solution and node count agree, and
+prints wall time, speedup over serial and worker balance (busiest worker's
+nodes / mean). Only hard puzzles are interesting: anything finishing within
+one task budget never starts the pool.
+
+Usage: python benchmarks/parallel_search.py data/002.json --jobs 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_backtracking
+from sudoku_solver.solver.parallel import TASK_NODES, solve_parallel
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("puzzles", nargs="+")
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--task-nodes", type=int, default=TASK_NODES)
+    args = ap.parse_args()
+
+    for path in args.puzzles:
+        t0 = time.perf_counter()
+        serial, _ = solve_backtracking(load_puzzle(path))
+        base = time.perf_counter() - t0
+        print(f"{path}: serial {base:.2f}s nodes={serial.stats.calls} status={serial.status}")
+        for jobs in args.jobs:
+            t0 = time.perf_counter()
+            sr, metrics = solve_parallel(load_puzzle(path), jobs=jobs, task_nodes=args.task_nodes)
+            dt = time.perf_counter() - t0
+            assert (sr.status, sr.solution) == (serial.status, serial.solution), path
+            par = metrics["parallel"]
+            nodes = par["worker_nodes"]
+            balance = max(nodes) / (sum(nodes) / len(nodes))
+            print(f"  jobs={jobs:<3d} {dt:.2f}s  speedup={base / dt:.2f}x  tasks={par['tasks']}  nodes={sr.stats.calls}  balance={balance:.2f}")
+
+
+if __name__ == "__main__":
+    main()
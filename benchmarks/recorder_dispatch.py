@@ -0,0 +1,86 @@
+"""Micro-benchmark: per-event cost of Recorder dispatch.
+
+Compares the previous dispatch (facade -> `_call` -> `getattr` on every
+sink, with a TraceSink over a disabled Tracer) against the pre-bound
+Recorder with metrics+trace, metrics only, and `NullRecorder` (whose
+events are fixed-arity no-ops), next to the bare loop without any call.
+
+Usage: python benchmarks/recorder_dispatch.py [--events N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from sudoku_solver.instrumentation.recorder import NullRecorder, Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.trace.tracer import TraceSink, Tracer
+
+
+class _LegacyRecorder:
+    """The getattr-per-sink dispatch Recorder used before pre-binding."""
+
+    def __init__(self, sinks: List[Any]) -> None:
+        self._sinks = sinks
+
+    def _call(self, name: str, *args: Any, **kwargs: Any) -> None:
+        for s in self._sinks:
+            fn = getattr(s, name, None)
+            if fn:
+                fn(*args, **kwargs)
+
+    def assign(self, r: int, c: int, v: int, source: str, depth: int) -> None:
+        self._call("attempt_assign", r, c, v, source, depth)
+
+    def update_depth(self, depth: int) -> None:
+        self._call("search_update_depth", depth)
+
+
+def _time_per_event(fn: Callable[[int], None], events: int) -> float:
+    t0 = time.perf_counter_ns()
+    fn(events)
+    return (time.perf_counter_ns() - t0) / (2 * events)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=500_000)
+    n = ap.parse_args().events
+
+    legacy = _LegacyRecorder([MetricsCollector(), TraceSink(Tracer(enabled=False))])
+
+    def run_legacy(k: int) -> None:
+        for i in range(k):
+            legacy.assign(0, 0, 1, "guess", i)
+            legacy.update_depth(i)
+
+    def make_run(rec: Recorder) -> Callable[[int], None]:
+        assign = rec.attempt
+        search = rec.search
+
+        def run(k: int) -> None:
+            for i in range(k):
+                assign.assign(0, 0, 1, source="guess", depth=i)
+                search.update_depth(i)
+
+        return run
+
+    def run_bare(k: int) -> None:
+        for i in range(k):
+            pass
+
+    cases = [
+        ("bare loop (no event calls)", run_bare),
+        ("legacy getattr dispatch (metrics + disabled trace)", run_legacy),
+        ("pre-bound (metrics + trace sink)", make_run(Recorder([MetricsCollector(), TraceSink(Tracer(enabled=True, mode="summary"))]))),
+        ("pre-bound (metrics only)", make_run(Recorder([MetricsCollector()]))),
+        ("NullRecorder", make_run(NullRecorder())),
+    ]
+    for label, fn in cases:
+        fn(10_000)  # warmup
+        print(f"{label:<55} {_time_per_event(fn, n):8.1f} ns/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Node-rate comparison: recursive vs explicit-stack backtracking engine.
+
+Runs the previous recursive `_search` (kept here for reference) and the
+current iterative engine on the same puzzles with a metrics-only Recorder,
+checks that both produce identical stats, metrics and solutions, and prints
+nodes/sec for each.
+
+Usage: python benchmarks/search_engine.py [--repeat N] [--max-solutions K]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.instrumentation.recorder import Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver.backtracking import _Counter, _search
+
+
+def _recursive_search(grid: Grid, depth: int, rec: Recorder, ctr: _Counter, solutions: List[List[List[int]]], max_solutions: int) -> None:
+    """The recursive engine used before the explicit stack."""
+    if len(solutions) >= max_solutions:
+        return
+    ctr.calls += 1
+    ctr.max_depth = max(ctr.max_depth, depth)
+    rec.search.update_depth(depth)
+    empty = grid.first_empty()
+    if empty is None:
+        solutions.append(grid.to_lists())
+        rec.result.solution_found()
+        return
+    r, c = empty
+    rec.decision.choose_cell(r, c, depth)
+    rec.decision.guess_point(depth)
+    cand = grid.candidates(r, c)
+    for v in range(1, 10):
+        if cand >> v & 1:
+            grid.set_cell(r, c, v)
+            ctr.assignments += 1
+            rec.attempt.assign(r, c, v, source="guess", depth=depth)
+            _recursive_search(grid, depth + 1, rec, ctr, solutions, max_solutions)
+            if len(solutions) >= max_solutions:
+                grid.clear_cell(r, c)
+                return
+            grid.clear_cell(r, c)
+            ctr.backtracks += 1
+            rec.state.unassign(r, c, v, reason="backtrack", depth=depth)
+        else:
+            rec.attempt.contradiction(r, c, v, reason="invalid_candidate", depth=depth)
+
+
+def _run(engine: Callable[..., Any], cells: List[List[int]], max_solutions: int) -> Tuple[float, Dict[str, Any]]:
+    grid = Grid([row[:] for row in cells])
+    metrics = MetricsCollector()
+    rec = Recorder([metrics])
+    ctr = _Counter()
+    solutions: List[List[List[int]]] = []
+    t0 = time.perf_counter()
+    if engine is _search:
+        _search(grid, rec, ctr, solutions, max_solutions, [])
+    else:
+        _recursive_search(grid, 0, rec, ctr, solutions, max_solutions)
+    dt = time.perf_counter() - t0
+    return dt, {"calls": ctr.calls, "metrics": metrics.finalize("-"), "solutions": solutions}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--max-solutions", type=int, default=2000, help="用于空盘的解数上限")
+    args = ap.parse_args()
+
+    cases = {
+        "data/001.json": (json.load(open("data/001.json"))["grid"], 2),
+        "examples/puzzle_easy.json": (json.load(open("examples/puzzle_easy.json"))["grid"], 2),
+        "empty": ([[0] * 9 for _ in range(9)], args.max_solutions),
+    }
+    for name, (cells, k) in cases.items():
+        rates = {}
+        outputs = {}
+        for label, engine in (("recursive", _recursive_search), ("iterative", _search)):
+            best = min(_run(engine, cells, k)[0] for _ in range(args.repeat))
+            _, out = _run(engine, cells, k)
+            outputs[label] = out
+            rates[label] = out["calls"] / best
+        assert outputs["recursive"] == outputs["iterative"], name
+        gain = (rates["iterative"] / rates["recursive"] - 1) * 100
+        print(f"{name:28s} nodes={outputs['iterative']['calls']:>7d}  recursive={rates['recursive']:>10.0f}/s  iterative={rates['iterative']:>10.0f}/s  ({gain:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
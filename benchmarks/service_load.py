@@ -0,0 +1,84 @@
+"""Load generator for `sudoku-solver serve`.
+
+Opens ``--concurrency`` connections, each sending puzzles from a corpus
+back to back (closed loop) until ``--requests`` have been sent in total,
+and reports requests/sec, latency percentiles and error counts as JSON.
+
+Usage:
+    sudoku-solver serve --socket /tmp/sudoku.sock --method cp &
+    python benchmarks/service_load.py --socket /tmp/sudoku.sock data/ --requests 2000 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, Dict, List
+
+from sudoku_solver.bench.runner import load_corpus, percentile
+
+
+async def _worker(args: argparse.Namespace, payloads: "itertools.cycle[bytes]", budget: List[int], latencies: List[float], errors: Dict[str, int]) -> None:
+    if args.socket:
+        reader, writer = await asyncio.open_unix_connection(args.socket)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        while budget[0] > 0:
+            budget[0] -= 1
+            t0 = time.perf_counter()
+            writer.write(next(payloads))
+            await writer.drain()
+            line = await reader.readline()
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+            resp: Dict[str, Any] = json.loads(line)
+            if "error" in resp:
+                errors[resp["error"]] = errors.get(resp["error"], 0) + 1
+    finally:
+        writer.close()
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    corpus, _ = load_corpus(args.source)
+    if not corpus:
+        raise SystemExit(f"未找到任何谜题：{args.source}")
+    payloads = itertools.cycle(
+        [(json.dumps({"id": name, "grid": g.cells, **({"method": args.method} if args.method else {})}) + "\n").encode() for name, g in corpus]
+    )
+    budget = [args.requests]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_worker(args, payloads, budget, latencies, errors) for _ in range(args.concurrency)))
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 3),
+        "requests_per_sec": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("source", help="谜题目录、通配符或 81 字符/行题库文件")
+    where = ap.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="服务的 Unix socket 路径")
+    where.add_argument("--port", type=int, help="服务端口（本机）")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--method", help="覆盖服务的默认求解方法")
+    ap.add_argument("--requests", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=4)
+    print(json.dumps(asyncio.run(_run(ap.parse_args())), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
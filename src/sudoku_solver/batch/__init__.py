@@ -0,0 +1 @@
+"""Batch solving over puzzle corpora (process pool + JSONL streaming)."""
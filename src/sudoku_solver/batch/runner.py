@@ -0,0 +1,294 @@
+"""Solve many puzzle files in one process tree and stream JSONL results.
+
+Puzzles are dispatched to a `ProcessPoolExecutor` in chunks; each worker
+reuses `load_puzzle`, the selected solver and `verify` in-process, so the
+interpreter/import cost is paid once per worker instead of once per puzzle.
+Chunks are consecutive paths (FIFO) or, with ``schedule="cost"``, ordered
+hardest-predicted first (`batch.scheduling`). Method ``vec`` solves each
+chunk as one NumPy batch (`solver.vectorized`) instead of puzzle by puzzle.
+One JSON line is emitted per puzzle, either in completion order (default,
+lowest latency) or in input order.
+"""
+from __future__ import annotations
+
+import glob
+import json
+from itertools import repeat
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, TextIO
+
+from sudoku_solver.batch.scheduling import calibrate, plan_chunks, predict_path
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.metrics.aggregate import MetricsAggregate
+from sudoku_solver.metrics.timing import TimingSink
+from sudoku_solver.solver import SOLVERS, vectorized
+from sudoku_solver.types import SolveResult
+from sudoku_solver.verify.verify import verify
+
+
+# Paths per feature pre-pass task (schedule="cost")
+PREDICT_CHUNK = 256
+
+
+def collect_puzzle_paths(spec: str) -> List[Path]:
+    """Expand a directory, glob pattern or single file into sorted puzzle paths."""
+    p = Path(spec)
+    if p.is_dir():
+        return sorted(x for x in p.glob("*.json") if x.is_file())
+    if p.is_file():
+        return [p]
+    matches = sorted(Path(x) for x in glob.glob(spec, recursive=True))
+    return [x for x in matches if x.is_file()]
+
+
+def read_done_ids(path: str | Path) -> Set[str]:
+    """IDs already present in a JSONL output file (for resuming a run)."""
+    done: Set[str] = set()
+    p = Path(path)
+    if not p.exists():
+        return done
+    with p.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError, TypeError):
+                # Truncated line of an interrupted run: solve it again
+                continue
+    return done
+
+
+def drop_partial_tail(path: str | Path) -> None:
+    """Truncate an unterminated last line left behind by an interrupted run."""
+    p = Path(path)
+    if not p.exists():
+        return
+    with p.open("rb+") as fh:
+        end = fh.seek(0, 2)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 65536)
+            fh.seek(start)
+            block = fh.read(pos - start)
+            nl = block.rfind(b"\n")
+            if nl >= 0:
+                cut = start + nl + 1
+                break
+            pos = start
+        else:
+            cut = 0
+        if cut != end:
+            fh.truncate(cut)
+
+
+def solve_one(path: str, method: str, limits: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Load, solve and verify one puzzle file; return its result record.
+
+    `limits` holds the solver's ``time_limit_ms`` / ``max_nodes`` keywords.
+    """
+    test_case_id = Path(path).name
+    t0 = time.perf_counter()
+    timing = TimingSink()
+    try:
+        with timing.phase("parse"):
+            puzzle = load_puzzle(path)
+        sr, metrics = SOLVERS[method](puzzle, timing_sink=timing, **(limits or {}))
+    except Exception as e:  # noqa: BLE001
+        # A bad puzzle or a solver failure must not take the worker (and the batch) down
+        return _error_record(test_case_id, e)
+    return _record(test_case_id, puzzle, sr, metrics, timing, t0)
+
+
+def _error_record(test_case_id: str, e: Exception) -> Dict[str, Any]:
+    message = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+    return {"id": test_case_id, "status": "error", "error": message}
+
+
+def _record(test_case_id: str, puzzle: Any, sr: SolveResult, metrics: Dict[str, Any], timing: TimingSink, t0: float) -> Dict[str, Any]:
+    """Verify `sr` against `puzzle` and build the result record (``time_ms`` counted from `t0`)."""
+    verify_ok = False
+    if sr.solution is not None:
+        with timing.phase("verify"):
+            try:
+                verify_ok = bool(verify(puzzle, sr.solution))
+            except Exception:  # noqa: BLE001
+                verify_ok = False
+    elapsed_ms = int((time.perf_counter() - t0) * 1000)
+    metrics["timing"] = timing.to_dict()
+    return {
+        "id": test_case_id,
+        "status": sr.status,
+        "solution": sr.solution,
+        "stats": asdict(sr.stats),
+        "metrics": metrics,
+        "verify_ok": verify_ok,
+        "time_ms": elapsed_ms,
+    }
+
+
+def solve_chunk_vectorized(paths: List[str], limits: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """`solve_one` records for `paths` solved as one `solve_batch_vectorized` batch.
+
+    The batch's solve time is split evenly over its puzzles (``search_ns``
+    and ``time_ms``); non-9x9 boards get error records.
+    """
+    records: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+    grids = []
+    index: List[int] = []
+    for k, p in enumerate(paths):
+        try:
+            grid = load_puzzle(p)
+            if grid.size != 9:
+                raise ValueError(f"vec 仅支持 9x9 网格（当前为 {grid.size}x{grid.size}），请使用 bits/cp/bt")
+        except Exception as e:  # noqa: BLE001
+            records[k] = _error_record(Path(p).name, e)
+            continue
+        grids.append(grid)
+        index.append(k)
+    if grids:
+        t0 = time.perf_counter()
+        try:
+            results = vectorized.solve_batch_vectorized(grids, **(limits or {}))
+        except Exception as e:  # noqa: BLE001
+            for k in index:
+                records[k] = _error_record(Path(paths[k]).name, e)
+            return records  # type: ignore[return-value]
+        share = (time.perf_counter() - t0) / len(grids)
+        for k, grid, (sr, metrics) in zip(index, grids, results):
+            timing = TimingSink()
+            timing.durations_ns["search"] = int(share * 1e9)
+            records[k] = _record(Path(paths[k]).name, grid, sr, metrics, timing, time.perf_counter() - share)
+    return records  # type: ignore[return-value]
+
+
+def _solve_chunk(paths: List[str], method: str, limits: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    if method == vectorized.METHOD:
+        return solve_chunk_vectorized(paths, limits)
+    return [solve_one(p, method, limits) for p in paths]
+
+
+def _predict_chunk(paths: List[str], method: str) -> List[float]:
+    return [predict_path(p, method) for p in paths]
+
+
+def _chunks(n: int, size: int) -> Iterator[List[int]]:
+    for i in range(0, n, size):
+        yield list(range(i, min(n, i + size)))
+
+
+def iter_results(
+    paths: Iterable[str | Path],
+    method: str = "bt",
+    jobs: int = 1,
+    chunksize: int = 16,
+    ordered: bool = False,
+    limits: Optional[Dict[str, Any]] = None,
+    schedule: str = "fifo",
+    history: Optional[Mapping[str, float]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one result record per puzzle path.
+
+    With ``jobs <= 1`` everything runs in the calling process. Otherwise
+    chunks are submitted to a process pool, keeping at most ``2 * jobs``
+    chunks in flight: consecutive runs of ``chunksize`` paths with
+    ``schedule="fifo"``, or with ``schedule="cost"`` the longest-predicted
+    first with guided chunk sizes of at most ``chunksize`` (see
+    `batch.scheduling`; `history` holds past ``time_ms`` per test case ID).
+    """
+    items = [str(p) for p in paths]
+    chunksize = max(1, chunksize)
+    if jobs <= 1:
+        for i in range(0, len(items), chunksize):
+            yield from _solve_chunk(items[i : i + chunksize], method, limits)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        plan: Iterable[List[int]] = _chunks(len(items), chunksize)
+        if schedule == "cost":
+            # Feature pre-pass on the workers too, in larger chunks (it is cheap per puzzle)
+            parts = pool.map(_predict_chunk, [items[i : i + PREDICT_CHUNK] for i in range(0, len(items), PREDICT_CHUNK)], repeat(method))
+            predicted = [c for part in parts for c in part]
+            plan = plan_chunks(calibrate(items, predicted, history), jobs, chunksize)
+        chunk_iter = iter(plan)
+        pending: Dict[Future, List[int]] = {}
+        buffered: Dict[int, Dict[str, Any]] = {}
+        next_idx = 0
+
+        def _fill() -> None:
+            while len(pending) < 2 * jobs:
+                try:
+                    chunk = next(chunk_iter)
+                except StopIteration:
+                    return
+                pending[pool.submit(_solve_chunk, [items[i] for i in chunk], method, limits)] = chunk
+
+        _fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                chunk = pending.pop(fut)
+                records = fut.result()
+                if not ordered:
+                    yield from records
+                else:
+                    buffered.update(zip(chunk, records))
+            while next_idx in buffered:
+                yield buffered.pop(next_idx)
+                next_idx += 1
+            _fill()
+
+
+@dataclass
+class BatchSummary:
+    puzzles: int = 0
+    skipped: int = 0
+    wall_s: float = 0.0
+    puzzles_per_sec: float = 0.0
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def run_batch(
+    paths: List[Path],
+    out: TextIO,
+    *,
+    method: str = "bt",
+    jobs: int = 1,
+    chunksize: int = 16,
+    ordered: bool = False,
+    skip_ids: Optional[Set[str]] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    limits: Optional[Dict[str, Any]] = None,
+    aggregate: Optional[MetricsAggregate] = None,
+    schedule: str = "fifo",
+    history: Optional[Mapping[str, float]] = None,
+) -> BatchSummary:
+    """Solve `paths`, write one JSON line per puzzle to `out` and return a summary.
+
+    Paths whose file name is in `skip_ids` are not solved (resume support).
+    `on_result` is called in the parent process for every record, e.g. to
+    persist it. `limits` bounds every solve (see `solve_one`). Records are
+    folded into `aggregate` when given. `schedule` / `history` pick the
+    dispatch order (see `iter_results`).
+    """
+    skip_ids = skip_ids or set()
+    todo = [p for p in paths if p.name not in skip_ids]
+    summary = BatchSummary(skipped=len(paths) - len(todo))
+
+    t0 = time.perf_counter()
+    for rec in iter_results(todo, method=method, jobs=jobs, chunksize=chunksize, ordered=ordered, limits=limits, schedule=schedule, history=history):
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        out.flush()
+        summary.puzzles += 1
+        summary.status_counts[rec["status"]] = summary.status_counts.get(rec["status"], 0) + 1
+        if aggregate is not None:
+            aggregate.add_record(rec, method)
+        if on_result is not None:
+            on_result(rec)
+    summary.wall_s = round(time.perf_counter() - t0, 6)
+    summary.puzzles_per_sec = round(summary.puzzles / summary.wall_s, 2) if summary.wall_s > 0 else 0.0
+    return summary
@@ -0,0 +1,144 @@
+"""Cost-aware dispatch order for batch solving (``solve-batch --schedule cost``).
+
+With FIFO dispatch a few hard puzzles that happen to come last dominate
+the batch makespan while the other workers sit idle. A pre-pass computes
+cheap hardness features per puzzle (`HardnessFeatures`, well under a
+millisecond each), predicts the solve time of the chosen method from them
+(`predict_ms`; the batch runner spreads this pre-pass over its workers)
+and `plan_chunks` dispatches longest-predicted-first with
+guided chunk sizes: expensive puzzles go alone, cheap ones are grouped,
+and chunks shrink as the remaining work drains so the workers finish
+together.
+
+The models are ``log2(ms) = a + b * feature`` fits on generated minimal
+9x9 puzzles. Plain ``bt`` fills cells in row-major order, so its cost
+follows the candidate counts of the first empty cells
+(``row_major_log2``); the propagating engines follow the candidates left
+after one propagation pass (``probe_candidates``). For other board sizes
+only the resulting order is meaningful. Past ``time_ms`` of the same test
+case (`db.report.time_history`) replaces the prediction when known and
+rescales it for the rest of the corpus.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver.bitset import probe_candidates
+
+# Empty cells (row-major) whose candidate counts make up row_major_log2
+ROW_MAJOR_CELLS = 30
+
+# method -> (feature, a, b): predicted ms = 2 ** (a + b * feature)
+COST_MODELS = {
+    "bt": ("row_major_log2", -24.1, 0.55),
+    "cp": ("probe_candidates", -1.2, 0.0105),
+    "dlx": ("probe_candidates", -0.94, 0.006),
+    "bits": ("probe_candidates", -1.55, 0.0045),
+}
+
+# Target chunks per worker at any point of the schedule (guided scheduling)
+CHUNKS_PER_WORKER = 4
+
+# Test cases with history needed before it rescales the model
+MIN_CALIBRATION = 8
+
+
+@dataclass(frozen=True)
+class HardnessFeatures:
+    givens: int
+    candidates: int  # candidates summed over the empty cells
+    bivalue: int  # empty cells with at most two candidates
+    row_major_log2: float  # log2 of the candidate product of the first ROW_MAJOR_CELLS empty cells
+    probe_open: int  # cells still open after one propagation pass (0: solved by it)
+    probe_candidates: int  # candidates summed over those cells
+    probe_contradiction: bool  # the propagation pass proved the puzzle unsat
+
+
+def features(grid: Grid) -> HardnessFeatures:
+    n = grid.size
+    data = grid.data
+    counts = [grid.candidates(i // n, i % n).bit_count() for i in range(n * n) if not data[i]]
+    cand = probe_candidates(grid)
+    probe = [m.bit_count() for m in cand if m] if cand is not None else []
+    return HardnessFeatures(
+        givens=n * n - len(counts),
+        candidates=sum(counts),
+        bivalue=sum(1 for k in counts if k <= 2),
+        row_major_log2=round(sum(math.log2(k) for k in counts[:ROW_MAJOR_CELLS] if k), 3),
+        probe_open=len(probe),
+        probe_candidates=sum(probe),
+        probe_contradiction=cand is None,
+    )
+
+
+def predict_ms(f: HardnessFeatures, method: str) -> float:
+    """Predicted solve time of `method` in ms (cheapest for probe contradictions)."""
+    feature, a, b = COST_MODELS.get(method, COST_MODELS["cp"])
+    if f.probe_contradiction:
+        return 2.0**a
+    return 2.0 ** (a + b * getattr(f, feature))
+
+
+def predict_path(path: str | Path, method: str) -> float:
+    """`predict_ms` of a puzzle file; 0 if it cannot be read (it fails fast)."""
+    try:
+        return predict_ms(features(load_puzzle(path)), method)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def calibrate(paths: Sequence[str | Path], predicted: Sequence[float], history: Optional[Mapping[str, float]] = None) -> List[float]:
+    """Blend predictions with `history` (test case ID, i.e. file name -> past mean ``time_ms``).
+
+    Known test cases use their history as is; with at least
+    `MIN_CALIBRATION` of them, the geometric mean of observed / predicted
+    rescales the other predictions.
+    """
+    if not history:
+        return list(predicted)
+    observed: Dict[int, float] = {}
+    for i, p in enumerate(paths):
+        ms = history.get(Path(p).name)
+        if ms is not None:
+            observed[i] = max(float(ms), 0.0)
+    ratios = [math.log2(max(observed[i], 0.5) / predicted[i]) for i in observed if predicted[i] > 0]
+    scale = 2.0 ** (sum(ratios) / len(ratios)) if len(ratios) >= MIN_CALIBRATION else 1.0
+    return [observed[i] if i in observed else c * scale for i, c in enumerate(predicted)]
+
+
+def predict_costs(paths: Sequence[str | Path], method: str, history: Optional[Mapping[str, float]] = None) -> List[float]:
+    """Predicted ms per path (input order), calibrated with `history`."""
+    return calibrate(paths, [predict_path(p, method) for p in paths], history)
+
+
+def plan_chunks(costs: Sequence[float], jobs: int, max_chunk: int = 16) -> List[List[int]]:
+    """Indices of `costs` grouped into chunks, in dispatch order.
+
+    Longest-predicted first; each chunk collects items until it holds
+    ``remaining / (CHUNKS_PER_WORKER * jobs)`` of the predicted work (or
+    `max_chunk` items), so hard items go alone and the tail gets finer.
+    """
+    order = sorted(range(len(costs)), key=lambda i: -costs[i])
+    remaining = float(sum(costs))
+    slots = CHUNKS_PER_WORKER * max(1, jobs)
+    max_chunk = max(1, max_chunk)
+    chunks: List[List[int]] = []
+    k = 0
+    while k < len(order):
+        target = remaining / slots
+        chunk: List[int] = []
+        cost = 0.0
+        while k < len(order) and len(chunk) < max_chunk:
+            chunk.append(order[k])
+            cost += costs[order[k]]
+            k += 1
+            if cost >= target:
+                break
+        remaining -= cost
+        chunks.append(chunk)
+    return chunks
@@ -0,0 +1 @@
+"""Benchmark harness: latency percentiles, throughput and saved baselines."""
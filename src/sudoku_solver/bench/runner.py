@@ -0,0 +1,215 @@
+"""Benchmark solver methods over a puzzle corpus.
+
+Each puzzle is solved ``warmup`` times untimed, then ``repeat`` times with
+`time.perf_counter_ns` around the solver call only (grid copy, verify and
+serialization are excluded). Per method the run reports throughput, latency
+percentiles in microseconds, search nodes per second (``Stats.calls``) and
+verify failures; the process peak RSS is reported once per run. Method
+``vec`` times one `solve_batch_vectorized` call over the whole corpus per
+repeat and reports the amortized per-puzzle latency. Runs are
+saved as named JSON files so a later run can be compared with a baseline.
+"""
+from __future__ import annotations
+
+import json
+import math
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sudoku_solver.batch.runner import collect_puzzle_paths
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.io import packed_io
+from sudoku_solver.io.line_io import iter_grids
+from sudoku_solver.solver import SOLVERS, vectorized
+from sudoku_solver.verify.verify import verify
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+RUNS_DIR = Path("var/bench")
+# Metrics checked against a baseline: name -> True when larger is better
+COMPARED: Dict[str, bool] = {"puzzles_per_sec": True, "p95_us": False}
+
+
+def load_corpus(spec: str) -> Tuple[List[Tuple[str, Grid]], List[str]]:
+    """Load ``(id, grid)`` pairs from a dir/glob of JSON files, line-format or packed files.
+
+    Returns the corpus and a list of error messages for files that failed to load.
+    """
+    corpus: List[Tuple[str, Grid]] = []
+    errors: List[str] = []
+    for path in collect_puzzle_paths(spec):
+        if path.suffix != ".json":
+            try:
+                grids = packed_io.iter_grids(path) if packed_io.is_packed_file(path) else iter_grids(path)
+                corpus.extend((f"{path.name}:{index}", g) for index, g in grids)
+            except (OSError, ValueError) as e:
+                errors.append(f"{path}: {e}")
+            continue
+        try:
+            corpus.append((path.name, load_puzzle(path)))
+        except Exception as e:  # noqa: BLE001
+            errors.append(f"{path}: {e}")
+    return corpus, errors
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return float(sorted_values[k])
+
+
+def peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def bench_method(corpus: Sequence[Tuple[str, Grid]], method: str, *, warmup: int = 1, repeat: int = 3) -> Dict[str, Any]:
+    """Time ``SOLVERS[method]`` (or the ``vec`` batch engine) over the corpus; return the per-method summary."""
+    if method == vectorized.METHOD:
+        return _bench_vectorized(corpus, warmup=warmup, repeat=repeat)
+    solve = SOLVERS[method]
+    for _ in range(warmup):
+        for _, grid in corpus:
+            solve(grid.clone())
+
+    latencies: List[float] = []
+    calls = 0
+    verify_failures = 0
+    statuses: Dict[str, int] = {}
+    clock = time.perf_counter_ns
+    for rep in range(repeat):
+        for _, grid in corpus:
+            g = grid.clone()
+            t0 = clock()
+            sr, _metrics = solve(g)
+            latencies.append((clock() - t0) / 1000.0)
+            calls += sr.stats.calls
+            if rep == 0:
+                statuses[sr.status] = statuses.get(sr.status, 0) + 1
+                if sr.solution is not None and not verify(grid, sr.solution):
+                    verify_failures += 1
+    return _summary(latencies, calls, statuses, verify_failures)
+
+
+def _bench_vectorized(corpus: Sequence[Tuple[str, Grid]], *, warmup: int = 1, repeat: int = 3) -> Dict[str, Any]:
+    grids = [grid for _, grid in corpus]
+    for _ in range(warmup):
+        vectorized.solve_batch_vectorized([g.clone() for g in grids])
+
+    latencies: List[float] = []
+    calls = 0
+    verify_failures = 0
+    statuses: Dict[str, int] = {}
+    clock = time.perf_counter_ns
+    for rep in range(repeat):
+        batch = [g.clone() for g in grids]
+        t0 = clock()
+        results = vectorized.solve_batch_vectorized(batch)
+        share = (clock() - t0) / 1000.0 / len(grids)
+        latencies.extend([share] * len(grids))
+        for grid, (sr, _metrics) in zip(grids, results):
+            calls += sr.stats.calls
+            if rep == 0:
+                statuses[sr.status] = statuses.get(sr.status, 0) + 1
+                if sr.solution is not None and not verify(grid, sr.solution):
+                    verify_failures += 1
+    return _summary(latencies, calls, statuses, verify_failures)
+
+
+def _summary(latencies: List[float], calls: int, statuses: Dict[str, int], verify_failures: int) -> Dict[str, Any]:
+    total_s = sum(latencies) / 1e6
+    latencies.sort()
+    return {
+        "solves": len(latencies),
+        "total_s": round(total_s, 6),
+        "puzzles_per_sec": round(len(latencies) / total_s, 2) if total_s else 0.0,
+        "nodes_per_sec": round(calls / total_s, 2) if total_s else 0.0,
+        "mean_us": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_us": round(percentile(latencies, 50), 2),
+        "p95_us": round(percentile(latencies, 95), 2),
+        "p99_us": round(percentile(latencies, 99), 2),
+        "max_us": round(latencies[-1], 2) if latencies else 0.0,
+        "status_counts": statuses,
+        "verify_failures": verify_failures,
+    }
+
+
+def run_bench(
+    corpus: Sequence[Tuple[str, Grid]],
+    methods: Sequence[str],
+    *,
+    warmup: int = 1,
+    repeat: int = 3,
+    name: Optional[str] = None,
+    source: str = "",
+) -> Dict[str, Any]:
+    """Benchmark every method and return the run record (see `save_run`)."""
+    results = {m: bench_method(corpus, m, warmup=warmup, repeat=repeat) for m in methods}
+    return {
+        "name": name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source": source,
+        "puzzles": len(corpus),
+        "warmup": warmup,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "peak_rss_kb": peak_rss_kb(),
+        "methods": results,
+    }
+
+
+def run_path(name: str, runs_dir: str | Path = RUNS_DIR) -> Path:
+    return Path(runs_dir) / f"{name}.json"
+
+
+def save_run(run: Dict[str, Any], name: str, runs_dir: str | Path = RUNS_DIR) -> Path:
+    p = run_path(name, runs_dir)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(run, ensure_ascii=False, indent=2), encoding="utf-8")
+    return p
+
+
+def load_run(name: str, runs_dir: str | Path = RUNS_DIR) -> Dict[str, Any]:
+    return json.loads(run_path(name, runs_dir).read_text(encoding="utf-8"))
+
+
+def compare_runs(current: Dict[str, Any], baseline: Dict[str, Any], threshold_pct: float) -> List[Dict[str, Any]]:
+    """Per method and compared metric, the relative change versus the baseline.
+
+    ``change_pct`` is signed so that positive means worse; an entry is a
+    regression when it exceeds ``threshold_pct``. Methods missing from
+    either run are skipped.
+    """
+    out: List[Dict[str, Any]] = []
+    for method, cur in current["methods"].items():
+        base = baseline.get("methods", {}).get(method)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            b, c = float(base[metric]), float(cur[metric])
+            if b == 0:
+                continue
+            worse = (b - c) / b if higher_is_better else (c - b) / b
+            change = round(worse * 100.0, 2)
+            out.append(
+                {
+                    "method": method,
+                    "metric": metric,
+                    "baseline": b,
+                    "current": c,
+                    "change_pct": change,
+                    "regression": change > threshold_pct,
+                }
+            )
+    return out
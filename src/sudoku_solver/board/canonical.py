@@ -0,0 +1,140 @@
+"""Symmetry canonicalization of Sudoku puzzles.
+
+Two puzzles are equivalent when one maps onto the other by the validity-
+preserving symmetries: transposition, band swaps, row swaps within a band,
+stack swaps, column swaps within a stack and digit relabeling. `canonicalize`
+returns an 81-char canonical string plus the `Transform` that produces it,
+so a solution found for the canonical puzzle can be mapped back with
+`invert_transform`.
+
+The canonical string is the lexicographic minimum, over a set of candidate
+transforms, of the transformed puzzle with digits relabeled by first
+appearance ('0' = empty). Candidates are the orderings that sort bands,
+rows, stacks and columns by symmetry-invariant given-count signatures, with
+every ordering of tied items enumerated; because that set moves with the
+puzzle, equivalent puzzles get the same string. Highly symmetric patterns
+can produce more tie orderings than ``max_candidates``; the enumeration is
+then truncated, which may give equivalent puzzles different strings (a
+cache miss) but never maps a puzzle to a non-equivalent one.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import permutations, product
+from typing import Iterator, List, Sequence, Tuple
+
+from sudoku_solver.board.grid import Grid
+
+MAX_CANDIDATES = 4096
+
+_Perm = Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Transform:
+    """``canonical[i][j] == digits[src[rows[i]][cols[j]]]`` where ``src`` is the
+    puzzle, transposed first when ``transpose`` is set; ``digits[0] == 0``."""
+
+    transpose: bool
+    rows: _Perm
+    cols: _Perm
+    digits: _Perm
+
+
+def _line_key(line: Sequence[int]) -> Tuple[int, Tuple[int, ...]]:
+    # Invariant under permutations inside the line's blocks of 3 and of the blocks
+    counts = [sum(1 for v in line[k : k + 3] if v) for k in (0, 3, 6)]
+    return sum(counts), tuple(sorted(counts))
+
+
+def _tied_orders(items: Sequence[int], keys: Sequence[object]) -> List[List[_Perm]]:
+    """Sort ``items`` by key; return, per tie group, every ordering of the group."""
+    ordered = sorted(items, key=lambda i: keys[i])
+    groups: List[List[int]] = []
+    for i in ordered:
+        if groups and keys[groups[-1][0]] == keys[i]:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return [list(permutations(g)) for g in groups]
+
+
+def _line_orders(lines: Sequence[Sequence[int]]) -> Iterator[_Perm]:
+    """Yield candidate orderings of 9 lines (rows, or columns via transposed input)."""
+    line_keys = [_line_key(line) for line in lines]
+    block_keys = [tuple(sorted(line_keys[b * 3 : b * 3 + 3])) for b in range(3)]
+    block_choices = _tied_orders(range(3), block_keys)
+    inner_choices = [_tied_orders(range(b * 3, b * 3 + 3), line_keys) for b in range(3)]
+    for block_parts in product(*block_choices):
+        blocks = [b for part in block_parts for b in part]
+        inner = [product(*inner_choices[b]) for b in blocks]
+        for parts in product(*inner):
+            yield tuple(i for block in parts for part in block for i in part)
+
+
+def _relabel(raw: bytes) -> Tuple[bytes, _Perm]:
+    """Relabel digits by order of first appearance; return (string, digit map)."""
+    order = dict.fromkeys(raw.replace(b"0", b""))
+    digits = [0] * 10
+    for label, d in enumerate(order, start=1):
+        digits[d - 48] = label
+    label = len(order)
+    for d in range(1, 10):
+        if not digits[d]:
+            label += 1
+            digits[d] = label
+    table = bytes.maketrans(b"123456789", bytes(48 + digits[d] for d in range(1, 10)))
+    return raw.translate(table), tuple(digits)
+
+
+def canonicalize(grid: Grid, max_candidates: int = MAX_CANDIDATES) -> Tuple[str, Transform]:
+    """Return ``(canonical 81-char string, transform)`` for ``grid``."""
+    data = grid.data
+    cells = [bytes(data[i : i + 9]) for i in range(0, 81, 9)]
+    best: bytes | None = None
+    best_t: Tuple[bool, _Perm, _Perm] | None = None
+    for transpose in (False, True):
+        budget = max_candidates
+        src = [list(col) for col in zip(*cells)] if transpose else cells
+        flat = "".join(str(v) for row in src for v in row).encode()
+        cols_src = [list(col) for col in zip(*src)]
+        col_orders = list(_line_orders(cols_src))
+        for rows in _line_orders(src):
+            for cols in col_orders:
+                raw = bytes(flat[r * 9 + c] for r in rows for c in cols)
+                s = _relabel(raw)[0]
+                if best is None or s < best:
+                    best, best_t = s, (transpose, rows, cols)
+                budget -= 1
+                if budget <= 0:
+                    break
+            if budget <= 0:
+                break
+    assert best is not None and best_t is not None
+    transpose, rows, cols = best_t
+    src = [list(col) for col in zip(*cells)] if transpose else cells
+    raw = bytes(48 + src[r][c] for r in rows for c in cols)
+    _, digits = _relabel(raw)
+    return best.decode(), Transform(transpose, rows, cols, digits)
+
+
+def apply_transform(cells: Sequence[Sequence[int]], t: Transform) -> List[List[int]]:
+    """Map a grid from the puzzle's frame into the canonical frame."""
+    src = [list(col) for col in zip(*cells)] if t.transpose else cells
+    d = t.digits
+    return [[d[src[r][c]] for c in t.cols] for r in t.rows]
+
+
+def invert_transform(cells: Sequence[Sequence[int]], t: Transform) -> List[List[int]]:
+    """Map a grid from the canonical frame back into the puzzle's frame."""
+    inv = [0] * 10
+    for d, label in enumerate(t.digits):
+        inv[label] = d
+    out = [[0] * 9 for _ in range(9)]
+    for i, r in enumerate(t.rows):
+        row = cells[i]
+        for j, c in enumerate(t.cols):
+            out[r][c] = inv[row[j]]
+    if t.transpose:
+        out = [list(col) for col in zip(*out)]
+    return out
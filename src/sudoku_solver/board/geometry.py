@@ -0,0 +1,75 @@
+"""Per-size lookup tables for n²×n² boards (4x4, 9x9, 16x16, 25x25).
+
+A board of side ``size = box * box`` has ``size`` rows, columns and boxes
+of ``box x box`` cells and digits ``1..size``. Digit sets are bitmasks
+with bit ``v`` for digit ``v`` (bits ``1..size``), so a 25x25 candidate
+set still fits one machine word. `geometry` builds the tables of a size
+once and caches them; engines look everything up instead of doing box
+arithmetic per cell.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import isqrt
+from typing import Tuple
+
+# Supported board sides (box sides 2..5)
+SIZES = (4, 9, 16, 25)
+
+
+@dataclass(frozen=True)
+class Geometry:
+    box: int
+    size: int
+    cells: int
+    all_digits: int  # bits 1..size
+    box_of: Tuple[Tuple[int, ...], ...]  # box_of[r][c]
+    cell_box: Tuple[int, ...]  # flat cell -> box
+    units: Tuple[Tuple[int, ...], ...]  # rows, columns, boxes as flat cell indices
+    units_of: Tuple[Tuple[int, int, int], ...]  # flat cell -> (row, column, box) unit ids
+    unit_bits: Tuple[int, ...]  # flat cell -> 3n-bit mask of its units
+    peers: Tuple[Tuple[int, ...], ...]  # flat cell -> the other cells of its units
+
+
+def size_error(size: object) -> str:
+    return f"网格必须为 NxN（N 为 {'/'.join(map(str, SIZES))}），实际为 {size}"
+
+
+@lru_cache(maxsize=None)
+def geometry(size: int) -> Geometry:
+    """Tables for a board of side `size`; ValueError for unsupported sizes."""
+    if size not in SIZES:
+        raise ValueError(size_error(size))
+    box = isqrt(size)
+    n = size
+    box_of = tuple(tuple((r // box) * box + c // box for c in range(n)) for r in range(n))
+    units = tuple(
+        [tuple(r * n + c for c in range(n)) for r in range(n)]
+        + [tuple(r * n + c for r in range(n)) for c in range(n)]
+        + [tuple(i for i in range(n * n) if box_of[i // n][i % n] == b) for b in range(n)]
+    )
+    units_of = tuple((i // n, n + i % n, 2 * n + box_of[i // n][i % n]) for i in range(n * n))
+    peers = tuple(
+        tuple(sorted({j for u in units_of[i] for j in units[u]} - {i})) for i in range(n * n)
+    )
+    return Geometry(
+        box=box,
+        size=n,
+        cells=n * n,
+        all_digits=((1 << n) - 1) << 1,
+        box_of=box_of,
+        cell_box=tuple(box_of[i // n][i % n] for i in range(n * n)),
+        units=units,
+        units_of=units_of,
+        unit_bits=tuple(1 << a | 1 << b | 1 << c for a, b, c in units_of),
+        peers=peers,
+    )
+
+
+def size_of_cells(count: int) -> int:
+    """Board side for a flat cell count (81 -> 9); ValueError if unsupported."""
+    size = isqrt(count)
+    if size * size != count or size not in SIZES:
+        raise ValueError(size_error(f"{count} 个格子"))
+    return size
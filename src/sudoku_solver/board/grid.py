@@ -1,78 +1,225 @@
-"""Grid representation and helpers for a 9x9 Sudoku."""
+"""Grid representation and helpers for n²×n² Sudoku boards.
+
+Cells are held in one flat ``bytearray`` (`Grid.data`, a byte per cell)
+and the class uses ``__slots__``, so a 9x9 grid costs a few hundred bytes
+and `clone` copies one buffer and three mask lists; grids compare and hash
+by value and pickle as their digit bytes. `Grid.cells` is a read-only
+tuple-of-tuples snapshot (writing to it raises instead of being silently
+lost) and `Grid.to_lists` a mutable list-of-lists copy; both copy the
+board, so hot paths read `data` (or `digits`) instead.
+
+Besides the cells, a Grid keeps an incremental constraint state:
+per-row / per-column / per-box digit bitmasks (bit ``v`` set means digit
+``v`` is already used) and a mask with one bit per empty cell. `set_cell`
+and `clear_cell` update it in O(1), so placement checks, candidate sets and
+next-empty lookups never rescan the board. Mutate cells only through
+`set_cell` / `clear_cell` to keep the state consistent.
+
+Boards of side 4, 9, 16 and 25 are supported; the box table and digit mask
+of the grid's size come from `board.geometry`. The module constants
+`ALL_DIGITS` / `BOX_OF` are the 9x9 ones used by the 9x9-only engines.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sudoku_solver.board.geometry import geometry, size_error, size_of_cells
 
 
 Coord = Tuple[int, int]  # (row, col), 0-based
 
+ALL_DIGITS = 0b1111111110  # bits 1..9
+BOX_OF: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple((r // 3) * 3 + c // 3 for c in range(9)) for r in range(9)
+)
+
+
+def mask_values(mask: int) -> List[int]:
+    """Expand a digit bitmask into the sorted list of digits it contains."""
+    return [v for v in range(1, mask.bit_length()) if mask >> v & 1]
+
 
-@dataclass
 class Grid:
-    """9x9 grid with basic helpers and validation.
+    """Square grid (side 4/9/16/25) with basic helpers and validation.
 
-    Cells contain integers 0..9; 0 means empty.
+    Cells contain integers ``0..size``; 0 means empty. They are stored in
+    `data`, a flat row-major ``bytearray`` of size² values; `cells` returns
+    them as read-only row tuples, `to_lists` as fresh row lists.
     """
 
-    cells: List[List[int]]
-
-    def __post_init__(self) -> None:
-        if len(self.cells) != 9 or any(len(r) != 9 for r in self.cells):
-            raise ValueError("网格必须为 9x9")
-        for r in range(9):
-            for c in range(9):
-                v = self.cells[r][c]
-                if not isinstance(v, int) or v < 0 or v > 9:
-                    raise ValueError("网格元素必须为 0..9 的整数")
+    __slots__ = ("data", "size", "all_digits", "cell_box", "row_masks", "col_masks", "box_masks", "empty_mask")
+
+    data: bytearray
+    size: int
+    all_digits: int
+    cell_box: Tuple[int, ...]  # flat cell -> box (shared per size)
+    row_masks: List[int]
+    col_masks: List[int]
+    box_masks: List[int]
+    empty_mask: int
+
+    def __init__(self, cells: Sequence[Sequence[int]]) -> None:
+        n = len(cells)
+        geometry(n)
+        if any(len(r) != n for r in cells):
+            raise ValueError(size_error(f"{n} 行但列数不一致"))
+        for row in cells:
+            for v in row:
+                if not isinstance(v, int) or v < 0 or v > n:
+                    raise ValueError(f"网格元素必须为 0..{n} 的整数")
+        self._init(bytearray(v for row in cells for v in row), n)
+
+    def _init(self, data: bytearray, size: int) -> None:
+        geo = geometry(size)
+        self.data = data
+        self.size = size
+        self.all_digits = geo.all_digits
+        self.cell_box = geo.cell_box
+        self._rebuild_state()
+
+    @classmethod
+    def from_digits(cls, digits: bytes | bytearray | Sequence[int]) -> Grid:
+        """Build a Grid from size² row-major values already known to be 0..size.
+
+        Skips the per-cell type/range validation of the constructor; meant for
+        bulk loaders that validated the input themselves.
+        """
+        g = object.__new__(cls)
+        g._init(bytearray(digits), size_of_cells(len(digits)))
+        return g
+
+    @property
+    def cells(self) -> Tuple[Tuple[int, ...], ...]:
+        """The cells as read-only row tuples (a snapshot; use `set_cell` to change the grid)."""
+        n = self.size
+        data = self.data
+        return tuple(tuple(data[i : i + n]) for i in range(0, n * n, n))
+
+    def to_lists(self) -> List[List[int]]:
+        """The cells as a new list of row lists (changing it does not change the grid)."""
+        n = self.size
+        data = self.data
+        return [list(data[i : i + n]) for i in range(0, n * n, n)]
+
+    def digits(self) -> bytes:
+        """The size² row-major values (the packed form of `io.line_io` / `io.packed_io`)."""
+        return bytes(self.data)
+
+    def value(self, r: int, c: int) -> int:
+        return self.data[r * self.size + c]
+
+    def _rebuild_state(self) -> None:
+        n = self.size
+        rows = [0] * n
+        cols = [0] * n
+        boxes = [0] * n
+        empty = 0
+        cell_box = self.cell_box
+        for i, v in enumerate(self.data):
+            if v == 0:
+                empty |= 1 << i
+                continue
+            bit = 1 << v
+            rows[i // n] |= bit
+            cols[i % n] |= bit
+            boxes[cell_box[i]] |= bit
+        self.row_masks = rows
+        self.col_masks = cols
+        self.box_masks = boxes
+        self.empty_mask = empty
 
     def clone(self) -> Grid:
-        return Grid([row[:] for row in self.cells])
+        g = object.__new__(Grid)
+        g.data = self.data[:]
+        g.size = self.size
+        g.all_digits = self.all_digits
+        g.cell_box = self.cell_box
+        g.row_masks = self.row_masks[:]
+        g.col_masks = self.col_masks[:]
+        g.box_masks = self.box_masks[:]
+        g.empty_mask = self.empty_mask
+        return g
+
+    def candidates(self, r: int, c: int) -> int:
+        """Bitmask of digits not yet used in the row, column or box of (r,c)."""
+        return self.all_digits & ~(self.row_masks[r] | self.col_masks[c] | self.box_masks[self.cell_box[r * self.size + c]])
+
+    def candidate_values(self, r: int, c: int) -> List[int]:
+        return mask_values(self.candidates(r, c))
 
     def is_valid_placement(self, r: int, c: int, v: int) -> bool:
         """Check row/col/box constraints for placing v at (r,c)."""
-        # Row
-        if any(self.cells[r][cc] == v for cc in range(9)):
-            return False
-        # Column
-        if any(self.cells[rr][c] == v for rr in range(9)):
-            return False
-        # Box
-        br, bc = (r // 3) * 3, (c // 3) * 3
-        for rr in range(br, br + 3):
-            for cc in range(bc, bc + 3):
-                if self.cells[rr][cc] == v:
-                    return False
-        return True
+        return not ((self.row_masks[r] | self.col_masks[c] | self.box_masks[self.cell_box[r * self.size + c]]) >> v & 1)
 
     def first_empty(self) -> Optional[Coord]:
-        for r in range(9):
-            for c in range(9):
-                if self.cells[r][c] == 0:
-                    return (r, c)
-        return None
+        m = self.empty_mask
+        if not m:
+            return None
+        return divmod((m & -m).bit_length() - 1, self.size)
+
+    def empty_count(self) -> int:
+        return self.empty_mask.bit_count()
 
     def givens_conflict(self) -> bool:
         """Return True if givens (non-zero entries) already violate constraints."""
-        for r in range(9):
-            for c in range(9):
-                v = self.cells[r][c]
-                if v == 0:
-                    continue
-                # Temporarily clear and re-check to avoid self-conflict
-                self.cells[r][c] = 0
-                ok = self.is_valid_placement(r, c, v)
-                self.cells[r][c] = v
-                if not ok:
-                    return True
+        n = self.size
+        rows = [0] * n
+        cols = [0] * n
+        boxes = [0] * n
+        cell_box = self.cell_box
+        for i, v in enumerate(self.data):
+            if v == 0:
+                continue
+            bit = 1 << v
+            r, c = divmod(i, n)
+            b = cell_box[i]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return True
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
         return False
 
     def set_cell(self, r: int, c: int, v: int) -> None:
-        self.cells[r][c] = v
+        i = r * self.size + c
+        if self.data[i]:
+            self.clear_cell(r, c)
+        if v == 0:
+            return
+        self.data[i] = v
+        bit = 1 << v
+        self.row_masks[r] |= bit
+        self.col_masks[c] |= bit
+        self.box_masks[self.cell_box[i]] |= bit
+        self.empty_mask &= ~(1 << i)
 
     def clear_cell(self, r: int, c: int) -> None:
-        self.cells[r][c] = 0
-
-    def __iter__(self) -> Iterable[List[int]]:
+        i = r * self.size + c
+        v = self.data[i]
+        if v == 0:
+            return
+        self.data[i] = 0
+        keep = ~(1 << v)
+        self.row_masks[r] &= keep
+        self.col_masks[c] &= keep
+        self.box_masks[self.cell_box[i]] &= keep
+        self.empty_mask |= 1 << i
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
         return iter(self.cells)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.data == other.data
+
+    def __hash__(self) -> int:
+        # By value, like the cells it holds: do not mutate a grid used as a key
+        return hash(bytes(self.data))
+
+    def __repr__(self) -> str:
+        return f"Grid({self.cells!r})"
+
+    def __reduce__(self) -> Tuple[Any, Tuple[bytes]]:
+        # Pickles (e.g. to worker processes) as its size² digit bytes
+        return Grid.from_digits, (bytes(self.data),)
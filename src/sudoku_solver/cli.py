@@ -6,18 +6,47 @@ Follows the contracts in docs/design/io.md and docs/design/trace.md.
 from __future__ import annotations
 
 import argparse
+import cProfile
 import json
 import sys
 from pathlib import Path
 import os
+import random
+import sqlite3
 import time
 
-from sudoku_solver.io.json_io import load_puzzle, load_solution_grid
-from sudoku_solver.solver.backtracking import solve_backtracking
+from sudoku_solver.io.json_io import load_puzzle, load_solution_grid, parse_puzzle
+from sudoku_solver.solver import SOLVERS, vectorized
+from sudoku_solver.solver.checkpoint import Checkpointer, load_checkpoint
+from sudoku_solver.solver.counting import CACHE_SIZE as COUNT_CACHE_SIZE, count_solutions
+from sudoku_solver.solver.generator import MAX_ATTEMPTS, SYMMETRIES, GenerationSummary, generate as generate_puzzles
+from sudoku_solver.io.line_io import format_line
+from sudoku_solver.io.packed_io import PackedWriter
+from sudoku_solver.solver.parallel import solve_parallel
 from sudoku_solver.verify.verify import verify as verify_solution
+from sudoku_solver.verify.batch import CHUNK as VERIFY_CHUNK, iter_pairs, run_verify_batch
 from dataclasses import asdict
 from sudoku_solver.db.sqlite_writer import SQLiteResultWriter
-from sudoku_solver.db.writer import build_row_from_outputs
+from sudoku_solver.db.solution_cache import SolutionCache
+from sudoku_solver.db.report import FORMATS, case_history, compare_methods, open_db, render, time_history, window_summary
+from sudoku_solver.db.writer import build_row_from_outputs, should_persist
+from sudoku_solver.metrics.aggregate import MetricsAggregate, merge_all
+from sudoku_solver.metrics.timing import TimingSink
+from sudoku_solver.trace.tracer import TraceSink, Tracer
+from sudoku_solver.trace.binary import BinaryTraceSink, iter_steps as iter_trace_steps, summarize as summarize_trace
+from sudoku_solver.bench.runner import compare_runs, load_corpus, load_run, run_bench, save_run
+from sudoku_solver.batch.runner import collect_puzzle_paths, drop_partial_tail, read_done_ids, run_batch
+
+
+# Method ids of the batch commands: per-puzzle solvers plus the NumPy batch engine
+BATCH_METHODS = sorted(SOLVERS) + [vectorized.METHOD]
+
+
+def _require_batch_method(methods: list[str]) -> bool:
+    if vectorized.METHOD in methods and not vectorized.available():
+        print("--method vec 需要 numpy：pip install 'sudoku-solver[numpy]'", file=sys.stderr)
+        return False
+    return True
 
 
 def _db_is_enabled(args: argparse.Namespace) -> bool:
@@ -36,31 +65,119 @@ def _db_path(args: argparse.Namespace) -> Path:
 
 def _cmd_solve(args: argparse.Namespace) -> int:
     """Solve a puzzle JSON and print result JSON to stdout."""
+    # 分阶段计时（perf_counter_ns），可选 tracemalloc 峰值；结果写入 metrics.timing 与 DB
+    timing = TimingSink(track_memory=bool(getattr(args, "profile_memory", False)))
+    resume_path = getattr(args, "resume", None)
+    checkpoint_path = getattr(args, "checkpoint", None) or resume_path
+    resume_state = None
+    if args.puzzle is None and resume_path is None:
+        print("需要指定谜题文件或 --resume", file=sys.stderr)
+        return 2
+    if checkpoint_path and args.method != "bt":
+        print("checkpoint/续跑仅支持 --method bt", file=sys.stderr)
+        return 2
+    jobs = getattr(args, "jobs", 1) or 1
+    if jobs > 1 and (args.method != "bt" or checkpoint_path or getattr(args, "cache", False)):
+        print("--jobs 并行搜索仅支持 --method bt，且不能与 checkpoint/续跑、--cache 同时使用", file=sys.stderr)
+        return 2
     try:
-        puzzle = load_puzzle(args.puzzle)
+        with timing.phase("parse"):
+            if resume_path:
+                resume_state = load_checkpoint(resume_path)
+                puzzle = parse_puzzle({"grid": resume_state["puzzle"]})
+            else:
+                puzzle = load_puzzle(args.puzzle)
     except Exception as e:  # noqa: BLE001
         print(f"输入无效：{e}", file=sys.stderr)
         return 2
+    if puzzle.size != 9 and (args.method == "dlx" or getattr(args, "cache", False)):
+        print(f"{puzzle.size}x{puzzle.size} 网格不支持 --method dlx 与 --cache（仅 9x9）；请使用 bits/cp/bt", file=sys.stderr)
+        return 2
+    test_case_id = (resume_state or {}).get("test_case_id") or Path(args.puzzle or resume_path).name
+
+    bounded = {
+        "tail": getattr(args, "trace_tail", None),
+        "sample": getattr(args, "trace_sample", None),
+        "depth_max": getattr(args, "trace_depth_max", None),
+    }
+    bounded_trace = any(v is not None for v in bounded.values())
+    trace_enabled = bool(getattr(args, "trace", False) or getattr(args, "trace_summary", False) or bounded_trace)
+    binary_trace = trace_enabled and getattr(args, "trace_format", "json") == "binary"
+    if binary_trace and not args.trace_file:
+        print("--trace-format binary 需要同时指定 --trace-file", file=sys.stderr)
+        return 2
+    if bounded_trace and (binary_trace or getattr(args, "trace_summary", False)):
+        print("--trace-tail/--trace-sample/--trace-depth-max 仅适用于 JSON 步骤 trace", file=sys.stderr)
+        return 2
+    if checkpoint_path and trace_enabled:
+        print("checkpoint/续跑不支持 trace（trace 无法跨进程续接）", file=sys.stderr)
+        return 2
+    if jobs > 1 and trace_enabled:
+        print("--jobs 并行搜索不支持 trace", file=sys.stderr)
+        return 2
 
     t0 = time.perf_counter()
-    trace_enabled = bool(getattr(args, "trace", False) or getattr(args, "trace_summary", False))
-    sr, metrics = solve_backtracking(
-        puzzle,
-        trace_enabled=trace_enabled,
-        trace_summary=bool(getattr(args, "trace_summary", False)),
-    )
+    method = args.method
+    trace_sink = None
+    if binary_trace:
+        # 二进制 trace：求解过程中流式写入 --trace-file，内存占用恒定
+        trace_sink = BinaryTraceSink(args.trace_file, compress=args.trace_compress)
+    elif bounded_trace:
+        # 有界 trace：环形缓冲 / 采样 / 深度上限，内存有界并报告丢弃数
+        trace_sink = TraceSink(Tracer(enabled=True, mode="steps", **bounded))
+    # 解缓存：按对称规范形查找；trace 需要真实搜索过程，此时不走缓存
+    use_cache = bool(getattr(args, "cache", False)) and not trace_enabled and not checkpoint_path
+    # checkpoint：周期性保存 + SIGTERM 时保存并停止；--resume 默认继续写回同一文件
+    checkpointer = None
+    # 搜索限制：超时 / 节点预算，截停时 status=timeout 并保留部分统计
+    solver_kwargs: dict = {
+        "time_limit_ms": getattr(args, "time_limit_ms", None),
+        "max_nodes": getattr(args, "max_nodes", None),
+    }
+    if checkpoint_path:
+        checkpointer = Checkpointer(checkpoint_path, interval_s=getattr(args, "checkpoint_interval_s", None))
+        checkpointer.install_sigterm()
+        solver_kwargs.update(checkpoint=checkpointer, resume_state=resume_state, test_case_id=test_case_id)
+    profiler = cProfile.Profile() if getattr(args, "profile", None) else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        if use_cache:
+            # 缓存查找（含未命中时的求解）计入 search 阶段
+            with timing.phase("search"), SolutionCache(_db_path(args)) as cache:
+                sr, metrics = cache.solve(puzzle, method, **solver_kwargs)
+        elif jobs > 1:
+            # 并行搜索：搜索树按前缀切分到进程池，大子树动态再切分
+            sr, metrics = solve_parallel(puzzle, jobs=jobs, timing_sink=timing, **solver_kwargs)
+        else:
+            sr, metrics = SOLVERS[method](
+                puzzle,
+                trace_enabled=trace_enabled,
+                trace_summary=bool(getattr(args, "trace_summary", False)),
+                trace_sink=trace_sink,
+                timing_sink=timing,
+                **solver_kwargs,
+            )
+    finally:
+        if checkpointer is not None:
+            checkpointer.uninstall_sigterm()
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if isinstance(trace_sink, BinaryTraceSink):
+            trace_sink.close()
     # verify 成功才认为可持久化
     verify_ok = False
     if sr.solution is not None:
-        try:
-            verify_ok = bool(verify_solution(puzzle, sr.solution))
-        except Exception:  # noqa: BLE001
-            verify_ok = False
+        with timing.phase("verify"):
+            try:
+                verify_ok = bool(verify_solution(puzzle, sr.solution))
+            except Exception:  # noqa: BLE001
+                verify_ok = False
     elapsed_ms = int((time.perf_counter() - t0) * 1000)
+    timing.stop()
 
-    # 默认方法标识（仅回溯）
-    method = "bt"
-
+    metrics["timing"] = timing.to_dict()
     result = {
         "status": sr.status,
         "solution": sr.solution,
@@ -68,34 +185,348 @@ def _cmd_solve(args: argparse.Namespace) -> int:
         "trace": sr.trace if sr.trace is not None else {"enabled": False, "steps": []},
         "metrics": metrics,
     }
+    with timing.phase("serialize"):
+        out = json.dumps(result, ensure_ascii=False, indent=2)
+    metrics["timing"] = timing.to_dict()
+
+    # DB 默认开启，verify 成功后写入；未找到解的 timeout 也写入以记录 stop_reason
+    # （行内含 serialize_ns；persist_ns 只出现在输出中）
+    persist = sr.status != "interrupted" and should_persist(sr.status, sr.solution is not None, verify_ok)
+    if _db_is_enabled(args) and persist:
+        try:
+            with timing.phase("persist"):
+                writer = SQLiteResultWriter(_db_path(args))
+                writer.ensure_schema()
+                row = build_row_from_outputs(
+                    test_case_id=test_case_id,
+                    method=method,
+                    status=sr.status,
+                    metrics=metrics,
+                    time_ms=elapsed_ms,
+                    created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                )
+                writer.write(row)
+                writer.close()
+        except Exception as e:  # noqa: BLE001
+            print(f"[warn] DB 持久化失败：{e}", file=sys.stderr)
+        metrics["timing"] = timing.to_dict()
+    # 输出包含 serialize/persist 耗时，因此在持久化之后重新序列化
     out = json.dumps(result, ensure_ascii=False, indent=2)
     print(out)
-    if getattr(args, "trace", False) and args.trace_file:
-        Path(args.trace_file).write_text(json.dumps(result["trace"], ensure_ascii=False, indent=2))
-    if getattr(args, "trace_summary", False) and args.trace_file:
-        Path(args.trace_file).write_text(json.dumps(result["trace"], ensure_ascii=False, indent=2))
-    # 可选：将 trace 写入文件
-    if getattr(args, "trace", False) and args.trace_file:
-        Path(args.trace_file).write_text(json.dumps(result["trace"], ensure_ascii=False, indent=2))
-    if getattr(args, "trace_summary", False) and args.trace_file:
+    # 可选：将 JSON trace 写入文件（只写一次；二进制 trace 已在求解时写入）
+    if trace_enabled and args.trace_file and not binary_trace:
         Path(args.trace_file).write_text(json.dumps(result["trace"], ensure_ascii=False, indent=2))
+    if sr.status == "timeout":
+        hint = f"；进度保存在 {checkpoint_path}，可用 --resume 继续" if checkpoint_path else ""
+        print(f"[warn] 搜索达到限制（{metrics.get('stop_reason')}）后停止，结果不完整{hint}", file=sys.stderr)
+    if sr.status == "interrupted":
+        print(f"求解已中断，进度保存在 {checkpoint_path}；使用 solve --resume {checkpoint_path} 继续", file=sys.stderr)
+        return 3
+    return 0
+
 
-    # DB 默认开启，verify 成功后写入
-    if _db_is_enabled(args) and verify_ok:
-        writer = SQLiteResultWriter(_db_path(args))
+def _cmd_solve_batch(args: argparse.Namespace) -> int:
+    """Solve a corpus (dir/glob/file) over a process pool; stream JSONL results."""
+    paths = collect_puzzle_paths(args.source)
+    if not paths:
+        print(f"未找到任何谜题文件：{args.source}", file=sys.stderr)
+        return 2
+    if args.resume and not args.out:
+        print("--resume 需要同时指定 --out", file=sys.stderr)
+        return 2
+    if not _require_batch_method([args.method]):
+        return 2
+
+    skip_ids: set[str] = set()
+    if args.resume:
+        drop_partial_tail(args.out)
+        skip_ids = read_done_ids(args.out)
+
+    # 批量模式：后台线程 + 有界队列，按批次事务写入，避免 DB 拖慢求解结果的消费
+    writer = None
+    if _db_is_enabled(args):
+        writer = SQLiteResultWriter(_db_path(args), batch_size=500, background=True)
+        writer.ensure_schema()
+
+    def _persist(rec: dict) -> None:
+        if writer is None or not should_persist(rec["status"], rec.get("solution") is not None, bool(rec.get("verify_ok"))):
+            return
         try:
-            writer.ensure_schema()
-            row = build_row_from_outputs(
-                test_case_id=Path(args.puzzle).name,
-                method=method,
-                status=sr.status,
-                metrics=metrics,
-                time_ms=elapsed_ms,
-                created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            writer.write(
+                build_row_from_outputs(
+                    test_case_id=rec["id"],
+                    method=args.method,
+                    status=rec["status"],
+                    metrics=rec["metrics"],
+                    time_ms=rec["time_ms"],
+                    created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                )
             )
-            writer.write(row)
         except Exception as e:  # noqa: BLE001
             print(f"[warn] DB 持久化失败：{e}", file=sys.stderr)
+
+    history = None
+    if args.schedule == "cost" and args.history:
+        try:
+            con = open_db(_db_path(args))
+            try:
+                history = time_history(con, args.method)
+            finally:
+                con.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[warn] 无法读取历史耗时，仅按特征预测：{e}", file=sys.stderr)
+
+    aggregate = MetricsAggregate() if args.metrics_out else None
+    out = open(args.out, "a" if args.resume else "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        summary = run_batch(
+            paths,
+            out,
+            method=args.method,
+            jobs=args.jobs,
+            chunksize=args.chunksize,
+            ordered=args.order == "input",
+            skip_ids=skip_ids,
+            on_result=_persist,
+            limits={"time_limit_ms": args.time_limit_ms, "max_nodes": args.max_nodes},
+            aggregate=aggregate,
+            schedule=args.schedule,
+            history=history,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception as e:  # noqa: BLE001
+                print(f"[warn] DB 持久化失败：{e}", file=sys.stderr)
+    if aggregate is not None:
+        Path(args.metrics_out).write_text(json.dumps(aggregate.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+    print(json.dumps({"summary": asdict(summary)}, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _cmd_metrics_merge(args: argparse.Namespace) -> int:
+    """Merge metrics summaries of several runs/shards into one (exact)."""
+    parts = []
+    for path in args.summaries:
+        try:
+            parts.append(MetricsAggregate.from_dict(json.loads(Path(path).read_text(encoding="utf-8"))))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"读取指标汇总失败：{path}: {e}", file=sys.stderr)
+            return 2
+    merged = merge_all(parts).to_dict()
+    text = json.dumps(merged, ensure_ascii=False, separators=(",", ":"))
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    """Benchmark methods over a corpus; optionally save the run / compare with a baseline."""
+    if not _require_batch_method(args.method or []):
+        return 2
+    corpus, errors = load_corpus(args.source)
+    for msg in errors:
+        print(f"[warn] 跳过无法读取的谜题：{msg}", file=sys.stderr)
+    if not corpus:
+        print(f"未找到任何谜题：{args.source}", file=sys.stderr)
+        return 2
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_run(args.baseline, args.runs_dir)
+        except (OSError, ValueError) as e:
+            print(f"基线读取失败：{e}", file=sys.stderr)
+            return 2
+
+    methods = args.method or ["cp"]
+    try:
+        run = run_bench(corpus, methods, warmup=args.warmup, repeat=args.repeat, name=args.name, source=args.source)
+    except ValueError as e:  # e.g. vec/dlx on a non-9x9 corpus
+        print(f"基准测试失败：{e}", file=sys.stderr)
+        return 2
+    if args.name:
+        save_run(run, args.name, args.runs_dir)
+    report = dict(run)
+    code = 0
+    if baseline is not None:
+        comparison = compare_runs(run, baseline, args.threshold)
+        report["baseline"] = {"name": args.baseline, "threshold_pct": args.threshold, "comparison": comparison}
+        regressions = [c for c in comparison if c["regression"]]
+        for c in regressions:
+            print(
+                f"性能回退：{c['method']} {c['metric']} {c['baseline']} -> {c['current']}（变差 {c['change_pct']}% > {args.threshold}%）",
+                file=sys.stderr,
+            )
+        code = 1 if regressions else 0
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return code
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    """Run the long-lived solver service until SIGINT/SIGTERM."""
+    import asyncio
+
+    from sudoku_solver.service.server import SolverService
+
+    if args.socket is None and args.port is None:
+        print("需要指定 --socket 或 --port", file=sys.stderr)
+        return 2
+    writer = None
+    if _db_is_enabled(args):
+        # 单个常驻 writer：后台线程批量提交
+        writer = SQLiteResultWriter(_db_path(args), batch_size=100, background=True)
+    service = SolverService(
+        method=args.method,
+        jobs=args.jobs,
+        max_pending=args.max_pending,
+        timeout_ms=args.timeout_ms,
+        writer=writer,
+    )
+    asyncio.run(service.serve(socket_path=args.socket, host=args.host, port=args.port))
+    print(json.dumps({"summary": service.counters}, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _cmd_count(args: argparse.Namespace) -> int:
+    """Count the solutions of a puzzle exactly (or up to --limit)."""
+    try:
+        puzzle = load_puzzle(args.puzzle)
+    except Exception as e:  # noqa: BLE001
+        print(f"输入无效：{e}", file=sys.stderr)
+        return 2
+    if puzzle.size != 9:
+        print(f"count 仅支持 9x9 网格（当前为 {puzzle.size}x{puzzle.size}）", file=sys.stderr)
+        return 2
+    if args.limit is not None and args.limit < 0:
+        print("--limit 不能为负数", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    res = count_solutions(puzzle, limit=args.limit, cache_size=args.cache_size)
+    report = {
+        "count": res.count,
+        "exact": res.exact,
+        "limit": args.limit,
+        "nodes": res.nodes,
+        "cache": {
+            "hits": res.cache_hits,
+            "misses": res.cache_misses,
+            "hit_rate": round(res.hit_rate, 4),
+            "evictions": res.cache_evictions,
+            "size": res.cache_size,
+            "capacity": args.cache_size,
+        },
+        "time_ms": int((time.perf_counter() - t0) * 1000),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    """Generate unique-solution puzzles; stream them as lines or JSONL, summary on stderr."""
+    if args.count is not None and args.count < 0:
+        print("--count 不能为负数", file=sys.stderr)
+        return 2
+    if args.format == "packed" and not args.out:
+        print("--format packed 需要同时指定 --out", file=sys.stderr)
+        return 2
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    try:
+        stream = generate_puzzles(args.count, clues=args.clues, symmetry=args.symmetry, seed=seed, max_attempts=args.max_attempts, start=args.start)
+        summary = GenerationSummary()
+        if args.format == "packed":
+            out = PackedWriter(args.out, with_solution=args.with_solution)
+        else:
+            out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+        t0 = time.perf_counter()
+        try:
+            for p in stream:
+                if args.format == "packed":
+                    out.write(p.puzzle, p.solution if args.with_solution else None)
+                elif args.format == "json":
+                    rec = {"id": p.index + 1, "grid": p.grid, "clues": p.clues}
+                    if args.with_solution:
+                        rec["solution"] = p.solution_grid
+                    out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                else:
+                    line = format_line(p.puzzle)
+                    out.write(line + "," + format_line(p.solution) + "\n" if args.with_solution else line + "\n")
+                summary.add(p)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    except ValueError as e:
+        print(f"生成失败：{e}", file=sys.stderr)
+        return 2
+    report = {"seed": seed, "symmetry": args.symmetry, **asdict(summary.finish(time.perf_counter() - t0))}
+    print(json.dumps({"summary": report}, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _cmd_trace_dump(args: argparse.Namespace) -> int:
+    """Decode a binary trace into JSON steps, one per line."""
+    try:
+        for i, step in enumerate(iter_trace_steps(args.trace_file)):
+            if args.limit is not None and i >= args.limit:
+                break
+            sys.stdout.write(json.dumps(step, ensure_ascii=False) + "\n")
+    except (OSError, ValueError) as e:
+        print(f"trace 读取失败：{e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def _cmd_trace_stats(args: argparse.Namespace) -> int:
+    """Print summary counts of a binary trace."""
+    try:
+        stats = summarize_trace(args.trace_file)
+    except (OSError, ValueError) as e:
+        print(f"trace 读取失败：{e}", file=sys.stderr)
+        return 2
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    return 0
+
+
+def _cmd_report(args: argparse.Namespace) -> int:
+    """Summaries over the results DB from its rollup tables / indexes."""
+    try:
+        con = open_db(_db_path(args))
+    except (OSError, sqlite3.Error) as e:
+        print(f"结果库读取失败：{e}", file=sys.stderr)
+        return 2
+    try:
+        if args.report_command == "methods":
+            rows = compare_methods(con, args.method, baseline=args.baseline)
+        elif args.report_command == "history":
+            rows = case_history(con, args.test_case_id, method=args.method, limit=args.limit)
+        else:
+            rows = window_summary(con, since=args.since, until=args.until, by=args.by, method=args.method)
+    except sqlite3.Error as e:
+        print(f"结果库读取失败：{e}", file=sys.stderr)
+        return 2
+    finally:
+        con.close()
+    print(render(rows, args.format))
+    return 0
+
+
+def _cmd_report_rebuild(args: argparse.Namespace) -> int:
+    """Recompute the rollup tables from ``results`` (the only report command that writes)."""
+    path = _db_path(args)
+    if not path.is_file():
+        print(f"结果库读取失败：结果库不存在：{path}", file=sys.stderr)
+        return 2
+    try:
+        with SQLiteResultWriter(path) as writer:
+            writer.rebuild_rollups()
+    except sqlite3.Error as e:
+        print(f"汇总表重建失败：{e}", file=sys.stderr)
+        return 2
+    print(json.dumps({"rebuilt": str(path)}, ensure_ascii=False))
     return 0
 
 
@@ -111,6 +542,56 @@ def _cmd_verify(args: argparse.Namespace) -> int:
     return 0
 
 
+def _cmd_verify_batch(args: argparse.Namespace) -> int:
+    """Verify a stream of puzzle/solution pairs; failures as JSONL, summary on stderr."""
+    if not Path(args.source).is_file():
+        print(f"未找到输入文件：{args.source}", file=sys.stderr)
+        return 2
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        summary = run_verify_batch(
+            iter_pairs(args.source, fmt=args.format, puzzles_dir=args.puzzles),
+            out,
+            chunk=args.chunk,
+            use_numpy=False if args.no_numpy else None,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps({"summary": asdict(summary)}, ensure_ascii=False), file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+def _positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要整数，实际为 {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"必须 >= 1，实际为 {value}")
+    return value
+
+
+def _non_negative_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要整数，实际为 {text!r}") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"必须 >= 0，实际为 {value}")
+    return value
+
+
+def _non_negative_float(text: str) -> float:
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要数字，实际为 {text!r}") from None
+    if not value >= 0:
+        raise argparse.ArgumentTypeError(f"必须 >= 0，实际为 {value}")
+    return value
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="sudoku-solver",
@@ -119,21 +600,171 @@ def build_parser() -> argparse.ArgumentParser:
     sub = parser.add_subparsers(dest="command", required=True)
 
     p_solve = sub.add_parser("solve", help="求解一个数独 JSON 文件")
-    p_solve.add_argument("puzzle", help="输入 JSON 文件路径")
+    p_solve.add_argument("puzzle", nargs="?", help="输入 JSON 文件路径（使用 --resume 时可省略）")
     grp = p_solve.add_mutually_exclusive_group()
     grp.add_argument("--trace", action="store_true", help="开启 trace 步骤记录")
     grp.add_argument("--trace-summary", action="store_true", help="开启 trace 汇总模式（仅输出计数，不包含步骤）")
     p_solve.add_argument("--trace-file", help="将 trace 写入文件")
+    p_solve.add_argument(
+        "--trace-format",
+        choices=["json", "binary"],
+        default="json",
+        help="trace 文件格式：json=结束后写入 JSON（默认），binary=求解时流式写入定长二进制记录（需 --trace-file）",
+    )
+    p_solve.add_argument("--trace-compress", action="store_true", help="二进制 trace 使用 gzip 压缩")
+    p_solve.add_argument("--trace-tail", type=_positive_int, metavar="N", help="只保留最后 N 个步骤（环形缓冲）")
+    p_solve.add_argument("--trace-sample", type=_positive_int, metavar="K", help="每 K 个事件记录一个（确定性采样）")
+    p_solve.add_argument("--trace-depth-max", type=_non_negative_int, metavar="D", help="只记录深度 <= D 的事件")
+    p_solve.add_argument(
+        "--method",
+        choices=sorted(SOLVERS),
+        default="bt",
+        help="求解方法：bt=纯回溯，cp=约束传播（唯一候选/隐性唯一）+ MRV 回溯，dlx=Dancing Links 精确覆盖（默认 bt）",
+    )
+    p_solve.add_argument("--time-limit-ms", type=_non_negative_float, metavar="MS", help="搜索时间上限（毫秒），超出时停止并返回 status=timeout")
+    p_solve.add_argument("--max-nodes", type=_non_negative_int, metavar="N", help="搜索节点数上限，达到时停止并返回 status=timeout")
+    p_solve.add_argument("--jobs", type=int, default=1, help="并行搜索的进程数（仅 bt；默认 1 即串行）")
+    p_solve.add_argument("--checkpoint", metavar="FILE", help="启用 checkpoint（仅 bt）：SIGTERM 时保存进度并退出（退出码 3）")
+    p_solve.add_argument("--checkpoint-interval-s", type=float, metavar="S", help="每 S 秒额外保存一次 checkpoint")
+    p_solve.add_argument("--resume", metavar="FILE", help="从 checkpoint 继续求解（结果与不中断时一致）")
+    p_solve.add_argument("--profile", metavar="FILE", help="用 cProfile 采样求解过程，写出 pstats 文件")
+    p_solve.add_argument("--profile-memory", action="store_true", help="用 tracemalloc 记录峰值分配（较慢），写入 metrics.timing")
+    p_solve.add_argument("--cache", action="store_true", help="启用解缓存（对称等价的谜题只求解一次，与结果同库）")
     # DB 开关/路径
     p_solve.add_argument("--db", help="结果持久化 SQLite 路径（默认 var/results.sqlite3）")
     p_solve.add_argument("--no-db", action="store_true", help="禁用结果持久化（默认开启，verify 成功后写入）")
     p_solve.set_defaults(func=_cmd_solve)
 
+    p_batch = sub.add_parser("solve-batch", help="批量求解目录/通配符/文件中的谜题，按行输出 JSONL")
+    p_batch.add_argument("source", help="谜题目录、通配符（如 'data/*.json'）或单个 JSON 文件")
+    p_batch.add_argument(
+        "--method",
+        choices=BATCH_METHODS,
+        default="bt",
+        help="求解方法（默认 bt）；vec=NumPy 按块批量 singles 传播、未解出的交给 cp（仅 9x9，需要 numpy，块大小即 --chunksize）",
+    )
+    p_batch.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="工作进程数（默认 CPU 核数；1 表示单进程）")
+    p_batch.add_argument("--chunksize", type=int, default=16, help="每次派发给工作进程的谜题数（默认 16）")
+    p_batch.add_argument(
+        "--order",
+        choices=["completion", "input"],
+        default="completion",
+        help="输出顺序：completion=完成顺序（默认），input=输入顺序",
+    )
+    p_batch.add_argument(
+        "--schedule",
+        choices=["fifo", "cost"],
+        default="fifo",
+        help="派发策略：fifo=按输入顺序等长分块（默认），cost=按难度特征预测耗时、最难的先派发并动态调整块大小",
+    )
+    p_batch.add_argument("--history", action="store_true", help="与 --schedule cost 同用：用结果库中同一 test_case_id 的历史 time_ms 校准预测")
+    p_batch.add_argument("--time-limit-ms", type=_non_negative_float, metavar="MS", help="每题搜索时间上限（毫秒），超出时该题 status=timeout")
+    p_batch.add_argument("--max-nodes", type=_non_negative_int, metavar="N", help="每题搜索节点数上限，达到时该题 status=timeout")
+    p_batch.add_argument("--out", help="JSONL 输出文件（默认 stdout）")
+    p_batch.add_argument("--resume", action="store_true", help="跳过 --out 中已存在的 id，继续追加写入")
+    p_batch.add_argument("--db", help="结果持久化 SQLite 路径（默认 var/results.sqlite3）")
+    p_batch.add_argument("--no-db", action="store_true", help="禁用结果持久化")
+    p_batch.add_argument("--metrics-out", metavar="FILE", help="运行结束时写出按 method/status 聚合的指标分布（JSON，不保留逐题记录；可用 metrics-merge 合并）")
+    p_batch.set_defaults(func=_cmd_solve_batch)
+
+    p_mmerge = sub.add_parser("metrics-merge", help="合并多个 solve-batch --metrics-out 指标汇总（分片/多机运行，精确合并）")
+    p_mmerge.add_argument("summaries", nargs="+", help="指标汇总 JSON 文件")
+    p_mmerge.add_argument("--out", help="输出文件（默认 stdout）")
+    p_mmerge.set_defaults(func=_cmd_metrics_merge)
+
+    p_bench = sub.add_parser("bench", help="基准测试：吞吐、延迟分位数、节点速率与峰值内存，可与基线比较")
+    p_bench.add_argument("source", help="谜题目录、通配符（JSON）或 81 字符/行题库文件")
+    p_bench.add_argument(
+        "--method",
+        action="append",
+        choices=BATCH_METHODS,
+        help="参与测试的求解方法，可重复指定（默认 cp；vec 为整个题库一批的 NumPy 批量求解，延迟为均摊值）",
+    )
+    p_bench.add_argument("--warmup", type=int, default=1, help="每题预热次数（不计时，默认 1）")
+    p_bench.add_argument("--repeat", type=int, default=3, help="每题计时次数（默认 3）")
+    p_bench.add_argument("--name", help="保存本次结果为命名运行（<runs-dir>/<name>.json）")
+    p_bench.add_argument("--baseline", help="与已保存的命名运行比较")
+    p_bench.add_argument("--threshold", type=float, default=10.0, help="回退阈值（百分比，默认 10）；超过则退出码为 1")
+    p_bench.add_argument("--runs-dir", default="var/bench", help="命名运行的存放目录（默认 var/bench）")
+    p_bench.set_defaults(func=_cmd_bench)
+
+    p_serve = sub.add_parser("serve", help="常驻求解服务：Unix socket 或本机端口，每行一个 JSON 请求/响应")
+    where = p_serve.add_mutually_exclusive_group()
+    where.add_argument("--socket", help="Unix socket 路径")
+    where.add_argument("--port", type=int, help="监听端口（仅本机，0 表示随机端口）")
+    p_serve.add_argument("--host", default="127.0.0.1", help="监听地址（默认 127.0.0.1）")
+    p_serve.add_argument("--method", choices=sorted(SOLVERS), default="bt", help="默认求解方法，请求可用 method 字段覆盖（默认 bt）")
+    p_serve.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="预启动的工作进程数（默认 CPU 核数）")
+    p_serve.add_argument("--max-pending", type=_positive_int, help="同时在系统中的请求上限（执行+排队，默认 jobs*4），超出直接返回 overloaded")
+    p_serve.add_argument("--timeout-ms", type=_positive_int, help="默认单请求超时（毫秒），请求可用 timeout_ms 字段覆盖")
+    p_serve.add_argument("--db", help="结果持久化 SQLite 路径（默认 var/results.sqlite3）")
+    p_serve.add_argument("--no-db", action="store_true", help="禁用结果持久化")
+    p_serve.set_defaults(func=_cmd_serve)
+
+    p_count = sub.add_parser("count", help="精确统计谜题的解数（不保存解；传播剪枝 + 子状态记忆化）")
+    p_count.add_argument("puzzle", help="输入 JSON 文件路径")
+    p_count.add_argument("--limit", type=int, help="解数上限：超过时停止，输出 count=limit 且 exact=false")
+    p_count.add_argument("--cache-size", type=int, default=COUNT_CACHE_SIZE, help=f"记忆化缓存容量（子状态条数，LRU 淘汰，默认 {COUNT_CACHE_SIZE}；0 表示不缓存）")
+    p_count.set_defaults(func=_cmd_count)
+
+    p_gen = sub.add_parser("generate", help="生成唯一解谜题（随机终盘 + 按对称方式挖空，增量唯一性检查），流式输出")
+    p_gen.add_argument("--count", type=int, default=1, help="生成的谜题数（默认 1）")
+    p_gen.add_argument("--clues", type=int, help="目标提示数（17..81）；默认挖到无法再挖为止（对该对称方式极小）")
+    p_gen.add_argument("--symmetry", choices=SYMMETRIES, default="none", help="挖空对称方式（默认 none）")
+    p_gen.add_argument("--seed", type=int, help="随机种子（相同种子输出相同；默认随机，写入汇总）")
+    p_gen.add_argument("--start", type=int, default=0, help="从种子序列的第几题开始（0-based，默认 0），用于分片续跑")
+    p_gen.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, help=f"每题最多的挖空轮数，未达到 --clues 则报错（默认 {MAX_ATTEMPTS}）")
+    p_gen.add_argument("--format", choices=["line", "json", "packed"], default="line", help="输出格式：line=81 字符/行（默认），json=每行一个 puzzle JSON，packed=每格 4 位的二进制文件（需 --out）")
+    p_gen.add_argument("--with-solution", action="store_true", help="同时输出终盘（line 格式为 ,solution 列；json 为 solution 字段；packed 为记录内的第二个网格）")
+    p_gen.add_argument("--out", help="输出文件（默认 stdout）")
+    p_gen.set_defaults(func=_cmd_generate)
+
+    p_trace = sub.add_parser("trace", help="读取二进制 trace 文件")
+    trace_sub = p_trace.add_subparsers(dest="trace_command", required=True)
+    p_dump = trace_sub.add_parser("dump", help="解码为 JSON 步骤（每行一个）")
+    p_dump.add_argument("trace_file", help="二进制 trace 文件路径")
+    p_dump.add_argument("--limit", type=int, help="最多输出的步骤数")
+    p_dump.set_defaults(func=_cmd_trace_dump)
+    p_stats = trace_sub.add_parser("stats", help="输出各事件计数与最大深度")
+    p_stats.add_argument("trace_file", help="二进制 trace 文件路径")
+    p_stats.set_defaults(func=_cmd_trace_stats)
+
+    p_report = sub.add_parser("report", help="结果库报表：方法对比、单题历史、时间窗口汇总（读取汇总表与索引）")
+    report_sub = p_report.add_subparsers(dest="report_command", required=True)
+    p_rmethods = report_sub.add_parser("methods", help="方法对比：各状态题数、平均/最大耗时与搜索规模")
+    p_rmethods.add_argument("--method", action="append", help="只比较指定方法（可重复）")
+    p_rmethods.add_argument("--baseline", help="基线方法：输出 speedup = 基线平均耗时 / 本方法平均耗时")
+    p_rhistory = report_sub.add_parser("history", help="单题历史：某个 test_case_id 的最近结果")
+    p_rhistory.add_argument("test_case_id", help="测试用例 ID（如 002.json）")
+    p_rhistory.add_argument("--method", help="只看指定方法")
+    p_rhistory.add_argument("--limit", type=int, default=50, help="最多输出的行数（默认 50）")
+    p_rwindow = report_sub.add_parser("window", help="时间窗口汇总：按小时/天/整体统计各方法")
+    p_rwindow.add_argument("--since", help="起始时间（含），ISO-8601 前缀，如 2024-01-01 或 2024-01-01T05（按小时取整）")
+    p_rwindow.add_argument("--until", help="结束时间（不含），格式同 --since")
+    p_rwindow.add_argument("--by", choices=["hour", "day", "all"], default="day", help="汇总粒度（默认 day）")
+    p_rwindow.add_argument("--method", help="只看指定方法")
+    for p in (p_rmethods, p_rhistory, p_rwindow):
+        p.add_argument("--db", help="结果库 SQLite 路径（默认 var/results.sqlite3）")
+        p.add_argument("--format", choices=FORMATS, default="table", help="输出格式：table（默认）、csv、json")
+        p.set_defaults(func=_cmd_report)
+    p_rrebuild = report_sub.add_parser("rebuild", help="从 results 重新计算汇总表（报表命令只读打开结果库，此命令会写入）")
+    p_rrebuild.add_argument("--db", help="结果库 SQLite 路径（默认 var/results.sqlite3）")
+    p_rrebuild.set_defaults(func=_cmd_report_rebuild)
+
     p_verify = sub.add_parser("verify", help="验证一个解是否满足约束")
     p_verify.add_argument("puzzle", help="输入 JSON 文件路径")
     p_verify.add_argument("--solution", required=True, help="解的 JSON 文件路径")
     p_verify.set_defaults(func=_cmd_verify)
 
+    p_vbatch = sub.add_parser("verify-batch", help="批量验证谜题/解对（JSONL 或行格式），按 ID 输出失败项与吞吐汇总")
+    p_vbatch.add_argument("source", help="输入文件：JSONL（grid + solution，可选 id）或 puzzle,solution 行格式")
+    p_vbatch.add_argument("--format", choices=["auto", "jsonl", "line", "packed"], default="auto", help="输入格式（默认 auto：按打包文件头/扩展名/首字符判断）")
+    p_vbatch.add_argument("--puzzles", metavar="DIR", help="JSONL 记录缺少 grid 时，从 DIR/<id> 读取谜题（用于 solve-batch 的输出）")
+    p_vbatch.add_argument("--chunk", type=int, default=VERIFY_CHUNK, help=f"每批验证的记录数（默认 {VERIFY_CHUNK}）")
+    p_vbatch.add_argument("--no-numpy", action="store_true", help="不使用 NumPy 向量化路径（逐条位掩码验证）")
+    p_vbatch.add_argument("--out", help="失败项 JSONL 输出文件（默认 stdout）")
+    p_vbatch.set_defaults(func=_cmd_verify_batch)
+
     return parser
 
 
@@ -0,0 +1,199 @@
+"""Read-side queries over the results DB (``report`` subcommand).
+
+Method comparisons and time-window summaries read the rollup tables that
+`SQLiteResultWriter` maintains on insert (``results_rollup`` per
+method/status, ``results_rollup_hourly`` per hour/method/status), so their
+cost does not grow with the number of result rows. The DB is opened
+read-only; a DB written before rollups existed is summarized from
+``results`` directly until a write path (or ``report rebuild``) creates
+them. Per-test-case history
+reads ``results`` through the ``(test_case_id, method, created_at)`` index,
+and `time_history` feeds past solve times to the batch scheduler.
+
+Every query returns a list of flat dicts; `render` formats them as an
+aligned table, CSV or JSON.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+FORMATS = ("table", "csv", "json")
+STATUSES = ("unique", "multiple", "unsat", "timeout")
+
+Row = Dict[str, Any]
+
+
+# Same columns as the rollup tables, computed from ``results`` (DBs without rollups)
+_RAW_SUMMARY = (
+    "count(*) AS n, count(time_ms) AS time_n, coalesce(sum(time_ms), 0) AS time_ms_sum, max(time_ms) AS time_ms_max, "
+    "coalesce(sum(assignments), 0) AS assignments_sum, coalesce(sum(backtracks), 0) AS backtracks_sum, "
+    "coalesce(sum(num_guess_points), 0) AS guess_points_sum, coalesce(max(max_depth), 0) AS max_depth_max, "
+    "min(created_at) AS first_at, max(created_at) AS last_at FROM results"
+)
+_RAW_ROLLUPS = {
+    "results_rollup": f"(SELECT method, status, {_RAW_SUMMARY} GROUP BY method, status)",
+    "results_rollup_hourly": f"(SELECT substr(created_at, 1, 13) AS hour, method, status, {_RAW_SUMMARY} GROUP BY hour, method, status)",
+}
+
+
+def open_db(path: str | Path) -> sqlite3.Connection:
+    """Connect read-only to an existing results DB (it is never modified)."""
+    p = Path(path)
+    if not p.is_file():
+        raise FileNotFoundError(f"结果库不存在：{p}")
+    con = sqlite3.connect(f"{p.resolve().as_uri()}?mode=ro", uri=True)
+    con.row_factory = sqlite3.Row
+    return con
+
+
+def _rollup(con: sqlite3.Connection, table: str) -> str:
+    """`table` if the DB has it, else an equivalent aggregate over ``results``."""
+    found = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return table if found else _RAW_ROLLUPS[table]
+
+
+def _ratio(num: Optional[float], den: Optional[float]) -> Optional[float]:
+    return round(num / den, 3) if num is not None and den else None
+
+
+def _mean(total: Optional[int], n: int) -> Optional[float]:
+    return round(total / n, 3) if n and total is not None else None
+
+
+def compare_methods(con: sqlite3.Connection, methods: Optional[Sequence[str]] = None, baseline: Optional[str] = None) -> List[Row]:
+    """One row per method: run counts per status and mean costs from ``results_rollup``.
+
+    With `baseline`, ``speedup`` is the baseline's mean time over the method's.
+    """
+    sql = (
+        "SELECT method, status, n, time_n, time_ms_sum, time_ms_max, assignments_sum, backtracks_sum, "
+        f"guess_points_sum, max_depth_max, last_at FROM {_rollup(con, 'results_rollup')}"
+    )
+    params: List[Any] = []
+    if methods:
+        sql += f" WHERE method IN ({', '.join('?' * len(methods))})"
+        params.extend(methods)
+    acc: Dict[str, Row] = {}
+    for r in con.execute(sql + " ORDER BY method", params):
+        a = acc.setdefault(r["method"], {"n": 0, "time_n": 0, "time_ms_sum": 0, "time_ms_max": None, "assignments_sum": 0, "backtracks_sum": 0, "guess_points_sum": 0, "max_depth": 0, "statuses": {}})
+        a["statuses"][r["status"]] = r["n"]
+        for k in ("n", "time_n", "time_ms_sum", "assignments_sum", "backtracks_sum", "guess_points_sum"):
+            a[k] += r[k]
+        if r["time_ms_max"] is not None:
+            a["time_ms_max"] = max(a["time_ms_max"] or 0, r["time_ms_max"])
+        a["max_depth"] = max(a["max_depth"], r["max_depth_max"])
+        a["last_at"] = max(a.get("last_at", ""), r["last_at"])
+    rows: List[Row] = []
+    for method, a in acc.items():
+        row: Row = {"method": method, "runs": a["n"]}
+        for status in STATUSES:
+            row[status] = a["statuses"].get(status, 0)
+        row["mean_time_ms"] = _mean(a["time_ms_sum"], a["time_n"])
+        row["max_time_ms"] = a["time_ms_max"]
+        row["mean_assignments"] = _mean(a["assignments_sum"], a["n"])
+        row["mean_backtracks"] = _mean(a["backtracks_sum"], a["n"])
+        row["mean_guess_points"] = _mean(a["guess_points_sum"], a["n"])
+        row["max_depth"] = a["max_depth"]
+        row["last_at"] = a["last_at"]
+        rows.append(row)
+    if baseline is not None:
+        base = next((r["mean_time_ms"] for r in rows if r["method"] == baseline), None)
+        for row in rows:
+            row["speedup"] = _ratio(base, row["mean_time_ms"])
+    return rows
+
+
+def case_history(con: sqlite3.Connection, test_case_id: str, method: Optional[str] = None, limit: int = 50) -> List[Row]:
+    """Most recent results of one test case (newest first), optionally for one method."""
+    sql = (
+        "SELECT created_at, method, status, time_ms, assignments, backtracks, num_guess_points, max_depth, stop_reason "
+        "FROM results WHERE test_case_id = ?"
+    )
+    params: List[Any] = [test_case_id]
+    if method:
+        sql += " AND method = ?"
+        params.append(method)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+    params.append(max(1, limit))
+    return [dict(r) for r in con.execute(sql, params)]
+
+
+def window_summary(
+    con: sqlite3.Connection,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    by: str = "day",
+    method: Optional[str] = None,
+) -> List[Row]:
+    """Per-period/method totals from ``results_rollup_hourly``.
+
+    `since` (inclusive) and `until` (exclusive) are ISO-8601 prefixes
+    (``2024-01-01``, ``2024-01-01T05``); the rollup is hourly, so bounds are
+    truncated to the hour. `by` is ``hour``, ``day`` or ``all``.
+    """
+    period = {"hour": "hour", "day": "substr(hour, 1, 10)", "all": "'all'"}[by]
+    where: List[str] = []
+    params: List[Any] = []
+    if since:
+        where.append("hour >= ?")
+        params.append(since[:13])
+    if until:
+        where.append("hour < ?")
+        params.append(until[:13])
+    if method:
+        where.append("method = ?")
+        params.append(method)
+    sql = (
+        f"SELECT {period} AS period, method, sum(n) AS runs, "
+        "sum(CASE WHEN status = 'timeout' THEN n ELSE 0 END) AS timeouts, "
+        "sum(time_n) AS time_n, sum(time_ms_sum) AS time_ms_sum, max(time_ms_max) AS max_time_ms, "
+        "sum(assignments_sum) AS assignments_sum, sum(backtracks_sum) AS backtracks_sum "
+        f"FROM {_rollup(con, 'results_rollup_hourly')}"
+        + (f" WHERE {' AND '.join(where)}" if where else "")
+        + " GROUP BY period, method ORDER BY period, method"
+    )
+    return [
+        {
+            "period": r["period"],
+            "method": r["method"],
+            "runs": r["runs"],
+            "timeouts": r["timeouts"],
+            "mean_time_ms": _mean(r["time_ms_sum"], r["time_n"]),
+            "max_time_ms": r["max_time_ms"],
+            "mean_assignments": _mean(r["assignments_sum"], r["runs"]),
+            "mean_backtracks": _mean(r["backtracks_sum"], r["runs"]),
+        }
+        for r in con.execute(sql, params)
+    ]
+
+
+def time_history(con: sqlite3.Connection, method: str) -> Dict[str, float]:
+    """Mean past ``time_ms`` per test case for `method` (cost hints for `batch.scheduling`)."""
+    sql = "SELECT test_case_id, avg(time_ms) FROM results WHERE method = ? AND time_ms IS NOT NULL GROUP BY test_case_id"
+    return {case: float(ms) for case, ms in con.execute(sql, (method,))}
+
+
+def render(rows: List[Row], fmt: str = "table") -> str:
+    """Format rows as an aligned text table, CSV (with header) or a JSON array."""
+    if fmt == "json":
+        return json.dumps(rows, ensure_ascii=False, indent=2)
+    columns = list(rows[0]) if rows else []
+    if fmt == "csv":
+        buf = io.StringIO()
+        w = csv.DictWriter(buf, fieldnames=columns, lineterminator="\n")
+        w.writeheader()
+        w.writerows(rows)
+        return buf.getvalue().rstrip("\n")
+    if not rows:
+        return "（无结果）"
+    cells = [["" if r[c] is None else str(r[c]) for c in columns] for r in rows]
+    widths = [max(len(c), *(len(line[i]) for line in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths)).rstrip()]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.ljust(w) for v, w in zip(line, widths)).rstrip() for line in cells)
+    return "\n".join(lines)
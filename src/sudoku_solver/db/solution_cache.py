@@ -0,0 +1,161 @@
+"""Solution cache keyed by the symmetry-canonical puzzle.
+
+Entries live in a ``solution_cache`` table next to ``results`` (same SQLite
+file) with an in-memory LRU in front. Keys are a hash of the canonical
+string from `sudoku_solver.board.canonical`, so a puzzle and any relabeled /
+permuted / transposed copy share one entry; solutions are stored in the
+canonical frame and mapped back through the puzzle's transform on a hit.
+Canonicalization results are memoized per raw puzzle as well, so exact
+repeats skip it.
+
+Entries are only meaningful for the default ``max_solutions=2`` contract
+(unique / multiple / unsat) and for untraced solves.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sudoku_solver.board.canonical import Transform, apply_transform, canonicalize, invert_transform
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.db.sqlite_writer import PRAGMAS
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver import SOLVERS
+from sudoku_solver.trace.tracer import Tracer
+from sudoku_solver.types import SolveResult, Stats
+
+SCHEMA_SQL = (
+    "CREATE TABLE IF NOT EXISTS solution_cache (\n"
+    "    puzzle_hash TEXT PRIMARY KEY,\n"
+    "    canonical TEXT NOT NULL,\n"
+    "    status TEXT NOT NULL,\n"
+    "    solution TEXT,\n"
+    "    method TEXT NOT NULL,\n"
+    "    created_at TEXT NOT NULL\n"
+    ");"
+)
+
+_Entry = Tuple[str, Optional[str]]  # (status, canonical-frame solution as 81 chars)
+_Key = Tuple[str, Transform]  # (puzzle hash, transform into the canonical frame)
+
+
+def puzzle_hash(canonical: str) -> str:
+    return hashlib.blake2b(canonical.encode("ascii"), digest_size=16).hexdigest()
+
+
+def _to_str(cells: Sequence[Sequence[int]]) -> str:
+    return "".join(str(v) for row in cells for v in row)
+
+
+def _to_cells(s: str) -> List[List[int]]:
+    return [[ord(ch) - 48 for ch in s[i : i + 9]] for i in range(0, 81, 9)]
+
+
+class SolutionCache:
+    def __init__(self, db_path: str | Path, capacity: int = 4096) -> None:
+        self.path = Path(db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.capacity = max(1, capacity)
+        self.hits = 0
+        self.misses = 0
+        self._lru: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys: OrderedDict[bytes, _Key] = OrderedDict()
+        self._con: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._con is None:
+            con = sqlite3.connect(str(self.path), timeout=30.0)
+            for pragma in PRAGMAS:
+                con.execute(pragma)
+            with con:
+                con.execute(SCHEMA_SQL)
+            self._con = con
+        return self._con
+
+    @staticmethod
+    def _remember(store: OrderedDict, key: str, value: Any, capacity: int) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        if len(store) > capacity:
+            store.popitem(last=False)
+
+    def _key(self, grid: Grid) -> _Key:
+        raw = grid.digits()
+        key = self._keys.get(raw)
+        if key is None:
+            canonical, transform = canonicalize(grid)
+            key = (puzzle_hash(canonical), transform)
+            self._remember(self._keys, raw, key, self.capacity)
+        else:
+            self._keys.move_to_end(raw)
+        return key
+
+    def get(self, grid: Grid) -> Optional[Tuple[str, Optional[List[List[int]]]]]:
+        """Return ``(status, solution in the grid's frame)`` or None on a miss."""
+        h, transform = self._key(grid)
+        entry = self._lru.get(h)
+        if entry is not None:
+            self._lru.move_to_end(h)
+        else:
+            row = self._connect().execute(
+                "SELECT status, solution FROM solution_cache WHERE puzzle_hash = ?", (h,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = (row[0], row[1])
+            self._remember(self._lru, h, entry, self.capacity)
+        status, solution = entry
+        return status, invert_transform(_to_cells(solution), transform) if solution else None
+
+    def put(self, grid: Grid, status: str, solution: Optional[List[List[int]]], method: str) -> None:
+        h, transform = self._key(grid)
+        rows = [grid.data[i : i + 9] for i in range(0, 81, 9)]
+        canonical = _to_str(apply_transform(rows, transform))
+        entry = (status, _to_str(apply_transform(solution, transform)) if solution else None)
+        self._remember(self._lru, h, entry, self.capacity)
+        con = self._connect()
+        with con:
+            con.execute(
+                "INSERT OR REPLACE INTO solution_cache (puzzle_hash, canonical, status, solution, method, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (h, canonical, status, entry[1], method, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())),
+            )
+
+    def solve(self, grid: Grid, method: str = "bt", **solver_kwargs: Any) -> Tuple[SolveResult, Dict[str, Any]]:
+        """Solve through the cache; metrics carry ``cache_hit`` (True/False).
+
+        `solver_kwargs` (e.g. ``time_limit_ms``) go to the solver on a miss;
+        ``timeout`` results are returned but not cached.
+        """
+        cached = self.get(grid)
+        if cached is not None:
+            self.hits += 1
+            status, solution = cached
+            metrics = MetricsCollector()
+            metrics.solutions_found = {"unsat": 0, "unique": 1}.get(status, 2)
+            sr = SolveResult(status=status, solution=solution, stats=Stats(), trace=Tracer(enabled=False).to_json_obj())
+            out = metrics.finalize(status)
+            out["cache_hit"] = True
+            return sr, out
+
+        self.misses += 1
+        sr, out = SOLVERS[method](grid, **solver_kwargs)
+        if sr.status != "timeout":
+            self.put(grid, sr.status, sr.solution, method)
+        out["cache_hit"] = False
+        return sr, out
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    def __enter__(self) -> SolutionCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
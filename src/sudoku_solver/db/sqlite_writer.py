@@ -1,71 +1,367 @@
 """SQLite implementation of ResultWriter.
 
 Uses Python stdlib sqlite3 to avoid extra dependencies.
+
+One connection is kept open per writer (WAL journal, ``synchronous=NORMAL``)
+and rows are inserted with ``executemany`` in batched transactions of up to
+``batch_size`` rows. With ``background=True`` inserts run on a dedicated
+thread fed through a bounded queue, so persistence stays off the solve path;
+`flush` waits for queued rows to be committed and `close` drains the queue.
+
+Every insert batch also updates the rollup tables (`ROLLUP_SQL`) in the same
+transaction: the batch is summed per key in Python and merged with one
+upsert per key, so reports (`db.report`) read a few summary rows instead of
+scanning ``results``.
 """
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .writer import PersistRow, ResultWriter
 
+SCHEMA_SQL = (
+    "CREATE TABLE IF NOT EXISTS results (\n"
+    "    id INTEGER PRIMARY KEY AUTOINCREMENT,\n"
+    "    test_case_id TEXT NOT NULL,\n"
+    "    method TEXT NOT NULL,\n"
+    "    status TEXT NOT NULL,\n"
+    "    solutions_found INTEGER NOT NULL,\n"
+    "    assignments INTEGER NOT NULL,\n"
+    "    backtracks INTEGER NOT NULL,\n"
+    "    contradictions INTEGER NOT NULL,\n"
+    "    max_depth INTEGER NOT NULL,\n"
+    "    num_guess_points INTEGER NOT NULL,\n"
+    "    first_guess_depth INTEGER,\n"
+    "    deduced_assignments INTEGER NOT NULL,\n"
+    "    guessed_assignments INTEGER NOT NULL,\n"
+    "    time_ms INTEGER,\n"
+    "    created_at TEXT NOT NULL,\n"
+    "    parse_ns INTEGER,\n"
+    "    validate_ns INTEGER,\n"
+    "    search_ns INTEGER,\n"
+    "    verify_ns INTEGER,\n"
+    "    serialize_ns INTEGER,\n"
+    "    persist_ns INTEGER,\n"
+    "    peak_alloc_bytes INTEGER,\n"
+    "    stop_reason TEXT\n"
+    ");"
+)
+
+# Nullable columns added after v1; ensure_schema adds them to older databases
+ADDED_COLUMNS = (
+    ("parse_ns", "INTEGER"),
+    ("validate_ns", "INTEGER"),
+    ("search_ns", "INTEGER"),
+    ("verify_ns", "INTEGER"),
+    ("serialize_ns", "INTEGER"),
+    ("persist_ns", "INTEGER"),
+    ("peak_alloc_bytes", "INTEGER"),
+    ("stop_reason", "TEXT"),
+)
+
+# Composite indexes serve per-test-case history and per-method time ranges;
+# they also cover the single-column lookups of the v1 indexes they replace
+INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_results_case_method_time ON results (test_case_id, method, created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_results_method_time ON results (method, created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_results_created_at ON results (created_at);",
+)
+DROPPED_INDEXES = ("idx_results_test_case_id", "idx_results_method")
+
+# Summary columns shared by both rollup tables (see `_rollup_values`)
+_ROLLUP_COLUMNS = (
+    "n INTEGER NOT NULL,\n"
+    "    time_n INTEGER NOT NULL,\n"
+    "    time_ms_sum INTEGER NOT NULL,\n"
+    "    time_ms_max INTEGER,\n"
+    "    assignments_sum INTEGER NOT NULL,\n"
+    "    backtracks_sum INTEGER NOT NULL,\n"
+    "    guess_points_sum INTEGER NOT NULL,\n"
+    "    max_depth_max INTEGER NOT NULL,\n"
+    "    first_at TEXT NOT NULL,\n"
+    "    last_at TEXT NOT NULL"
+)
+
+ROLLUP_SQL = (
+    "CREATE TABLE IF NOT EXISTS results_rollup (\n"
+    "    method TEXT NOT NULL,\n"
+    "    status TEXT NOT NULL,\n"
+    f"    {_ROLLUP_COLUMNS},\n"
+    "    PRIMARY KEY (method, status)\n"
+    ") WITHOUT ROWID;",
+    "CREATE TABLE IF NOT EXISTS results_rollup_hourly (\n"
+    "    hour TEXT NOT NULL,\n"  # created_at[:13], e.g. 2024-01-01T05
+    "    method TEXT NOT NULL,\n"
+    "    status TEXT NOT NULL,\n"
+    f"    {_ROLLUP_COLUMNS},\n"
+    "    PRIMARY KEY (hour, method, status)\n"
+    ") WITHOUT ROWID;",
+)
+
+_ROLLUP_MERGE = (
+    "n = n + excluded.n, time_n = time_n + excluded.time_n, "
+    "time_ms_sum = time_ms_sum + excluded.time_ms_sum, "
+    "time_ms_max = max(coalesce(time_ms_max, excluded.time_ms_max), coalesce(excluded.time_ms_max, time_ms_max)), "
+    "assignments_sum = assignments_sum + excluded.assignments_sum, "
+    "backtracks_sum = backtracks_sum + excluded.backtracks_sum, "
+    "guess_points_sum = guess_points_sum + excluded.guess_points_sum, "
+    "max_depth_max = max(max_depth_max, excluded.max_depth_max), "
+    "first_at = min(first_at, excluded.first_at), last_at = max(last_at, excluded.last_at)"
+)
+
+UPSERT_ROLLUP_SQL = (
+    "INSERT INTO results_rollup VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    f"ON CONFLICT (method, status) DO UPDATE SET {_ROLLUP_MERGE}"
+)
+UPSERT_HOURLY_SQL = (
+    "INSERT INTO results_rollup_hourly VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    f"ON CONFLICT (hour, method, status) DO UPDATE SET {_ROLLUP_MERGE}"
+)
+
+# Rebuilds the rollups from the raw rows (databases written before rollups existed)
+_ROLLUP_SELECT = (
+    "count(*), count(time_ms), coalesce(sum(time_ms), 0), max(time_ms), sum(assignments), "
+    "sum(backtracks), sum(num_guess_points), max(max_depth), min(created_at), max(created_at) FROM results"
+)
+REBUILD_ROLLUP_SQL = (
+    "DELETE FROM results_rollup;",
+    "DELETE FROM results_rollup_hourly;",
+    f"INSERT INTO results_rollup SELECT method, status, {_ROLLUP_SELECT} GROUP BY method, status;",
+    f"INSERT INTO results_rollup_hourly SELECT substr(created_at, 1, 13), method, status, {_ROLLUP_SELECT} "
+    "GROUP BY substr(created_at, 1, 13), method, status;",
+)
+
+INSERT_SQL = (
+    "INSERT INTO results (test_case_id, method, status, solutions_found, "
+    "assignments, backtracks, contradictions, max_depth, num_guess_points, "
+    "first_guess_depth, deduced_assignments, guessed_assignments, time_ms, created_at, "
+    "parse_ns, validate_ns, search_ns, verify_ns, serialize_ns, persist_ns, peak_alloc_bytes, stop_reason) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-16000;",  # ~16 MB
+)
+
+_STOP = object()
+
+
+def _params(row: PersistRow) -> Tuple[object, ...]:
+    return (
+        row.test_case_id,
+        row.method,
+        row.status,
+        row.solutions_found,
+        row.assignments,
+        row.backtracks,
+        row.contradictions,
+        row.max_depth,
+        row.num_guess_points,
+        row.first_guess_depth,
+        row.deduced_assignments,
+        row.guessed_assignments,
+        row.time_ms,
+        row.created_at,
+        row.parse_ns,
+        row.validate_ns,
+        row.search_ns,
+        row.verify_ns,
+        row.serialize_ns,
+        row.persist_ns,
+        row.peak_alloc_bytes,
+        row.stop_reason,
+    )
+
+
+def _summary(group: List[Tuple[Any, ...]]) -> Tuple[Any, ...]:
+    """Rollup columns (`_ROLLUP_COLUMNS` order) of `_params` tuples sharing a key."""
+    times = [p[12] for p in group if p[12] is not None]
+    created = [p[13] for p in group]
+    return (
+        len(group),
+        len(times),
+        sum(times),
+        max(times) if times else None,
+        sum(p[4] for p in group),
+        sum(p[5] for p in group),
+        sum(p[8] for p in group),
+        max(p[7] for p in group),
+        min(created),
+        max(created),
+    )
+
+
+def _rollup_values(rows: List[Tuple[Any, ...]]) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    """Upsert parameters for `results_rollup` and `results_rollup_hourly` from one batch."""
+    hourly: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]] = {}
+    for p in rows:
+        key = (str(p[13])[:13], p[1], p[2])
+        group = hourly.get(key)
+        if group is None:
+            hourly[key] = [p]
+        else:
+            group.append(p)
+    totals: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]] = {}
+    for (_, method, status), group in hourly.items():
+        totals.setdefault((method, status), []).extend(group)
+    return [(*k, *_summary(g)) for k, g in totals.items()], [(*k, *_summary(g)) for k, g in hourly.items()]
+
 
 class SQLiteResultWriter(ResultWriter):
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        batch_size: int = 1,
+        background: bool = False,
+        queue_size: int = 10_000,
+    ) -> None:
         self.path = Path(db_path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.background = background
+        self._con: Optional[sqlite3.Connection] = None
+        self._schema_ready = False
+        self._pending: List[Tuple[object, ...]] = []
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        if background:
+            self._queue = queue.Queue(maxsize=max(1, queue_size))
+            self._thread = threading.Thread(target=self._run, name="sqlite-result-writer", daemon=True)
+            self._thread.start()
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(str(self.path))
+        if self._con is None:
+            con = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=not self.background)
+            for pragma in PRAGMAS:
+                con.execute(pragma)
+            self._con = con
+        return self._con
 
     def ensure_schema(self) -> None:
-        sql = (
-            "CREATE TABLE IF NOT EXISTS results (\n"
-            "    id INTEGER PRIMARY KEY AUTOINCREMENT,\n"
-            "    test_case_id TEXT NOT NULL,\n"
-            "    method TEXT NOT NULL,\n"
-            "    status TEXT NOT NULL,\n"
-            "    solutions_found INTEGER NOT NULL,\n"
-            "    assignments INTEGER NOT NULL,\n"
-            "    backtracks INTEGER NOT NULL,\n"
-            "    contradictions INTEGER NOT NULL,\n"
-            "    max_depth INTEGER NOT NULL,\n"
-            "    num_guess_points INTEGER NOT NULL,\n"
-            "    first_guess_depth INTEGER,\n"
-            "    deduced_assignments INTEGER NOT NULL,\n"
-            "    guessed_assignments INTEGER NOT NULL,\n"
-            "    time_ms INTEGER,\n"
-            "    created_at TEXT NOT NULL\n"
-            ");"
-        )
-        with self._connect() as con:
-            con.execute(sql)
+        if self._schema_ready:
+            return
+        con = self._connect()
+        with con:
+            con.execute(SCHEMA_SQL)
+            existing = {r[1] for r in con.execute("PRAGMA table_info(results)")}
+            for name, sql_type in ADDED_COLUMNS:
+                if name not in existing:
+                    con.execute(f"ALTER TABLE results ADD COLUMN {name} {sql_type}")
+            for sql in INDEX_SQL:
+                con.execute(sql)
+            for name in DROPPED_INDEXES:
+                con.execute(f"DROP INDEX IF EXISTS {name}")
+            tables = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            for sql in ROLLUP_SQL:
+                con.execute(sql)
+            if "results_rollup" not in tables or "results_rollup_hourly" not in tables:
+                for sql in REBUILD_ROLLUP_SQL:
+                    con.execute(sql)
+        self._schema_ready = True
+
+    def rebuild_rollups(self) -> None:
+        """Recompute the rollup tables from ``results`` (e.g. after manual edits)."""
+        self.ensure_schema()
+        con = self._connect()
+        with con:
+            for sql in REBUILD_ROLLUP_SQL:
+                con.execute(sql)
+
+    def _insert(self, rows: List[Tuple[object, ...]]) -> None:
+        if not rows:
+            return
+        totals, hourly = _rollup_values(rows)
+        con = self._connect()
+        with con:
+            con.executemany(INSERT_SQL, rows)
+            con.executemany(UPSERT_ROLLUP_SQL, totals)
+            con.executemany(UPSERT_HOURLY_SQL, hourly)
 
+    # Foreground path
     def write(self, row: PersistRow) -> None:
-        with self._connect() as con:
-            con.execute(
-                (
-                    "INSERT INTO results (test_case_id, method, status, solutions_found, "
-                    "assignments, backtracks, contradictions, max_depth, num_guess_points, "
-                    "first_guess_depth, deduced_assignments, guessed_assignments, time_ms, created_at) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-                ),
-                (
-                    row.test_case_id,
-                    row.method,
-                    row.status,
-                    row.solutions_found,
-                    row.assignments,
-                    row.backtracks,
-                    row.contradictions,
-                    row.max_depth,
-                    row.num_guess_points,
-                    row.first_guess_depth,
-                    row.deduced_assignments,
-                    row.guessed_assignments,
-                    row.time_ms,
-                    row.created_at,
-                ),
-            )
+        self.write_many((row,))
+
+    def write_many(self, rows: Iterable[PersistRow]) -> None:
+        if self._queue is not None:
+            self._raise_pending_error()
+            for row in rows:
+                self._queue.put(_params(row))
+            return
+        self._pending.extend(_params(r) for r in rows)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._queue is not None:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+            self._raise_pending_error()
+            return
+        rows, self._pending = self._pending, []
+        self._insert(rows)
+
+    def close(self) -> None:
+        try:
+            if self._thread is not None and self._thread.is_alive():
+                assert self._queue is not None
+                self._queue.put(_STOP)
+                self._thread.join()
+            else:
+                self.flush()
+        finally:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+        self._raise_pending_error()
+
+    def __enter__(self) -> SQLiteResultWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # Background path
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError(f"后台写入失败：{err}") from err
 
+    def _run(self) -> None:
+        assert self._queue is not None
+        q = self._queue
+        batch: List[Tuple[object, ...]] = []
+        stop = False
+        while not stop:
+            item = q.get()
+            waiters: List[threading.Event] = []
+            # Drain whatever is already queued, up to one batch
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self._insert(batch)
+            except Exception as e:  # noqa: BLE001
+                self._error = e
+            batch = []
+            for w in waiters:
+                w.set()
@@ -6,7 +6,7 @@ without touching solver or CLI logic.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable, Optional, Dict, Any
+from typing import Protocol, runtime_checkable, Optional, Dict, Any, Iterable
 
 
 @dataclass
@@ -35,6 +35,18 @@ class PersistRow:
     time_ms: Optional[int]
     created_at: str  # ISO-8601
 
+    # Per-phase durations (ns) and traced peak allocation; NULL when not measured
+    parse_ns: Optional[int] = None
+    validate_ns: Optional[int] = None
+    search_ns: Optional[int] = None
+    verify_ns: Optional[int] = None
+    serialize_ns: Optional[int] = None
+    persist_ns: Optional[int] = None
+    peak_alloc_bytes: Optional[int] = None
+
+    # Why a ``timeout`` search stopped (time_limit / max_nodes); NULL otherwise
+    stop_reason: Optional[str] = None
+
 
 @runtime_checkable
 class ResultWriter(Protocol):
@@ -42,7 +54,16 @@ class ResultWriter(Protocol):
         """Create tables if needed (idempotent)."""
 
     def write(self, row: PersistRow) -> None:  # pragma: no cover - thin wrapper
-        """Persist one row."""
+        """Persist one row (may be buffered until `flush`)."""
+
+    def write_many(self, rows: Iterable[PersistRow]) -> None:  # pragma: no cover - thin wrapper
+        """Persist several rows in as few transactions as possible."""
+
+    def flush(self) -> None:  # pragma: no cover - thin wrapper
+        """Commit every row accepted so far."""
+
+    def close(self) -> None:  # pragma: no cover - thin wrapper
+        """Flush and release the underlying storage handle."""
 
 
 def build_row_from_outputs(
@@ -54,7 +75,12 @@ def build_row_from_outputs(
     time_ms: Optional[int],
     created_at: str,
 ) -> PersistRow:
-    """Map solver outputs + metrics to PersistRow with strict fields."""
+    """Map solver outputs + metrics to PersistRow with strict fields.
+
+    Timing columns are read from ``metrics["timing"]`` (see `TimingSink`)
+    when present.
+    """
+    timing = metrics.get("timing") or {}
     return PersistRow(
         test_case_id=test_case_id,
         method=method,
@@ -70,5 +96,24 @@ def build_row_from_outputs(
         guessed_assignments=int(metrics.get("guessed_assignments", 0)),
         time_ms=time_ms if time_ms is not None else None,
         created_at=created_at,
+        parse_ns=timing.get("parse_ns"),
+        validate_ns=timing.get("validate_ns"),
+        search_ns=timing.get("search_ns"),
+        verify_ns=timing.get("verify_ns"),
+        serialize_ns=timing.get("serialize_ns"),
+        persist_ns=timing.get("persist_ns"),
+        peak_alloc_bytes=timing.get("peak_alloc_bytes"),
+        stop_reason=metrics.get("stop_reason"),
     )
 
+
+def should_persist(status: str, has_solution: bool, verify_ok: bool) -> bool:
+    """Whether a solve result gets a results row.
+
+    Verified solutions are persisted; so is a ``timeout`` that stopped before
+    finding any solution, to keep its partial counters and stop reason.
+    """
+    if has_solution:
+        return verify_ok
+    return status == "timeout"
+
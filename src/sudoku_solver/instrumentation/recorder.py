@@ -3,70 +3,127 @@
 Solver/strategies emit normalized events into `Recorder`, which forwards
 to registered sinks (e.g., MetricsCollector, TraceSink). Sinks may
 implement any subset of event handlers via duck-typing.
+
+Dispatch is resolved once, at construction: every facade method
+(``rec.attempt.assign`` ...) is bound to the sink handler itself when one
+sink implements the event, to a small fan-out when several do, and to a
+fixed-arity no-op of the handler's signature when none does (no argument
+packing). A metrics-only recorder therefore calls `MetricsCollector`
+methods directly, and `NullRecorder` costs one empty call per event.
+
+Call sites pass every event argument (positionally or by name) so
+directly bound handlers see the same signature as the facade.
 """
 from __future__ import annotations
 
-from typing import Any, List
+from typing import Any, Callable, Dict, List, Tuple
 
+# group -> (facade method, sink handler name)
+EVENTS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "decision": (("choose_cell", "decision_choose_cell"), ("guess_point", "decision_guess_point")),
+    "attempt": (("assign", "attempt_assign"), ("contradiction", "attempt_contradiction")),
+    "state": (("unassign", "state_unassign"),),
+    "search": (("update_depth", "search_update_depth"),),
+    "result": (("solution_found", "result_solution_found"),),
+    "phase": (("begin", "phase_begin"), ("end", "phase_end")),
+}
 
-class Recorder:
-    def __init__(self, sinks: List[Any] | None = None) -> None:
-        self._sinks = list(sinks or [])
-        # Provide grouped facades for ergonomics
-        self.decision = _Decision(self)
-        self.attempt = _Attempt(self)
-        self.state = _State(self)
-        self.search = _Search(self)
-        self.result = _Result(self)
 
-    def _call(self, name: str, *args: Any, **kwargs: Any) -> None:
-        for s in self._sinks:
-            fn = getattr(s, name, None)
-            if fn:
-                fn(*args, **kwargs)
+def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+# Fixed-arity no-ops with the handler signatures: a varargs no-op would
+# still pack every disabled call's arguments into a tuple and a dict.
+def _noop_choose_cell(r: int, c: int, depth: int) -> None:
+    return None
+
+
+def _noop_depth(depth: int) -> None:
+    return None
+
 
+def _noop_assign(r: int, c: int, v: int, source: str, depth: int) -> None:
+    return None
 
-class _Decision:
-    def __init__(self, rec: Recorder) -> None:
-        self._rec = rec
 
-    def choose_cell(self, r: int, c: int, depth: int) -> None:
-        self._rec._call("decision_choose_cell", r, c, depth)
+def _noop_contradiction(r: int, c: int, v: int | None = None, reason: str = "invalid_candidate", depth: int | None = None) -> None:
+    return None
 
-    def guess_point(self, depth: int) -> None:
-        self._rec._call("decision_guess_point", depth)
 
+def _noop_unassign(r: int, c: int, v: int, reason: str = "backtrack", depth: int | None = None) -> None:
+    return None
 
-class _Attempt:
-    def __init__(self, rec: Recorder) -> None:
-        self._rec = rec
 
-    def assign(self, r: int, c: int, v: int, source: str, depth: int) -> None:
-        self._rec._call("attempt_assign", r, c, v, source, depth)
+def _noop_solution_found() -> None:
+    return None
 
-    def contradiction(self, r: int, c: int, v: int | None = None, reason: str = "invalid_candidate", depth: int | None = None) -> None:
-        self._rec._call("attempt_contradiction", r, c, v, reason, depth)
 
+def _noop_phase(name: str) -> None:
+    return None
 
-class _State:
-    def __init__(self, rec: Recorder) -> None:
-        self._rec = rec
 
-    def unassign(self, r: int, c: int, v: int, reason: str = "backtrack", depth: int | None = None) -> None:
-        self._rec._call("state_unassign", r, c, v, reason, depth)
+# handler name -> no-op bound when no sink implements it
+NOOPS: Dict[str, Callable[..., None]] = {
+    "decision_choose_cell": _noop_choose_cell,
+    "decision_guess_point": _noop_depth,
+    "attempt_assign": _noop_assign,
+    "attempt_contradiction": _noop_contradiction,
+    "state_unassign": _noop_unassign,
+    "search_update_depth": _noop_depth,
+    "result_solution_found": _noop_solution_found,
+    "phase_begin": _noop_phase,
+    "phase_end": _noop_phase,
+}
+_NOOP_SET = frozenset(NOOPS.values())
 
 
-class _Search:
-    def __init__(self, rec: Recorder) -> None:
-        self._rec = rec
+def _bind(sinks: List[Any], name: str) -> Callable[..., None]:
+    handlers = [fn for fn in (getattr(s, name, None) for s in sinks) if fn is not None]
+    if not handlers:
+        return NOOPS.get(name, _noop)
+    if len(handlers) == 1:
+        return handlers[0]
+    handlers_t = tuple(handlers)
 
-    def update_depth(self, depth: int) -> None:
-        self._rec._call("search_update_depth", depth)
+    def fan_out(*args: Any, **kwargs: Any) -> None:
+        for fn in handlers_t:
+            fn(*args, **kwargs)
+
+    return fan_out
+
+
+class _Group:
+    """Facade namespace (e.g. ``rec.attempt``) holding pre-bound event callables."""
+
+    def __init__(self, bound: Dict[str, Callable[..., None]]) -> None:
+        self.__dict__.update(bound)
+
+
+class Recorder:
+    def __init__(self, sinks: List[Any] | None = None) -> None:
+        self._sinks = list(sinks or [])
+        self._dispatch: Dict[str, Callable[..., None]] = {}
+        for group, events in EVENTS.items():
+            bound = {}
+            for method, handler in events:
+                fn = _bind(self._sinks, handler)
+                self._dispatch[handler] = fn
+                bound[method] = fn
+            # Provide grouped facades for ergonomics
+            setattr(self, group, _Group(bound))
+
+    @property
+    def active(self) -> bool:
+        """False when no sink handles any event (every facade call is a no-op)."""
+        return any(fn not in _NOOP_SET and fn is not _noop for fn in self._dispatch.values())
+
+    def _call(self, name: str, *args: Any, **kwargs: Any) -> None:
+        self._dispatch.get(name, _noop)(*args, **kwargs)
 
 
-class _Result:
-    def __init__(self, rec: Recorder) -> None:
-        self._rec = rec
+class NullRecorder(Recorder):
+    """Recorder without sinks: every event is a fixed-arity no-op."""
 
-    def solution_found(self) -> None:
-        self._rec._call("result_solution_found")
+    def __init__(self) -> None:
+        super().__init__([])
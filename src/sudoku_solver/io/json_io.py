@@ -5,8 +5,16 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List
 
+from sudoku_solver.board.geometry import SIZES
 from sudoku_solver.board.grid import Grid
 
+_SIZES_TEXT = "/".join(map(str, SIZES))
+
+
+def _is_square(grid: Any) -> bool:
+    """A list of `n` lists of length `n` with `n` a supported board side."""
+    return isinstance(grid, list) and len(grid) in SIZES and all(isinstance(r, list) and len(r) == len(grid) for r in grid)
+
 
 def load_puzzle(path: str | Path) -> Grid:
     """Load and validate a puzzle JSON into a Grid.
@@ -17,12 +25,19 @@ def load_puzzle(path: str | Path) -> Grid:
         obj = json.loads(Path(path).read_text())
     except Exception as e:  # noqa: BLE001
         raise ValueError(f"无法读取 JSON：{e}") from e
+    return parse_puzzle(obj)
+
 
+def parse_puzzle(obj: Any) -> Grid:
+    """Validate an already-decoded puzzle object (``{"grid": ...}``) into a Grid.
+
+    Raises ValueError with a Chinese message on contract violations.
+    """
     if not isinstance(obj, dict) or "grid" not in obj:
         raise ValueError("输入必须包含 grid 字段")
     grid = obj["grid"]
-    if not (isinstance(grid, list) and len(grid) == 9 and all(isinstance(r, list) and len(r) == 9 for r in grid)):
-        raise ValueError("grid 必须为 9x9 数组")
+    if not _is_square(grid):
+        raise ValueError(f"grid 必须为 NxN 数组（N 为 {_SIZES_TEXT}）")
     try:
         g = Grid([[int(v) for v in row] for row in grid])
     except Exception as e:  # noqa: BLE001
@@ -46,11 +61,12 @@ def load_solution_grid(path: str | Path) -> List[List[int]]:
     if not isinstance(obj, dict) or "grid" not in obj:
         raise ValueError("solution 文件必须包含 grid 字段")
     grid = obj["grid"]
-    if not (isinstance(grid, list) and len(grid) == 9 and all(isinstance(r, list) and len(r) == 9 for r in grid)):
-        raise ValueError("solution.grid 必须为 9x9 数组")
-    for r in range(9):
-        for c in range(9):
+    if not _is_square(grid):
+        raise ValueError(f"solution.grid 必须为 NxN 数组（N 为 {_SIZES_TEXT}）")
+    n = len(grid)
+    for r in range(n):
+        for c in range(n):
             v = grid[r][c]
-            if not isinstance(v, int) or not (1 <= v <= 9):
-                raise ValueError("solution.grid 元素必须为 1..9 的整数")
+            if not isinstance(v, int) or not (1 <= v <= n):
+                raise ValueError(f"solution.grid 元素必须为 1..{n} 的整数")
     return grid
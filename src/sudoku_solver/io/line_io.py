@@ -0,0 +1,133 @@
+"""Streaming I/O for the 81-character-per-line puzzle format.
+
+Each non-empty line holds one puzzle in row-major order, ``1``-``9`` for
+givens and ``0`` or ``.`` for blanks; anything after the first 81
+characters (e.g. a ``,solution`` column) is ignored, and lines starting with
+``#`` are comments. The test case ID of a puzzle is its 1-based line number.
+
+Files are memory-mapped and scanned lazily, so memory use does not depend
+on file size. The packed form yielded by `iter_packed` is 81 bytes with raw
+values ``0..9`` per cell; `Grid.from_digits` turns it into a `Grid`.
+"""
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Sequence, Tuple
+
+from sudoku_solver.board.grid import Grid
+
+LINE_WIDTH = 81
+
+# ASCII '0'..'9' -> 0..9, '.' -> 0, anything else -> 0xFF (invalid marker)
+_DECODE = bytes(
+    (b - 48) if 48 <= b <= 57 else (0 if b == 46 else 0xFF) for b in range(256)
+)
+_ENCODE = bytes(range(48, 58)) + bytes(246)
+
+
+def parse_line(line: bytes | str, line_no: int = 0) -> bytes:
+    """Decode one puzzle line into 81 raw cell values (packed form)."""
+    if isinstance(line, str):
+        line = line.encode("ascii", "replace")
+    body = line.strip()[:LINE_WIDTH]
+    if len(body) != LINE_WIDTH:
+        raise ValueError(f"第 {line_no} 行：谜题必须为 81 个字符")
+    packed = body.translate(_DECODE)
+    if 0xFF in packed:
+        raise ValueError(f"第 {line_no} 行：只允许 0-9 或 '.'")
+    return packed
+
+
+def format_line(cells: Sequence[Sequence[int]] | bytes) -> str:
+    """Encode a 9x9 grid (or 81 raw values) as one 81-character line."""
+    if isinstance(cells, (bytes, bytearray)):
+        flat = bytes(cells)
+    else:
+        flat = bytes(v for row in cells for v in row)
+    return flat.translate(_ENCODE).decode("ascii")
+
+
+def iter_packed(path: str | Path) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(line_no, packed)`` for every puzzle line of `path`, lazily.
+
+    Raises ValueError (with the line number) on malformed lines.
+    """
+    with open(path, "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+        with mm:
+            size = len(mm)
+            pos = 0
+            line_no = 0
+            find = mm.find
+            while pos < size:
+                end = find(b"\n", pos)
+                if end < 0:
+                    end = size
+                line_no += 1
+                line = mm[pos:end]
+                pos = end + 1
+                if len(line) >= LINE_WIDTH and line[0] != 35:  # '#'
+                    packed = line[:LINE_WIDTH].translate(_DECODE)
+                    if 0xFF not in packed:
+                        yield line_no, packed
+                        continue
+                stripped = line.strip()
+                if not stripped or stripped[0] == 35:
+                    continue
+                yield line_no, parse_line(stripped, line_no)
+
+
+def iter_grids(path: str | Path) -> Iterator[Tuple[int, Grid]]:
+    """Yield ``(line_no, Grid)`` for every puzzle line of `path`, lazily."""
+    for line_no, packed in iter_packed(path):
+        yield line_no, Grid.from_digits(packed)
+
+
+class LineWriter:
+    """Buffered streaming writer of 81-character lines.
+
+    Usable as a context manager; accepts either a path or an open text file.
+    """
+
+    def __init__(self, target: str | Path | IO[str], buffer_lines: int = 4096) -> None:
+        if isinstance(target, (str, Path)):
+            self._fh: IO[str] = open(target, "w", encoding="ascii")
+            self._owns = True
+        else:
+            self._fh = target
+            self._owns = False
+        self._buf: List[str] = []
+        self._buffer_lines = max(1, buffer_lines)
+        self.count = 0
+
+    def write(self, cells: Sequence[Sequence[int]] | bytes) -> None:
+        self._buf.append(format_line(cells))
+        self.count += 1
+        if len(self._buf) >= self._buffer_lines:
+            self.flush()
+
+    def write_many(self, grids: Iterable[Sequence[Sequence[int]] | bytes]) -> None:
+        for g in grids:
+            self.write(g)
+
+    def flush(self) -> None:
+        if self._buf:
+            self._fh.write("\n".join(self._buf) + "\n")
+            self._buf.clear()
+        self._fh.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns:
+            self._fh.close()
+
+    def __enter__(self) -> LineWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
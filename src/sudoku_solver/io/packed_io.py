@@ -0,0 +1,230 @@
+"""Binary puzzle/solution files with 4 bits per cell.
+
+A grid's cells (raw values ``0..9`` of the packed form, see `io.line_io`)
+are stored two per byte, first cell in the high nibble: 41 bytes for a
+9x9 grid (the last low nibble is 0), 8 for a 4x4 grid. Larger boards have
+digits above 15 and are not supported.
+
+A file is an 8-byte header followed by fixed-size records::
+
+    b"SDKP"  version (1)  board side  flags  reserved (0)
+
+With flag ``WITH_SOLUTION`` a record is the packed puzzle followed by the
+packed solution, otherwise the puzzle alone. Record ``k`` (1-based, the test
+case ID) starts at ``8 + (k - 1) * record_size``, so files can be sliced
+or indexed without scanning. Readers are lazy and validate every record.
+
+Packing works on whole grids as big integers (one ``from_bytes`` /
+``to_bytes`` round trip and two masks), so there is no per-cell Python loop.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sudoku_solver.board.geometry import size_of_cells
+from sudoku_solver.board.grid import Grid
+
+MAGIC = b"SDKP"
+VERSION = 1
+HEADER_SIZE = 8
+WITH_SOLUTION = 1
+
+# Board sides whose digits fit a nibble
+PACKED_SIZES = (4, 9)
+
+_Cells = Grid | bytes | bytearray | Sequence[Sequence[int]]
+
+
+def packed_size(size: int = 9) -> int:
+    """Bytes of one packed grid of side `size` (41 for 9x9)."""
+    if size not in PACKED_SIZES:
+        raise ValueError(f"4 位打包格式仅支持 {'/'.join(f'{n}x{n}' for n in PACKED_SIZES)} 网格，实际为 {size}x{size}")
+    return (size * size + 1) // 2
+
+
+def _masks(cells: int) -> Tuple[int, int]:
+    """(high, low) masks over ``2 * ceil(cells / 2)`` bytes, one pair of bytes per output byte."""
+    pairs = (cells + 1) // 2
+    return int.from_bytes(b"\x0f\x00" * pairs, "big"), int.from_bytes(b"\x00\x0f" * pairs, "big")
+
+
+_MASKS = {n: _masks(n * n) for n in PACKED_SIZES}
+
+
+def _digits(cells: _Cells) -> bytes:
+    if isinstance(cells, Grid):
+        return cells.digits()
+    if isinstance(cells, (bytes, bytearray)):
+        return bytes(cells)
+    return bytes(v for row in cells for v in row)
+
+
+def pack(cells: _Cells) -> bytes:
+    """Pack a grid (Grid, raw values or list of rows) into nibbles."""
+    digits = _digits(cells)
+    size = size_of_cells(len(digits))
+    n = packed_size(size)
+    if max(digits, default=0) > size:
+        raise ValueError(f"格子取值必须为 0..{size}")
+    high, low = _MASKS[size]
+    # Byte pairs (a, b) -> a << 4 | b in the low byte of the pair
+    x = int.from_bytes(digits + b"\x00" * (2 * n - len(digits)), "big")
+    x = (x & low) | (x & high) >> 4
+    return x.to_bytes(2 * n, "big")[1::2]
+
+
+def unpack(data: bytes | bytearray | memoryview, size: int = 9) -> bytes:
+    """Raw cell values of one packed grid of side `size`; ValueError on bad data."""
+    n = packed_size(size)
+    if len(data) != n:
+        raise ValueError(f"打包网格必须为 {n} 字节，实际为 {len(data)}")
+    low = _MASKS[size][1]
+    spread = bytearray(2 * n)
+    spread[1::2] = data
+    x = int.from_bytes(spread, "big")
+    x = (x & low) | (x & (low << 4)) << 4
+    digits = x.to_bytes(2 * n, "big")[: size * size]
+    if max(digits) > size or (size * size) % 2 and data[-1] & 0x0F:
+        raise ValueError(f"格子取值必须为 0..{size}")
+    return digits
+
+
+@dataclass(frozen=True)
+class Header:
+    size: int = 9
+    with_solution: bool = False
+
+    @property
+    def record_size(self) -> int:
+        return packed_size(self.size) * (2 if self.with_solution else 1)
+
+    def encode(self) -> bytes:
+        return MAGIC + bytes((VERSION, self.size, WITH_SOLUTION if self.with_solution else 0, 0))
+
+    @classmethod
+    def decode(cls, raw: bytes) -> Header:
+        if len(raw) < HEADER_SIZE or raw[:4] != MAGIC:
+            raise ValueError("不是打包谜题文件（缺少 SDKP 文件头）")
+        if raw[4] != VERSION:
+            raise ValueError(f"不支持的打包文件版本：{raw[4]}")
+        header = cls(size=raw[5], with_solution=bool(raw[6] & WITH_SOLUTION))
+        packed_size(header.size)
+        return header
+
+
+def is_packed_file(path: str | Path) -> bool:
+    """Whether `path` starts with the packed-file magic."""
+    with open(path, "rb") as fh:
+        return fh.read(4) == MAGIC
+
+
+def read_header(path: str | Path) -> Header:
+    with open(path, "rb") as fh:
+        return Header.decode(fh.read(HEADER_SIZE))
+
+
+def iter_records(path: str | Path, buffer_records: int = 4096) -> Iterator[Tuple[int, bytes, Optional[bytes]]]:
+    """Yield ``(index, puzzle, solution)`` raw values per record of `path`, lazily.
+
+    `solution` is None for files without solutions. Raises ValueError (with
+    the record index) on a bad header, record or truncated file.
+    """
+    with open(path, "rb") as fh:
+        header = Header.decode(fh.read(HEADER_SIZE))
+        size = header.size
+        half = packed_size(size)
+        record = header.record_size
+        index = 0
+        while True:
+            buf = fh.read(record * max(1, buffer_records))
+            for off in range(0, len(buf) - record + 1, record):
+                index += 1
+                try:
+                    puzzle = unpack(buf[off : off + half], size)
+                    solution = unpack(buf[off + half : off + record], size) if header.with_solution else None
+                except ValueError as e:
+                    raise ValueError(f"第 {index} 条记录：{e}") from None
+                yield index, puzzle, solution
+            if len(buf) % record:
+                raise ValueError(f"第 {index + 1} 条记录不完整（文件被截断）")
+            if len(buf) < record * max(1, buffer_records):
+                return
+
+
+def read_record(path: str | Path, index: int) -> Tuple[bytes, Optional[bytes]]:
+    """``(puzzle, solution)`` of record `index` (1-based) without reading the others."""
+    with open(path, "rb") as fh:
+        header = Header.decode(fh.read(HEADER_SIZE))
+        record = header.record_size
+        if index < 1:
+            raise ValueError(f"记录编号必须从 1 开始：{index}")
+        fh.seek(HEADER_SIZE + (index - 1) * record)
+        raw = fh.read(record)
+    if len(raw) != record:
+        raise ValueError(f"第 {index} 条记录不存在")
+    half = packed_size(header.size)
+    solution = unpack(raw[half:], header.size) if header.with_solution else None
+    return unpack(raw[:half], header.size), solution
+
+
+def iter_grids(path: str | Path) -> Iterator[Tuple[int, Grid]]:
+    """Yield ``(index, Grid)`` for every puzzle of `path`, lazily."""
+    for index, puzzle, _ in iter_records(path):
+        yield index, Grid.from_digits(puzzle)
+
+
+class PackedWriter:
+    """Buffered streaming writer of packed records.
+
+    Usable as a context manager; accepts a path or an open binary file. The
+    header is written on open; `write` takes the solution exactly when the
+    writer was opened ``with_solution``.
+    """
+
+    def __init__(self, target: str | Path | IO[bytes], size: int = 9, with_solution: bool = False, buffer_records: int = 4096) -> None:
+        self.header = Header(size=size, with_solution=with_solution)
+        packed_size(size)
+        if isinstance(target, (str, Path)):
+            self._fh: IO[bytes] = open(target, "wb")
+            self._owns = True
+        else:
+            self._fh = target
+            self._owns = False
+        self._fh.write(self.header.encode())
+        self._buf: List[bytes] = []
+        self._buffer_records = max(1, buffer_records)
+        self.count = 0
+
+    def write(self, puzzle: _Cells, solution: Optional[_Cells] = None) -> None:
+        if (solution is not None) != self.header.with_solution:
+            raise ValueError("记录是否带解必须与文件头一致")
+        record = pack(puzzle) + (pack(solution) if solution is not None else b"")
+        if len(record) != self.header.record_size:
+            raise ValueError(f"网格尺寸与文件头不一致（{self.header.size}x{self.header.size}）")
+        self._buf.append(record)
+        self.count += 1
+        if len(self._buf) >= self._buffer_records:
+            self.flush()
+
+    def write_many(self, grids: Iterable[_Cells]) -> None:
+        for g in grids:
+            self.write(g)
+
+    def flush(self) -> None:
+        if self._buf:
+            self._fh.write(b"".join(self._buf))
+            self._buf.clear()
+        self._fh.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns:
+            self._fh.close()
+
+    def __enter__(self) -> PackedWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,233 @@
+"""MetricsAggregate: mergeable run-level distributions of per-solve metrics.
+
+`MetricsCollector.finalize` yields one flat dict per solve; this module
+folds those dicts into online distributions without keeping the rows.
+Groups are keyed by ``(method, status)`` and hold one `Distribution` per
+field of `FIELDS` (``solve_ns`` is the solver's validate + search time).
+
+A `Distribution` only stores integers: count, sum, sum of squares,
+min/max and a log-bucketed histogram (values below 16 exactly, above that
+8 buckets per power of two, i.e. at most 12.5% relative bucket width).
+Merging is therefore exact, associative and order independent: workers
+or shards aggregate separately and `merge` gives the same summary as one
+aggregate over all rows. Quantiles are read from the histogram (the
+bucket midpoint, clamped to the exact min/max).
+
+`to_dict` / `from_dict` round-trip the compact JSON summary, so summaries
+written by separate runs can be merged later (``metrics-merge``).
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+# Aggregated per-solve fields (metrics keys, plus the derived solve_ns)
+FIELDS = ("assignments", "backtracks", "max_depth", "num_guess_points", "solve_ns")
+QUANTILES = (0.5, 0.9, 0.99)
+
+_SUB_BITS = 3  # 2**_SUB_BITS buckets per power of two
+_EXACT = 1 << (_SUB_BITS + 1)  # values below this get their own bucket
+
+
+def _bucket(v: int) -> int:
+    if v < _EXACT:
+        return v
+    e = v.bit_length() - 1
+    return _EXACT + (e - _SUB_BITS - 1) * (1 << _SUB_BITS) + ((v >> (e - _SUB_BITS)) & ((1 << _SUB_BITS) - 1))
+
+
+def _bucket_bounds(key: int) -> Tuple[int, int]:
+    """Inclusive ``(low, high)`` value range of bucket `key`."""
+    if key < _EXACT:
+        return key, key
+    e, m = divmod(key - _EXACT, 1 << _SUB_BITS)
+    shift = e + 1
+    low = ((1 << _SUB_BITS) + m) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Distribution:
+    """Count, moments, extremes and a log-bucketed histogram of non-negative ints."""
+
+    __slots__ = ("count", "total", "total_sq", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, v: int) -> None:
+        v = max(0, int(v))
+        self.count += 1
+        self.total += v
+        self.total_sq += v * v
+        if self.min is None or v < self.min:
+            self.min = v
+        if self.max is None or v > self.max:
+            self.max = v
+        k = _bucket(v)
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def merge(self, other: Distribution) -> None:
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = other.min if self.min is None else min(self.min, other.min)  # type: ignore[type-var]
+        self.max = other.max if self.max is None else max(self.max, other.max)  # type: ignore[type-var]
+        for k, n in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + n
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for fewer than two values)."""
+        if self.count < 2:
+            return 0.0
+        return (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank `q`-quantile from the histogram (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen >= rank:
+                low, high = _bucket_bounds(k)
+                return float(min(max((low + high) / 2, self.min), self.max))  # type: ignore[type-var]
+        return float(self.max)  # type: ignore[arg-type]
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "count": self.count,
+            "sum": self.total,
+            "sum_sq": self.total_sq,
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 3),
+            "stdev": round(math.sqrt(self.variance), 3),
+        }
+        for q in QUANTILES:
+            out[f"p{round(q * 100)}"] = self.quantile(q)
+        # [bucket low bound, count] pairs; the low bound identifies the bucket
+        out["histogram"] = [[_bucket_bounds(k)[0], self.buckets[k]] for k in sorted(self.buckets)]
+        return out
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> Distribution:
+        dist = cls()
+        dist.count = int(d["count"])
+        dist.total = int(d["sum"])
+        dist.total_sq = int(d["sum_sq"])
+        dist.min = d["min"]
+        dist.max = d["max"]
+        for low, n in d["histogram"]:
+            k = _bucket(int(low))
+            dist.buckets[k] = dist.buckets.get(k, 0) + int(n)
+        return dist
+
+
+def solve_ns(metrics: Mapping[str, Any], time_ms: Optional[float] = None) -> Optional[int]:
+    """Solver time of a result: validate + search phases, else `time_ms`."""
+    timing = metrics.get("timing") or {}
+    phases = [timing.get("validate_ns"), timing.get("search_ns")]
+    if any(p is not None for p in phases):
+        return sum(p for p in phases if p is not None)
+    return int(time_ms * 1_000_000) if time_ms is not None else None
+
+
+class MetricsAggregate:
+    """Distributions of `FIELDS` per ``(method, status)``; see the module docstring."""
+
+    def __init__(self) -> None:
+        self.groups: Dict[Tuple[str, str], Dict[str, Distribution]] = {}
+        self.counts: Dict[Tuple[str, str], int] = {}
+
+    def _group(self, key: Tuple[str, str]) -> Dict[str, Distribution]:
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {f: Distribution() for f in FIELDS}
+            self.counts[key] = 0
+        return group
+
+    def add(self, method: str, status: str, metrics: Optional[Mapping[str, Any]] = None, time_ms: Optional[float] = None) -> None:
+        """Fold one solve in; `metrics` as produced by the solvers (None for errors)."""
+        key = (method, status)
+        group = self._group(key)
+        self.counts[key] += 1
+        if metrics is None:
+            return
+        for f in FIELDS[:-1]:
+            v = metrics.get(f)
+            if v is not None:
+                group[f].add(v)
+        t = solve_ns(metrics, time_ms)
+        if t is not None:
+            group["solve_ns"].add(t)
+
+    def add_record(self, rec: Mapping[str, Any], method: str) -> None:
+        """Fold in one ``solve-batch`` result record."""
+        self.add(method, rec["status"], rec.get("metrics"), rec.get("time_ms"))
+
+    def merge(self, other: MetricsAggregate) -> MetricsAggregate:
+        for key, group in other.groups.items():
+            mine = self._group(key)
+            self.counts[key] += other.counts[key]
+            for f, dist in group.items():
+                mine[f].merge(dist)
+        return self
+
+    def rollup(self, by: str) -> MetricsAggregate:
+        """Groups merged over statuses (``by="method"``, status ``*``) or methods (``by="status"``)."""
+        out = MetricsAggregate()
+        for (method, status), group in self.groups.items():
+            key = (method, "*") if by == "method" else ("*", status)
+            target = out._group(key)
+            out.counts[key] += self.counts[(method, status)]
+            for f, dist in group.items():
+                target[f].merge(dist)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact JSON summary: ``{"groups": [{method, status, count, fields}]}``."""
+        return {
+            "fields": list(FIELDS),
+            "groups": [
+                {
+                    "method": method,
+                    "status": status,
+                    "count": self.counts[(method, status)],
+                    "fields": {f: d.to_dict() for f, d in self.groups[(method, status)].items() if d.count},
+                }
+                for method, status in sorted(self.groups)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> MetricsAggregate:
+        agg = cls()
+        for g in d.get("groups", []):
+            key = (str(g["method"]), str(g["status"]))
+            group = agg._group(key)
+            agg.counts[key] += int(g["count"])
+            for f, fd in g.get("fields", {}).items():
+                if f in group:
+                    group[f].merge(Distribution.from_dict(fd))
+        return agg
+
+
+def merge_all(aggregates: Iterable[MetricsAggregate]) -> MetricsAggregate:
+    out = MetricsAggregate()
+    for agg in aggregates:
+        out.merge(agg)
+    return out
+
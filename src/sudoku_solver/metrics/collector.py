@@ -22,9 +22,7 @@ class MetricsCollector:
         if self.first_guess_depth is None:
             self.first_guess_depth = depth
 
-    def decision_choose_cell(self, r: int, c: int, depth: int) -> None:  # noqa: ARG002
-        # choose_cell 本身不计入 metrics；深度通过 search_update_depth 维护
-        pass
+    # choose_cell 本身不计入 metrics（不实现该事件，Recorder 不会派发）；深度通过 search_update_depth 维护
 
     def attempt_assign(self, r: int, c: int, v: int, source: str, depth: int) -> None:  # noqa: ARG002
         self.assignments += 1
@@ -33,10 +31,10 @@ class MetricsCollector:
         else:
             self.guessed_assignments += 1
 
-    def attempt_contradiction(self, r: int, c: int, v: int | None, reason: str, depth: int | None) -> None:  # noqa: ARG002
+    def attempt_contradiction(self, r: int, c: int, v: int | None = None, reason: str = "invalid_candidate", depth: int | None = None) -> None:  # noqa: ARG002
         self.contradictions += 1
 
-    def state_unassign(self, r: int, c: int, v: int, reason: str, depth: int | None) -> None:  # noqa: ARG002
+    def state_unassign(self, r: int, c: int, v: int, reason: str = "backtrack", depth: int | None = None) -> None:  # noqa: ARG002
         if reason == "backtrack":
             self.backtracks += 1
 
@@ -0,0 +1,62 @@
+"""TimingSink: per-phase wall-clock durations (and optional peak allocations).
+
+Phases are delimited by ``phase_begin(name)`` / ``phase_end(name)``, either
+as Recorder events (solvers emit ``validate`` and ``search``) or directly
+through the `phase` context manager for work outside the solver (``parse``,
+``verify``, ``serialize``, ``persist``). Durations come from
+`time.perf_counter_ns` and accumulate when a phase runs several times.
+With ``track_memory=True`` the sink starts `tracemalloc` and reports the
+traced peak; tracing allocations slows Python code noticeably, so it is
+opt-in.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+PHASES = ("parse", "validate", "search", "verify", "serialize", "persist")
+
+
+class TimingSink:
+    def __init__(self, track_memory: bool = False) -> None:
+        self.durations_ns: Dict[str, int] = {}
+        self._started: Dict[str, int] = {}
+        self.track_memory = track_memory
+        self._owns_tracemalloc = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self.peak_alloc_bytes: Optional[int] = None
+
+    # Recorder sink handlers
+    def phase_begin(self, name: str) -> None:
+        self._started[name] = time.perf_counter_ns()
+
+    def phase_end(self, name: str) -> None:
+        start = self._started.pop(name, None)
+        if start is not None:
+            self.durations_ns[name] = self.durations_ns.get(name, 0) + time.perf_counter_ns() - start
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.phase_begin(name)
+        try:
+            yield
+        finally:
+            self.phase_end(name)
+
+    def stop(self) -> None:
+        """Read the tracemalloc peak and stop tracing if this sink started it."""
+        if self.track_memory and tracemalloc.is_tracing():
+            self.peak_alloc_bytes = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """``{"<phase>_ns": int | None, ..., "peak_alloc_bytes": int | None}``."""
+        out: Dict[str, Any] = {f"{p}_ns": self.durations_ns.get(p) for p in PHASES}
+        out["peak_alloc_bytes"] = self.peak_alloc_bytes
+        return out
@@ -0,0 +1 @@
+"""Long-running solver service (asyncio front end + warm process pool)."""
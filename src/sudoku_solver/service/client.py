@@ -0,0 +1,51 @@
+"""Minimal blocking client for the solver service (one request per line)."""
+from __future__ import annotations
+
+import json
+import socket
+from typing import Any, Dict, List, Optional
+
+
+class SolverClient:
+    """Keep one connection open and send requests sequentially.
+
+    Connect with ``socket_path`` (Unix socket) or ``port`` (localhost TCP).
+    """
+
+    def __init__(self, *, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None, timeout_s: Optional[float] = None) -> None:
+        if socket_path is not None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout_s)
+            self._sock.connect(socket_path)
+        elif port is not None:
+            self._sock = socket.create_connection((host, port), timeout=timeout_s)
+        else:
+            raise ValueError("需要指定 socket_path 或 port")
+        self._file = self._sock.makefile("rb")
+
+    def request(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        self._sock.sendall((json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8"))
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("服务端已关闭连接")
+        return json.loads(line)
+
+    def solve(self, grid: List[List[int]], *, method: Optional[str] = None, timeout_ms: Optional[int] = None, req_id: Any = None) -> Dict[str, Any]:
+        obj: Dict[str, Any] = {"grid": grid}
+        if req_id is not None:
+            obj["id"] = req_id
+        if method is not None:
+            obj["method"] = method
+        if timeout_ms is not None:
+            obj["timeout_ms"] = timeout_ms
+        return self.request(obj)
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> SolverClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,241 @@
+"""Asyncio solver service over a Unix socket or a localhost TCP port.
+
+Wire protocol: newline-delimited JSON, one request and one response per
+line, handled in order on each connection (open several connections for
+concurrency). A request is a puzzle object in the docs/design/io.md
+contract plus optional fields::
+
+    {"id": "any", "grid": [[...], ...], "method": "cp", "timeout_ms": 2000}
+
+A response is the result JSON of ``sudoku-solver solve`` (``status``,
+``solution``, ``stats``, ``trace``, ``metrics``) plus ``id``, ``verify_ok``
+and ``time_ms``; failures are ``{"id": ..., "error": <code>, "message": ...}``
+with code ``invalid`` / ``overloaded`` / ``timeout`` / ``internal``.
+
+Solves run in a `ProcessPoolExecutor` that is warmed up at start, so
+workers have already imported the solvers. Admission control bounds the
+requests in the system (running + queued) at ``max_pending``; above that a
+request is rejected with ``overloaded`` immediately instead of queueing
+behind work it cannot overtake. ``timeout_ms`` (a positive integer) is
+passed to the solver as its time limit, so the worker stops searching and
+is free again; a ``TIMEOUT_GRACE_S`` backstop answers ``timeout`` even if
+the result is late. A request keeps its slot until its worker is done, so
+abandoned solves still count against ``max_pending``.
+Verified results, and timeouts with their stop reason, go to one
+persistent background `SQLiteResultWriter`.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sudoku_solver.db.sqlite_writer import SQLiteResultWriter
+from sudoku_solver.db.writer import build_row_from_outputs, should_persist
+from sudoku_solver.io.json_io import parse_puzzle
+from sudoku_solver.metrics.timing import TimingSink
+from sudoku_solver.solver import SOLVERS
+from sudoku_solver.verify.verify import verify
+
+MAX_LINE = 1 << 20
+
+# Slack past timeout_ms before the parent gives up on a worker's answer
+TIMEOUT_GRACE_S = 0.5
+
+
+def solve_request(obj: Dict[str, Any], method: str, time_limit_ms: Optional[float] = None) -> Dict[str, Any]:
+    """Worker-side: validate, solve and verify one request object."""
+    t0 = time.perf_counter()
+    timing = TimingSink()
+    try:
+        with timing.phase("parse"):
+            puzzle = parse_puzzle(obj)
+        sr, metrics = SOLVERS[method](puzzle, timing_sink=timing, time_limit_ms=time_limit_ms)
+    except ValueError as e:
+        return {"error": "invalid", "message": str(e)}
+    verify_ok = False
+    if sr.solution is not None:
+        with timing.phase("verify"):
+            verify_ok = bool(verify(puzzle, sr.solution))
+    metrics["timing"] = timing.to_dict()
+    return {
+        "status": sr.status,
+        "solution": sr.solution,
+        "stats": asdict(sr.stats),
+        "trace": sr.trace if sr.trace is not None else {"enabled": False, "steps": []},
+        "metrics": metrics,
+        "verify_ok": verify_ok,
+        "time_ms": int((time.perf_counter() - t0) * 1000),
+    }
+
+
+def _warm(delay_s: float) -> int:
+    # Holding each worker briefly makes the pool start all of them
+    time.sleep(delay_s)
+    return os.getpid()
+
+
+class SolverService:
+    def __init__(
+        self,
+        *,
+        method: str = "bt",
+        jobs: int = 1,
+        max_pending: Optional[int] = None,
+        timeout_ms: Optional[int] = None,
+        writer: Optional[SQLiteResultWriter] = None,
+    ) -> None:
+        if method not in SOLVERS:
+            raise ValueError(f"未知的求解方法：{method}")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError(f"max_pending 必须 >= 1，实际为 {max_pending}")
+        if timeout_ms is not None and timeout_ms < 1:
+            raise ValueError(f"timeout_ms 必须 >= 1，实际为 {timeout_ms}")
+        self.method = method
+        self.jobs = max(1, jobs)
+        self.max_pending = max_pending if max_pending is not None else self.jobs * 4
+        self.timeout_ms = timeout_ms
+        self.writer = writer
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.counters = {"requests": 0, "ok": 0, "invalid": 0, "overloaded": 0, "timeout": 0, "internal": 0}
+
+    async def start(self) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm, 0.05) for _ in range(self.jobs)))
+        if self.writer is not None:
+            self.writer.ensure_schema()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        if self.writer is not None:
+            self.writer.close()
+
+    async def handle(self, obj: Any) -> Dict[str, Any]:
+        """Answer one decoded request object."""
+        self.counters["requests"] += 1
+        req_id = obj.get("id") if isinstance(obj, dict) else None
+        if not isinstance(obj, dict):
+            return self._error(req_id, "invalid", "请求必须为 JSON 对象")
+        method = obj.get("method") or self.method
+        if not isinstance(method, str) or method not in SOLVERS:
+            return self._error(req_id, "invalid", f"未知的求解方法：{method}")
+        if self.in_flight >= self.max_pending:
+            return self._error(req_id, "overloaded", "服务繁忙，请稍后重试")
+
+        timeout_ms = obj.get("timeout_ms")
+        if timeout_ms is None:
+            timeout_ms = self.timeout_ms
+        elif isinstance(timeout_ms, bool) or not isinstance(timeout_ms, int) or timeout_ms <= 0:
+            return self._error(req_id, "invalid", f"timeout_ms 必须为正整数（毫秒），实际为 {timeout_ms!r}")
+        assert self.pool is not None
+        loop = asyncio.get_running_loop()
+        try:
+            cfut = self.pool.submit(solve_request, obj, method, timeout_ms)
+        except Exception as e:  # noqa: BLE001
+            return self._error(req_id, "internal", str(e))
+        # The slot is held until the worker is done, not until the client stops waiting
+        self.in_flight += 1
+        cfut.add_done_callback(lambda _f: self._release(loop))
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(cfut), timeout_ms / 1000.0 + TIMEOUT_GRACE_S if timeout_ms else None)
+        except asyncio.TimeoutError:
+            return self._error(req_id, "timeout", f"求解超时（{timeout_ms} ms）")
+        except Exception as e:  # noqa: BLE001
+            return self._error(req_id, "internal", str(e))
+
+        if "error" in result:
+            return self._error(req_id, result["error"], result.get("message", ""))
+        if self.writer is not None and should_persist(result["status"], result["solution"] is not None, result["verify_ok"]):
+            self.writer.write(
+                build_row_from_outputs(
+                    test_case_id=str(req_id) if req_id is not None else "serve",
+                    method=method,
+                    status=result["status"],
+                    metrics=result["metrics"],
+                    time_ms=result["time_ms"],
+                    created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                )
+            )
+        if result["status"] == "timeout":
+            return self._error(req_id, "timeout", f"求解超时（{timeout_ms} ms）")
+        self.counters["ok"] += 1
+        result["id"] = req_id
+        return result
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Runs on the pool's result thread (or inline when already done)
+        def release() -> None:
+            self.in_flight -= 1
+
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:  # loop already closed at shutdown
+            pass
+
+    def _error(self, req_id: Any, code: str, message: str) -> Dict[str, Any]:
+        self.counters[code] = self.counters.get(code, 0) + 1
+        return {"id": req_id, "error": code, "message": message}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # line longer than MAX_LINE
+                    writer.write(self._encode(self._error(None, "invalid", "请求过长")))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError as e:
+                    response = self._error(None, "invalid", f"无法解析 JSON：{e}")
+                else:
+                    response = await self.handle(obj)
+                writer.write(self._encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _encode(obj: Dict[str, Any]) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+    async def serve(self, *, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None) -> None:
+        """Run until SIGINT/SIGTERM."""
+        await self.start()
+        if socket_path is not None:
+            Path(socket_path).unlink(missing_ok=True)
+            server = await asyncio.start_unix_server(self._serve_connection, path=socket_path, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self._serve_connection, host=host, port=port or 0, limit=MAX_LINE)
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):  # pragma: no cover - non-Unix
+                pass
+        where = socket_path or "{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(json.dumps({"listening": where, "method": self.method, "jobs": self.jobs}, ensure_ascii=False), flush=True)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self.close()
+            if socket_path is not None:
+                Path(socket_path).unlink(missing_ok=True)
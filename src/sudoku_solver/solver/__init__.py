@@ -1,2 +1,34 @@
-"""Solver package (skeleton)."""
+"""Solver package.
 
+`SOLVERS` maps the method id persisted in `results.method` (and accepted by
+`solve --method`) to its solve function. Every solver takes
+``(grid, trace_enabled=False, trace_summary=False, max_solutions=2,
+trace_sink=None, timing_sink=None)`` and returns ``(SolveResult,
+metrics_dict)``; a `trace_sink` (e.g. `BinaryTraceSink`) replaces the
+in-memory Tracer and a `timing_sink` receives phase events. Every solver
+also accepts ``time_limit_ms`` / ``max_nodes`` (see `solver.limits`);
+``bt`` additionally accepts ``checkpoint`` / ``resume_state`` (see
+`solver.checkpoint`).
+
+``bt``, ``cp`` and ``bits`` solve any board size of `board.geometry`
+(``bits`` is the engine meant for 16x16 and 25x25); ``dlx`` is 9x9 only.
+A solver given a board size it does not support raises ValueError, like
+a malformed puzzle, so callers handle both the same way.
+The NumPy batch engine (`solver.vectorized`, method id ``vec``) solves
+whole chunks rather than one grid, so it is selected by the batch
+commands instead of being listed here.
+"""
+
+from sudoku_solver.solver.backtracking import solve_backtracking
+from sudoku_solver.solver.bitset import solve_bitset
+from sudoku_solver.solver.dlx import solve_dlx
+from sudoku_solver.solver.propagation import solve_propagation
+
+SOLVERS = {
+    "bt": solve_backtracking,
+    "bits": solve_bitset,
+    "cp": solve_propagation,
+    "dlx": solve_dlx,
+}
+
+__all__ = ["SOLVERS", "solve_backtracking", "solve_bitset", "solve_dlx", "solve_propagation"]
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from sudoku_solver.board.grid import Grid
 from sudoku_solver.trace.tracer import Tracer, TraceSink
 from sudoku_solver.types import SolveResult, Stats
 from sudoku_solver.instrumentation.recorder import Recorder
 from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver.checkpoint import snapshot_state
+from sudoku_solver.solver.limits import STATUS as TIMEOUT, SearchLimits, NEVER
 
 
 class _Counter:
@@ -19,60 +21,200 @@ class _Counter:
         self.max_depth = 0
 
 
-def _search(grid: Grid, depth: int, rec: Recorder, ctr: _Counter, solutions: List[List[List[int]]], max_solutions: int) -> None:
-    if len(solutions) >= max_solutions:
-        return
-
-    ctr.calls += 1
-    ctr.max_depth = max(ctr.max_depth, depth)
-    rec.search.update_depth(depth)
-
-    empty = grid.first_empty()
-    if empty is None:
-        # Solution found
-        solutions.append([row[:] for row in grid.cells])
-        rec.result.solution_found()
-        return
-
-    r, c = empty
-    rec.decision.choose_cell(r, c, depth)
-    rec.decision.guess_point(depth)
-    for v in range(1, 10):
-        if grid.is_valid_placement(r, c, v):
-            grid.set_cell(r, c, v)
-            ctr.assignments += 1
-            rec.attempt.assign(r, c, v, source="guess", depth=depth)
-            _search(grid, depth + 1, rec, ctr, solutions, max_solutions)
-            if len(solutions) >= max_solutions:
-                grid.clear_cell(r, c)
-                return
-            # backtrack
-            grid.clear_cell(r, c)
-            ctr.backtracks += 1
-            rec.state.unassign(r, c, v, reason="backtrack", depth=depth)
+def _instrument(metrics: MetricsCollector, trace_enabled: bool, trace_summary: bool, trace_sink: Any = None, timing_sink: Any = None) -> Tuple[Recorder, Callable[[], Dict[str, Any]]]:
+    """Build the Recorder for one solve and a callable producing its trace JSON.
+
+    `trace_sink`, when given, replaces the in-memory Tracer (e.g. a
+    streaming `BinaryTraceSink`); it must provide ``to_json_obj()``.
+    `timing_sink` (a `TimingSink`) receives the ``validate`` / ``search``
+    phase events.
+    """
+    extra = [timing_sink] if timing_sink is not None else []
+    if trace_sink is not None:
+        return Recorder([metrics, trace_sink, *extra]), trace_sink.to_json_obj
+    mode = "summary" if (trace_enabled and trace_summary) else "steps"
+    tracer = Tracer(enabled=trace_enabled, mode=mode)
+    rec = Recorder(([metrics, TraceSink(tracer)] if trace_enabled else [metrics]) + extra)
+    return rec, tracer.to_json_obj
+
+
+# Nodes between two polls of the optional Checkpointer / SearchLimits
+CHECK_EVERY = 1024
+
+# Stop reason of a search stopped by the Checkpointer
+INTERRUPTED = "interrupted"
+
+
+def _search(
+    grid: Grid,
+    rec: Recorder,
+    ctr: _Counter,
+    solutions: List[List[List[int]]],
+    max_solutions: int,
+    stack: List[List[int]],
+    control: Any = None,
+    limits: Optional[SearchLimits] = None,
+) -> Optional[str]:
+    """Iterative DFS over an explicit stack of ``[row, col, candidates, next_value]`` frames.
+
+    Emits the same events in the same order as a recursive first-empty
+    backtracking search. ``stack`` may be pre-filled from a checkpoint (the
+    cells of its frames already assigned); the engine then continues with
+    the node below the top frame. Returns None once the search is finished,
+    or the stop reason when it stopped at a node boundary: ``"interrupted"``
+    (``control.poll()``) or the `SearchLimits` reason.
+    """
+    size = grid.size
+    # One compare per node; the checkpoint and limit polls are due at ckpt_at / lim_at
+    ckpt_at = ctr.calls + CHECK_EVERY if control is not None else NEVER
+    lim_at = limits.poll_at if limits is not None else NEVER
+    poll_at = min(ckpt_at, lim_at)
+    # Bind hot callables once; each node then costs no attribute lookups on rec/grid
+    first_empty, candidates, set_cell, clear_cell = grid.first_empty, grid.candidates, grid.set_cell, grid.clear_cell
+    update_depth, solution_found = rec.search.update_depth, rec.result.solution_found
+    choose_cell, guess_point = rec.decision.choose_cell, rec.decision.guess_point
+    assign, contradiction, unassign = rec.attempt.assign, rec.attempt.contradiction, rec.state.unassign
+    push, pop = stack.append, stack.pop
+    while True:
+        # Enter the node at depth len(stack)
+        if len(solutions) >= max_solutions:
+            return None
+        if ctr.calls >= poll_at:
+            if ctr.calls >= lim_at:
+                assert limits is not None
+                if limits.exceeded(ctr.calls):
+                    return limits.reason
+                lim_at = limits.poll_at
+            if ctr.calls >= ckpt_at:
+                ckpt_at = ctr.calls + CHECK_EVERY
+                if control.poll():
+                    return INTERRUPTED
+            poll_at = min(ckpt_at, lim_at)
+        depth = len(stack)
+        ctr.calls += 1
+        if depth > ctr.max_depth:
+            ctr.max_depth = depth
+        update_depth(depth)
+
+        empty = first_empty()
+        if empty is None:
+            # Solution found
+            solutions.append(grid.to_lists())
+            solution_found()
         else:
-            rec.attempt.contradiction(r, c, v, reason="invalid_candidate", depth=depth)
+            r, c = empty
+            choose_cell(r, c, depth)
+            guess_point(depth)
+            push([r, c, candidates(r, c), 1])
 
+        # Advance the deepest frame that still has values to try
+        while stack:
+            frame = stack[-1]
+            r, c, cand, v = frame
+            depth = len(stack) - 1
+            if v > 1:
+                # Back from the child of value v - 1 (the cell holds it)
+                clear_cell(r, c)
+                if len(solutions) >= max_solutions:
+                    pop()
+                    continue
+                ctr.backtracks += 1
+                unassign(r, c, v - 1, "backtrack", depth)
+            while v <= size:
+                if cand >> v & 1:
+                    break
+                contradiction(r, c, v, "invalid_candidate", depth)
+                v += 1
+            if v <= size:
+                set_cell(r, c, v)
+                ctr.assignments += 1
+                assign(r, c, v, "guess", depth)
+                frame[3] = v + 1
+                break
+            pop()
+        else:
+            return None
 
-def solve_backtracking(grid: Grid, trace_enabled: bool = False, trace_summary: bool = False, max_solutions: int = 2):
-    """Solve a Sudoku using DFS backtracking and detect up to 2 solutions."""
-    mode = "summary" if (trace_enabled and trace_summary) else "steps"
-    if grid.givens_conflict():
+
+def solve_backtracking(
+    grid: Grid,
+    trace_enabled: bool = False,
+    trace_summary: bool = False,
+    max_solutions: int = 2,
+    trace_sink: Any = None,
+    timing_sink: Any = None,
+    checkpoint: Any = None,
+    resume_state: Optional[Dict[str, Any]] = None,
+    time_limit_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    test_case_id: Optional[str] = None,
+):
+    """Solve a Sudoku using DFS backtracking and detect up to 2 solutions.
+
+    `checkpoint` (a `Checkpointer`) lets the search be saved periodically and
+    stopped on request; the result then has ``status="interrupted"``.
+    `resume_state` (from `load_checkpoint`) continues such a search; ``grid``
+    must then hold the checkpoint's puzzle givens.
+    `test_case_id` is stored in saved checkpoints (a resumed search keeps
+    the checkpoint's own when not given), so a resumed run reports under
+    the puzzle's ID.
+    `time_limit_ms` / `max_nodes` stop the search with ``status="timeout"``
+    (see `solver.limits`); ``max_nodes`` counts the resumed nodes too, and a
+    checkpoint, when given, is saved before returning.
+    """
+    limits = SearchLimits(time_limit_ms, max_nodes, CHECK_EVERY)
+    limits.start()
+    metrics = MetricsCollector()
+    rec, trace_json = _instrument(metrics, trace_enabled, trace_summary, trace_sink, timing_sink)
+    rec.phase.begin("validate")
+    conflict = grid.givens_conflict()
+    rec.phase.end("validate")
+    if conflict:
         # No solutions if givens already conflict
         stats = Stats(calls=0, assignments=0, backtracks=0, max_depth=0)
-        tracer = Tracer(enabled=trace_enabled, mode=mode)
-        metrics = MetricsCollector()
-        return SolveResult(status="unsat", solution=None, stats=stats, trace=tracer.to_json_obj()), metrics.finalize("unsat")
+        return SolveResult(status="unsat", solution=None, stats=stats, trace=trace_json()), metrics.finalize("unsat")
 
-    tracer = Tracer(enabled=trace_enabled, mode=mode)
-    trace_sink = TraceSink(tracer)
-    metrics = MetricsCollector()
-    rec = Recorder([metrics, trace_sink])
     ctr = _Counter()
     solutions: List[List[List[int]]] = []
-    _search(grid, 0, rec, ctr, solutions, max_solutions)
+    stack: List[List[int]] = []
+    givens = grid.to_lists()
+    if resume_state is not None:
+        max_solutions = int(resume_state["max_solutions"])
+        for name, value in resume_state["counters"].items():
+            setattr(ctr, name, value)
+        for name, value in resume_state["metrics"].items():
+            setattr(metrics, name, value)
+        solutions = [[row[:] for row in sol] for sol in resume_state["solutions"]]
+        test_case_id = test_case_id or resume_state.get("test_case_id")
+        for r, c, cand, v in resume_state["stack"]:
+            grid.set_cell(r, c, v - 1)
+            stack.append([r, c, cand, v])
+    if checkpoint is not None:
+        checkpoint.bind(
+            lambda: snapshot_state(
+                givens=givens,
+                stack=stack,
+                counters=vars(ctr),
+                metrics=vars(metrics),
+                solutions=solutions,
+                max_solutions=max_solutions,
+                method="bt",
+                test_case_id=test_case_id,
+            )
+        )
+    rec.phase.begin("search")
+    stop_reason = _search(grid, rec, ctr, solutions, max_solutions, stack, checkpoint, limits if limits.active else None)
+    rec.phase.end("search")
 
-    if len(solutions) == 0:
+    if stop_reason is not None:
+        # Stopped at a node boundary; keep the progress resumable, then restore the givens
+        if stop_reason != INTERRUPTED and checkpoint is not None:
+            checkpoint.save()
+        for r, c, _cand, _v in stack:
+            grid.clear_cell(r, c)
+        status = INTERRUPTED if stop_reason == INTERRUPTED else TIMEOUT
+        solution = solutions[0] if solutions else None
+    elif len(solutions) == 0:
         status = "unsat"
         solution = None
     elif len(solutions) == 1:
@@ -84,5 +226,7 @@ def solve_backtracking(grid: Grid, trace_enabled: bool = False, trace_summary: b
 
     stats = Stats(calls=ctr.calls, assignments=ctr.assignments, backtracks=ctr.backtracks, max_depth=ctr.max_depth)
     metrics_dict = metrics.finalize(status)
+    if status == TIMEOUT:
+        metrics_dict["stop_reason"] = stop_reason
     # Attach metrics in CLI layer; return alongside result
-    return SolveResult(status=status, solution=solution, stats=stats, trace=tracer.to_json_obj()), metrics_dict
+    return SolveResult(status=status, solution=solution, stats=stats, trace=trace_json()), metrics_dict
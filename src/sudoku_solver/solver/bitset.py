@@ -0,0 +1,406 @@
+"""Bitset propagation solver for n²×n² boards (``bits``).
+
+The state is kept in two word-sized bitset views, both built from the
+precomputed tables of `board.geometry`, so no box arithmetic or board scan
+happens while propagating:
+
+- ``cand[cell]``: the digits still possible in a cell (bits ``1..size``;
+  ``0`` once the cell is placed);
+- ``pos[unit * stride + digit]``: the cells of a unit (bit ``k`` for its
+  ``k``-th cell) where the digit can still go; ``0`` once the digit is
+  placed in the unit.
+
+Both views are updated together on every elimination, so a cell whose
+candidates drop to one is a naked single and a digit whose positions in a
+unit drop to one is a hidden single, detected in O(1) at the moment it
+appears; an empty mask in either view is a contradiction. After the
+singles, one pass of locked candidates (pointing: a digit confined to one
+row or column of a box leaves the rest of that line) runs per node; the
+positions of a box digit are tested against the line with two bit scans.
+It cuts the nodes of hard 16x16 puzzles several times over, while the
+line-to-box direction and repeating the pass to a fixpoint cost more than
+they save. Branching picks the cell with the fewest candidates (MRV), or,
+when no cell has two, a digit with two positions left in a unit; each
+branch copies the state, so backtracking needs no undo log.
+
+Deductions are reported with ``source="deduced"``, branch values with
+``source="guess"``; deduced cells vanish with the copied state of a
+branch, so no ``undo_deduction`` events are emitted. Multi-solution
+detection and `SearchLimits` follow the other engines.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from sudoku_solver.board.geometry import geometry
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.instrumentation.recorder import Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver.backtracking import _Counter, _instrument
+from sudoku_solver.solver.limits import STATUS as TIMEOUT, SearchLimits
+from sudoku_solver.types import SolveResult, Stats
+
+# Nodes between two SearchLimits polls (a node is one propagation)
+CHECK_EVERY = 64
+
+# (pos index base of the unit, bit of the cell in the unit, cells of the unit)
+_Slot = Tuple[int, int, Tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class _Tables:
+    size: int
+    stride: int  # pos entries per unit (digits 1..size; slot 0 unused)
+    all_digits: int
+    all_positions: int
+    peers: Tuple[Tuple[int, ...], ...]
+    slots: Tuple[Tuple[_Slot, _Slot, _Slot], ...]  # flat cell -> its row, column and box slot
+    units: Tuple[Tuple[int, ...], ...]
+    box: int
+    col_mask: int  # positions of the first column of a box (bits 0, box, 2*box, ...)
+    # box -> row / column within the box -> the cells of that line outside the box
+    row_rest: Tuple[Tuple[Tuple[int, ...], ...], ...]
+    col_rest: Tuple[Tuple[Tuple[int, ...], ...], ...]
+
+
+@lru_cache(maxsize=None)
+def _tables(size: int) -> _Tables:
+    geo = geometry(size)
+    stride = size + 1
+    slots = tuple(
+        tuple((u * stride, 1 << geo.units[u].index(i), geo.units[u]) for u in geo.units_of[i])
+        for i in range(geo.cells)
+    )
+    box = geo.box
+
+    def rest(line: Tuple[int, ...], b: int) -> Tuple[int, ...]:
+        return tuple(i for i in line if geo.cell_box[i] != b)
+
+    boxes = geo.units[2 * size :]
+    row_rest = tuple(tuple(rest(geo.units[cells[k * box] // size], b) for k in range(box)) for b, cells in enumerate(boxes))
+    col_rest = tuple(tuple(rest(geo.units[size + cells[k] % size], b) for k in range(box)) for b, cells in enumerate(boxes))
+    return _Tables(
+        size=size,
+        stride=stride,
+        all_digits=geo.all_digits,
+        all_positions=(1 << size) - 1,
+        peers=geo.peers,
+        slots=slots,  # type: ignore[arg-type]
+        units=geo.units,
+        box=box,
+        col_mask=sum(1 << (k * box) for k in range(box)),
+        row_rest=row_rest,
+        col_rest=col_rest,
+    )
+
+
+def _singles(t: _Tables, cand: List[int], pos: List[int], queue: List[Tuple[int, int]], log: List[Tuple[int, int]]) -> bool:
+    """Place the queued ``(cell, digit_bit)`` singles and everything they imply; False on contradiction.
+
+    Placements are appended to `log` as ``(cell, digit_bit)``.
+    """
+    peers, slots = t.peers, t.slots
+    while queue:
+        i, bit = queue.pop()
+        m = cand[i]
+        if not m:
+            continue  # already placed
+        if not m & bit:
+            return False
+        cand[i] = 0
+        log.append((i, bit))
+        d = bit.bit_length() - 1
+        slots_i = slots[i]
+        for base, _, _ in slots_i:
+            pos[base + d] = 0
+        # The cell's other digits lose this position
+        other = m ^ bit
+        while other:
+            b = other & -other
+            other ^= b
+            e = b.bit_length() - 1
+            for base, ib, cells in slots_i:
+                k = base + e
+                p = pos[k]
+                if p:
+                    p ^= ib
+                    if not p:
+                        return False
+                    pos[k] = p
+                    if not p & (p - 1):
+                        queue.append((cells[p.bit_length() - 1], b))
+        # The peers lose the digit
+        for j in peers[i]:
+            mj = cand[j]
+            if mj & bit:
+                mj ^= bit
+                if not mj:
+                    return False
+                cand[j] = mj
+                if not mj & (mj - 1):
+                    queue.append((j, mj))
+                for base, jb, cells in slots[j]:
+                    k = base + d
+                    p = pos[k]
+                    if p:
+                        p ^= jb
+                        if not p:
+                            return False
+                        pos[k] = p
+                        if not p & (p - 1):
+                            queue.append((cells[p.bit_length() - 1], bit))
+    return True
+
+
+def _eliminate(t: _Tables, cand: List[int], pos: List[int], j: int, bit: int, queue: List[Tuple[int, int]]) -> bool:
+    """Remove digit `bit` from cell `j` (which has it); False on contradiction."""
+    mj = cand[j] ^ bit
+    if not mj:
+        return False
+    cand[j] = mj
+    if not mj & (mj - 1):
+        queue.append((j, mj))
+    d = bit.bit_length() - 1
+    for base, jb, cells in t.slots[j]:
+        k = base + d
+        p = pos[k]
+        if p:
+            p ^= jb
+            if not p:
+                return False
+            pos[k] = p
+            if not p & (p - 1):
+                queue.append((cells[p.bit_length() - 1], bit))
+    return True
+
+
+def _pointing(t: _Tables, cand: List[int], pos: List[int], queue: List[Tuple[int, int]]) -> int:
+    """Locked candidates (pointing): a digit whose positions in a box lie on one row or
+    column is removed from the rest of that line.
+
+    Returns the number of eliminations, -1 on contradiction; new singles go to `queue`.
+    """
+    stride, box, col_mask = t.stride, t.box, t.col_mask
+    removed = 0
+    for b in range(t.size):
+        base = (2 * t.size + b) * stride
+        for d in range(1, stride):
+            p = pos[base + d]
+            if not p & (p - 1):
+                continue  # placed or a pending hidden single
+            low = (p & -p).bit_length() - 1
+            if low // box == (p.bit_length() - 1) // box:
+                line = t.row_rest[b][low // box]
+            elif not p & ~(col_mask << (low % box)):
+                line = t.col_rest[b][low % box]
+            else:
+                continue
+            bit = 1 << d
+            for j in line:
+                if cand[j] & bit:
+                    if not _eliminate(t, cand, pos, j, bit, queue):
+                        return -1
+                    removed += 1
+    return removed
+
+
+def _propagate(t: _Tables, cand: List[int], pos: List[int], queue: List[Tuple[int, int]], log: List[Tuple[int, int]]) -> bool:
+    """`_singles`, one pointing pass and `_singles` again if it removed anything; False on contradiction.
+
+    A single pass per node: repeating pointing to a fixpoint saves few
+    nodes and costs more than it saves.
+    """
+    if not _singles(t, cand, pos, queue, log):
+        return False
+    removed = _pointing(t, cand, pos, queue)
+    if removed < 0:
+        return False
+    return _singles(t, cand, pos, queue, log) if removed else True
+
+
+def _emit_deductions(rec: Recorder, ctr: _Counter, size: int, log: List[Tuple[int, int]], values: List[int], depth: int, skip: int = -1) -> None:
+    assign = rec.attempt.assign
+    for i, bit in log:
+        v = bit.bit_length() - 1
+        values[i] = v
+        if i == skip:
+            continue
+        ctr.assignments += 1
+        r, c = divmod(i, size)
+        assign(r, c, v, source="deduced", depth=depth)
+
+
+def _digit_pair(t: _Tables, pos: List[int]) -> Optional[List[Tuple[int, int]]]:
+    """The two placements of a digit with exactly two positions left in some unit, if any."""
+    stride = t.stride
+    for k, p in enumerate(pos):
+        if p and not p & (p - 1) & ((p & (p - 1)) - 1):
+            cells = t.units[k // stride]
+            bit = 1 << k % stride
+            a = p & -p
+            return [(cells[a.bit_length() - 1], bit), (cells[(p ^ a).bit_length() - 1], bit)]
+    return None
+
+
+def _search(
+    t: _Tables,
+    cand: List[int],
+    pos: List[int],
+    values: List[int],
+    depth: int,
+    rec: Recorder,
+    ctr: _Counter,
+    solutions: List[List[List[int]]],
+    max_solutions: int,
+    limits: SearchLimits,
+) -> bool:
+    """Search below a propagated state; False when `limits` stopped the search."""
+    if len(solutions) >= max_solutions:
+        return True
+    if ctr.calls >= limits.poll_at and limits.exceeded(ctr.calls):
+        return False
+    ctr.calls += 1
+    if depth > ctr.max_depth:
+        ctr.max_depth = depth
+    rec.search.update_depth(depth)
+
+    size = t.size
+    best = -1
+    best_n = size + 1
+    for i, m in enumerate(cand):
+        if m:
+            n = m.bit_count()
+            if n < best_n:
+                best, best_n = i, n
+                if n == 2:
+                    break
+    if best < 0:
+        solutions.append([values[r * size : r * size + size] for r in range(size)])
+        rec.result.solution_found()
+        return True
+
+    branches = _digit_pair(t, pos) if best_n > 2 else None
+    if branches is None:
+        mask = cand[best]
+        branches = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            branches.append((best, bit))
+    r, c = divmod(branches[0][0], size)
+    rec.decision.choose_cell(r, c, depth)
+    rec.decision.guess_point(depth)
+    ok = True
+    for cell, bit in branches:
+        r, c = divmod(cell, size)
+        v = bit.bit_length() - 1
+        ctr.assignments += 1
+        rec.attempt.assign(r, c, v, source="guess", depth=depth)
+        child, child_pos = cand[:], pos[:]
+        log: List[Tuple[int, int]] = []
+        if _propagate(t, child, child_pos, [(cell, bit)], log):
+            child_values = values[:]
+            _emit_deductions(rec, ctr, size, log, child_values, depth + 1, skip=cell)
+            ok = _search(t, child, child_pos, child_values, depth + 1, rec, ctr, solutions, max_solutions, limits)
+        else:
+            rec.attempt.contradiction(r, c, v, reason="propagation", depth=depth)
+        if not ok or len(solutions) >= max_solutions:
+            break
+        ctr.backtracks += 1
+        rec.state.unassign(r, c, v, reason="backtrack", depth=depth)
+    return ok
+
+
+def _root(t: _Tables, values: List[int]) -> Optional[Tuple[List[int], List[int], List[Tuple[int, int]]]]:
+    """``(cand, pos, log)`` after placing the givens `values` and propagating; None on contradiction.
+
+    Deductions pushed while the givens are still queued can fill a given's
+    cell first (the given is then skipped as placed), so every given is
+    checked against what its cell received.
+    """
+    cand = [t.all_digits] * (t.size * t.size)
+    pos = [0 if k % t.stride == 0 else t.all_positions for k in range(3 * t.size * t.stride)]
+    queue = [(i, 1 << v) for i, v in enumerate(values) if v]
+    queue.reverse()  # placed in row-major order
+    log: List[Tuple[int, int]] = []
+    if not _propagate(t, cand, pos, queue, log):
+        return None
+    if any(values[i] and bit != 1 << values[i] for i, bit in log):
+        return None
+    return cand, pos, log
+
+
+def probe_candidates(grid: Grid) -> Optional[List[int]]:
+    """Candidate masks after propagating the givens once (no search); None on contradiction.
+
+    Placed cells (givens and the cells they imply) have mask 0. Cheap
+    enough to run over a whole corpus (`batch.scheduling` uses it to rank
+    puzzles by expected cost).
+    """
+    root = _root(_tables(grid.size), list(grid.data))
+    return root[0] if root is not None else None
+
+
+def solve_bitset(
+    grid: Grid,
+    trace_enabled: bool = False,
+    trace_summary: bool = False,
+    max_solutions: int = 2,
+    trace_sink: Any = None,
+    timing_sink: Any = None,
+    time_limit_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+):
+    """Solve a board of any supported size with bitset propagation + MRV; detect up to 2 solutions.
+
+    `time_limit_ms` / `max_nodes` stop the search with ``status="timeout"``
+    (see `solver.limits`).
+    """
+    limits = SearchLimits(time_limit_ms, max_nodes, CHECK_EVERY)
+    limits.start()
+    metrics = MetricsCollector()
+    rec, trace_json = _instrument(metrics, trace_enabled, trace_summary, trace_sink, timing_sink)
+    rec.phase.begin("validate")
+    conflict = grid.givens_conflict()
+    rec.phase.end("validate")
+    if conflict:
+        stats = Stats(calls=0, assignments=0, backtracks=0, max_depth=0)
+        return SolveResult(status="unsat", solution=None, stats=stats, trace=trace_json()), metrics.finalize("unsat")
+
+    t = _tables(grid.size)
+    size = t.size
+    ctr = _Counter()
+    solutions: List[List[List[int]]] = []
+    rec.phase.begin("search")
+    values = list(grid.data)
+    root = _root(t, values)
+    finished = True
+    if root is not None:
+        cand, pos, log = root
+        # Givens go through the queue too; only the cells they imply are deductions
+        _emit_deductions(rec, ctr, size, [(i, b) for i, b in log if not values[i]], values, 0)
+        finished = _search(t, cand, pos, values, 0, rec, ctr, solutions, max_solutions, limits)
+    else:
+        rec.attempt.contradiction(0, 0, None, reason="propagation", depth=0)
+    rec.phase.end("search")
+
+    if not finished:
+        status = TIMEOUT
+        solution = solutions[0] if solutions else None
+    elif len(solutions) == 0:
+        status = "unsat"
+        solution = None
+    elif len(solutions) == 1:
+        status = "unique"
+        solution = solutions[0]
+    else:
+        status = "multiple"
+        solution = solutions[0]
+
+    stats = Stats(calls=ctr.calls, assignments=ctr.assignments, backtracks=ctr.backtracks, max_depth=ctr.max_depth)
+    metrics_dict = metrics.finalize(status)
+    if not finished:
+        metrics_dict["stop_reason"] = limits.reason
+    return SolveResult(status=status, solution=solution, stats=stats, trace=trace_json()), metrics_dict
@@ -0,0 +1,113 @@
+"""Checkpoint/resume for the explicit-stack backtracking engine.
+
+A checkpoint is a JSON document holding the puzzle givens, the search
+stack (one ``[row, col, candidates, next_value]`` frame per depth; the cell
+of every frame currently holds ``next_value - 1``), the `_Counter` and
+`MetricsCollector` totals and the solutions found so far. It is taken at a
+node boundary, so resuming replays nothing: the engine re-enters the node
+below the top frame and produces the same solution order and metric totals
+as an uninterrupted run. Trace events are not checkpointed.
+
+`Checkpointer` is polled by the engine every ``CHECK_EVERY`` nodes; it
+writes a checkpoint when ``interval_s`` has elapsed, and writes one and
+stops the search once a stop was requested (SIGTERM when
+`install_sigterm` is used). Files are replaced atomically.
+"""
+from __future__ import annotations
+
+import json
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+FORMAT = "sudoku-checkpoint"
+VERSION = 1
+
+
+class Checkpointer:
+    def __init__(self, path: str | Path, interval_s: Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.interval_s = interval_s
+        self.stop_requested = False
+        self.saves = 0
+        self._snapshot: Optional[Callable[[], Dict[str, Any]]] = None
+        self._next_save = time.monotonic() + interval_s if interval_s else None
+        self._prev_handler: Any = None
+
+    def bind(self, snapshot: Callable[[], Dict[str, Any]]) -> None:
+        """Set the callable that captures the current search state."""
+        self._snapshot = snapshot
+
+    def request_stop(self, *_: Any) -> None:
+        self.stop_requested = True
+
+    def install_sigterm(self) -> None:
+        self._prev_handler = signal.signal(signal.SIGTERM, self.request_stop)
+
+    def uninstall_sigterm(self) -> None:
+        if self._prev_handler is not None:
+            signal.signal(signal.SIGTERM, self._prev_handler)
+            self._prev_handler = None
+
+    def poll(self) -> bool:
+        """Called by the engine at a node boundary; True means stop now."""
+        if self.stop_requested:
+            self.save()
+            return True
+        if self._next_save is not None and time.monotonic() >= self._next_save:
+            self.save()
+            self._next_save = time.monotonic() + (self.interval_s or 0)
+        return False
+
+    def save(self) -> None:
+        if self._snapshot is None:
+            return
+        state = self._snapshot()
+        state["created_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.saves += 1
+
+
+def load_checkpoint(path: str | Path) -> Dict[str, Any]:
+    """Read and sanity-check a checkpoint file; raises ValueError with a Chinese message."""
+    try:
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"无法读取 checkpoint：{e}") from e
+    if not isinstance(state, dict) or state.get("format") != FORMAT:
+        raise ValueError("不是 checkpoint 文件")
+    if state.get("version") != VERSION:
+        raise ValueError(f"不支持的 checkpoint 版本：{state.get('version')}")
+    for key in ("puzzle", "stack", "counters", "metrics", "solutions", "max_solutions"):
+        if key not in state:
+            raise ValueError(f"checkpoint 缺少字段：{key}")
+    return state
+
+
+def snapshot_state(
+    *,
+    givens: List[List[int]],
+    stack: List[List[int]],
+    counters: Dict[str, int],
+    metrics: Dict[str, Any],
+    solutions: List[List[List[int]]],
+    max_solutions: int,
+    method: str = "bt",
+    test_case_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "method": method,
+        "test_case_id": test_case_id,
+        "max_solutions": max_solutions,
+        "puzzle": givens,
+        "stack": [list(f) for f in stack],
+        "counters": dict(counters),
+        "metrics": dict(metrics),
+        "solutions": solutions,
+    }
@@ -0,0 +1,243 @@
+"""Exact solution counting without materializing solutions.
+
+The state is one candidate bitmask per cell (bits 1..9, as in `Grid`), with
+``0`` for a filled cell. The completions of a partial grid depend only on the
+candidate masks of its empty cells: empty cells of a unit must take
+distinct digits from their masks, which then cover exactly the digits the
+unit is missing. Counting therefore works on masks alone:
+
+- propagation applies naked singles, hidden singles and a pigeonhole check
+  (a unit whose empty cells offer fewer digits than there are cells is
+  dead) until a fixpoint;
+- the empty cells are split into *components* that share no unit; the
+  count is the product of the components' counts, so independent regions
+  (typically separate bands / stacks late in the search) are counted once
+  each instead of once per combination;
+- each component is counted by MRV branching and memoized on its
+  ``(cell, mask)`` configuration in a bounded LRU, so a sub-configuration
+  reached through different assignment orders is counted once.
+
+``limit`` caps the count: subtrees stop as soon as their share of the cap is
+reached and truncated counts are never cached.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from sudoku_solver.board.geometry import geometry
+from sudoku_solver.board.grid import Grid
+
+# Bounded memo: number of component configurations kept
+CACHE_SIZE = 200_000
+
+# 9x9 tables shared with the other engines (`propagate` is also used by the generator)
+_G = geometry(9)
+_UNITS = _G.units
+_UNIT_BITS = _G.unit_bits
+_PEERS = _G.peers
+
+
+@dataclass
+class CountResult:
+    count: int
+    exact: bool  # False when the count stopped at `limit`
+    nodes: int
+    cache_hits: int
+    cache_misses: int
+    cache_evictions: int
+    cache_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+
+def propagate(state: List[int], queue: List[Tuple[int, int]], dirty: int = 0, placed: Optional[List[int]] = None) -> bool:
+    """Place queued singles and apply hidden singles to a fixpoint; False on contradiction.
+
+    Only units in the 27-bit `dirty` mask, the units of queued cells and
+    units touched since are rescanned for hidden singles. When `placed` is
+    given, the digit bit of every placed cell is recorded in it (counting
+    needs only the masks; the generator needs the solutions).
+    """
+    for i, _ in queue:
+        dirty |= _UNIT_BITS[i]
+    while True:
+        while queue:
+            i, bit = queue.pop()
+            if state[i] != bit:
+                continue  # already placed
+            state[i] = 0
+            if placed is not None:
+                placed[i] = bit
+            for j in _PEERS[i]:
+                m = state[j]
+                if m & bit:
+                    m ^= bit
+                    if not m:
+                        return False
+                    state[j] = m
+                    dirty |= _UNIT_BITS[j]
+                    if not m & (m - 1):
+                        queue.append((j, m))
+        while dirty and not queue:
+            low = dirty & -dirty
+            dirty ^= low
+            unit = _UNITS[low.bit_length() - 1]
+            once = twice = 0
+            n = 0
+            for j in unit:
+                m = state[j]
+                if m:
+                    n += 1
+                    twice |= once & m
+                    once |= m
+            if not n:
+                continue
+            if once.bit_count() < n:
+                return False
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for j in unit:
+                    if state[j] & bit:
+                        if state[j] != bit:
+                            state[j] = bit
+                            queue.append((j, bit))
+                        break
+        if not queue:
+            return True
+
+
+def _components(cells: List[int]) -> List[List[int]]:
+    """Group empty cells into sets sharing no unit, via 27-bit unit masks."""
+    masks: List[int] = []
+    for i in cells:
+        m = _UNIT_BITS[i]
+        if len(masks) == 1 and masks[0] & m:
+            masks[0] |= m
+            continue
+        rest = []
+        for x in masks:
+            if x & m:
+                m |= x
+            else:
+                rest.append(x)
+        rest.append(m)
+        masks = rest
+    if len(masks) == 1:
+        return [cells]
+    return [[i for i in cells if _UNIT_BITS[i] & x] for x in masks]
+
+
+class SolutionCounter:
+    """Counts solutions; the memo persists across `count` calls on one instance."""
+
+    def __init__(self, cache_size: int = CACHE_SIZE) -> None:
+        self.cache_size = max(0, cache_size)
+        self._memo: OrderedDict[Tuple[int, ...], int] = OrderedDict()
+        self.nodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def count(self, grid: Grid, limit: Optional[int] = None) -> CountResult:
+        """Count the solutions of `grid`, stopping once more than `limit` exist; 9x9 only."""
+        if grid.size != 9:
+            raise ValueError(f"解计数仅支持 9x9 网格（当前为 {grid.size}x{grid.size}）")
+        nodes, hits, misses, evictions = self.nodes, self.hits, self.misses, self.evictions
+        cap = None if limit is None else limit + 1
+        n = 0
+        if not grid.givens_conflict():
+            state = [0] * 81
+            queue: List[Tuple[int, int]] = []
+            for r in range(9):
+                for c in range(9):
+                    if grid.data[r * 9 + c] == 0:
+                        m = grid.candidates(r, c)
+                        state[r * 9 + c] = m
+                        if not m & (m - 1):
+                            queue.append((r * 9 + c, m))
+            if all(state[i] for i in range(81) if grid.data[i] == 0) and propagate(state, queue, (1 << 27) - 1):
+                n = self._count_all(state, [i for i in range(81) if state[i]], cap)
+        exact = cap is None or n < cap
+        return CountResult(
+            count=n if exact else limit,  # type: ignore[arg-type]
+            exact=exact,
+            nodes=self.nodes - nodes,
+            cache_hits=self.hits - hits,
+            cache_misses=self.misses - misses,
+            cache_evictions=self.evictions - evictions,
+            cache_size=len(self._memo),
+        )
+
+    def _count_all(self, state: List[int], cells: List[int], cap: Optional[int]) -> int:
+        """Count completions of the empty `cells` of a propagated state; a result >= cap is truncated."""
+        if not cells:
+            return 1
+        comps = _components(cells)
+        if len(comps) == 1:
+            return self._count(state, comps[0], cap)
+        comps.sort(key=len)
+        total = 1
+        for k, comp in enumerate(comps):
+            sub_cap = None if cap is None else -(-cap // total)
+            n = self._count(state, comp, sub_cap)
+            if n == 0:
+                return 0
+            total *= n
+            if cap is not None and total >= cap:
+                # Truncated; the product is still 0 if any remaining component is dead
+                for rest in comps[k + 1 :]:
+                    if self._count(state, rest, 1) == 0:
+                        return 0
+                return total
+        return total
+
+    def _count(self, state: List[int], cells: List[int], cap: Optional[int]) -> int:
+        key = tuple(i << 10 | state[i] for i in cells)
+        memo = self._memo
+        cached = memo.get(key)
+        if cached is not None:
+            self.hits += 1
+            memo.move_to_end(key)
+            return cached
+        self.misses += 1
+        self.nodes += 1
+
+        # MRV within the component
+        best = cells[0]
+        best_n = 10
+        for i in cells:
+            n = state[i].bit_count()
+            if n < best_n:
+                best, best_n = i, n
+                if n == 2:
+                    break
+        total = 0
+        mask = state[best]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            child = state[:]
+            child[best] = bit
+            if not propagate(child, [(best, bit)]):
+                continue
+            total += self._count_all(child, [i for i in cells if child[i]], None if cap is None else cap - total)
+            if cap is not None and total >= cap:
+                return total
+        if self.cache_size:
+            memo[key] = total
+            if len(memo) > self.cache_size:
+                memo.popitem(last=False)
+                self.evictions += 1
+        return total
+
+
+def count_solutions(grid: Grid, limit: Optional[int] = None, cache_size: int = CACHE_SIZE) -> CountResult:
+    """Count the solutions of `grid` (up to `limit`) with a fresh memo."""
+    return SolutionCounter(cache_size).count(grid, limit)
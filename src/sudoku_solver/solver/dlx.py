@@ -0,0 +1,299 @@
+"""Dancing Links (Algorithm X) exact-cover solver.
+
+The 9x9 puzzle is encoded as an exact-cover matrix with 729 rows (one per
+``(row, col, digit)`` placement) and 324 columns:
+
+- ``0..80``    cell ``(r, c)`` is filled
+- ``81..161``  row ``r`` contains digit ``d``
+- ``162..242`` column ``c`` contains digit ``d``
+- ``243..323`` box ``b`` contains digit ``d``
+
+Givens are selected up front by covering their columns; the search then
+always branches on the column with the fewest remaining rows. Events go
+through `Recorder` like the other engines: choosing a column with more than
+one row is a guess point, selecting a row is an assignment (``deduced`` when
+the column had a single row left, ``guess`` otherwise), and deselecting it
+is an unassign. Multi-solution detection stops at ``max_solutions``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+
+from sudoku_solver.board.grid import BOX_OF, Grid
+from sudoku_solver.instrumentation.recorder import Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver.backtracking import _Counter, _instrument
+from sudoku_solver.solver.limits import STATUS as TIMEOUT, SearchLimits
+from sudoku_solver.types import SolveResult, Stats
+
+NUM_COLUMNS = 324
+
+# Nodes between two SearchLimits polls
+CHECK_EVERY = 256
+
+# Node arrays of the empty-puzzle matrix; copied per solve (list copies are cheap).
+# Node 0 is the root, 1..324 are column headers, row nodes follow.
+_Template = Tuple[List[int], List[int], List[int], List[int], List[int], List[int], List[int]]
+_TEMPLATE: Optional[_Template] = None
+
+
+def _row_columns(r: int, c: int, v: int) -> Tuple[int, int, int, int]:
+    d = v - 1
+    return (
+        r * 9 + c,
+        81 + r * 9 + d,
+        162 + c * 9 + d,
+        243 + BOX_OF[r][c] * 9 + d,
+    )
+
+
+def _build_template() -> _Template:
+    n_headers = NUM_COLUMNS + 1
+    left = [i - 1 for i in range(n_headers)]
+    right = [i + 1 for i in range(n_headers)]
+    left[0] = NUM_COLUMNS
+    right[NUM_COLUMNS] = 0
+    up = list(range(n_headers))
+    down = list(range(n_headers))
+    col = list(range(n_headers))
+    size = [0] * n_headers
+    row_of = [-1] * n_headers
+
+    for r in range(9):
+        for c in range(9):
+            for v in range(1, 10):
+                row_id = (r * 9 + c) * 9 + (v - 1)
+                first = len(col)
+                for k, cc in enumerate(_row_columns(r, c, v)):
+                    h = cc + 1
+                    node = first + k
+                    col.append(h)
+                    row_of.append(row_id)
+                    # vertical: insert above header (at the bottom of the column)
+                    up.append(up[h])
+                    down.append(h)
+                    down[up[h]] = node
+                    up[h] = node
+                    size[h] += 1
+                    # horizontal: circular list of the row's 4 nodes
+                    left.append(first + (k - 1) % 4)
+                    right.append(first + (k + 1) % 4)
+    return left, right, up, down, col, size, row_of
+
+
+def _template() -> _Template:
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        _TEMPLATE = _build_template()
+    return _TEMPLATE
+
+
+class _Matrix:
+    """One solve's copy of the dancing-links node arrays."""
+
+    def __init__(self) -> None:
+        left, right, up, down, col, size, row_of = _template()
+        self.L = left[:]
+        self.R = right[:]
+        self.U = up[:]
+        self.D = down[:]
+        self.C = col
+        self.S = size[:]
+        self.row_of = row_of
+
+    def cover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def select_row_of_header(self, h: int, row_id: int) -> bool:
+        """Find the node of `row_id` in column header `h` and cover the row's columns."""
+        i = self.D[h]
+        while i != h:
+            if self.row_of[i] == row_id:
+                self.cover(h)
+                j = self.R[i]
+                while j != i:
+                    self.cover(self.C[j])
+                    j = self.R[j]
+                return True
+            i = self.D[i]
+        return False
+
+
+def _decode(row_id: int) -> Tuple[int, int, int]:
+    cell, d = divmod(row_id, 9)
+    r, c = divmod(cell, 9)
+    return r, c, d + 1
+
+
+def _column_cell(cc: int) -> Tuple[int, int, Optional[int]]:
+    """Representative (r, c, digit) of constraint column `cc`, for reporting."""
+    kind, rest = divmod(cc, 81)
+    unit, d = divmod(rest, 9)
+    if kind == 0:
+        return unit, d, None
+    if kind == 1:
+        return unit, 0, d + 1
+    if kind == 2:
+        return 0, unit, d + 1
+    return (unit // 3) * 3, (unit % 3) * 3, d + 1
+
+
+def _search(m: _Matrix, cells: List[List[int]], depth: int, rec: Recorder, ctr: _Counter, solutions: List[List[List[int]]], max_solutions: int, limits: SearchLimits) -> bool:
+    """Return False when `limits` stopped the search (the matrix is restored either way)."""
+    if len(solutions) >= max_solutions:
+        return True
+    if ctr.calls >= limits.poll_at and limits.exceeded(ctr.calls):
+        return False
+
+    ctr.calls += 1
+    ctr.max_depth = max(ctr.max_depth, depth)
+    rec.search.update_depth(depth)
+
+    R, S, D = m.R, m.S, m.D
+    if R[0] == 0:
+        solutions.append([row[:] for row in cells])
+        rec.result.solution_found()
+        return True
+
+    # Choose the column with the fewest rows
+    best = R[0]
+    best_size = S[best]
+    h = R[best]
+    while h != 0 and best_size > 1:
+        if S[h] < best_size:
+            best, best_size = h, S[h]
+        h = R[h]
+
+    if best_size == 0:
+        # A constraint no remaining row can satisfy
+        r, c, v = _column_cell(best - 1)
+        rec.attempt.contradiction(r, c, v, reason="empty_column", depth=depth)
+        return True
+
+    forced = best_size == 1
+    first_r, first_c, _ = _decode(m.row_of[D[best]])
+    rec.decision.choose_cell(first_r, first_c, depth)
+    if not forced:
+        rec.decision.guess_point(depth)
+    source = "deduced" if forced else "guess"
+
+    m.cover(best)
+    ok = True
+    i = D[best]
+    while i != best:
+        r, c, v = _decode(m.row_of[i])
+        j = R[i]
+        while j != i:
+            m.cover(m.C[j])
+            j = R[j]
+        cells[r][c] = v
+        ctr.assignments += 1
+        rec.attempt.assign(r, c, v, source=source, depth=depth)
+
+        ok = _search(m, cells, depth + 1, rec, ctr, solutions, max_solutions, limits)
+
+        cells[r][c] = 0
+        j = m.L[i]
+        while j != i:
+            m.uncover(m.C[j])
+            j = m.L[j]
+        if not ok or len(solutions) >= max_solutions:
+            break
+        if forced:
+            rec.state.unassign(r, c, v, reason="undo_deduction", depth=depth)
+        else:
+            ctr.backtracks += 1
+            rec.state.unassign(r, c, v, reason="backtrack", depth=depth)
+        i = D[i]
+    m.uncover(best)
+    return ok
+
+
+def solve_dlx(
+    grid: Grid,
+    trace_enabled: bool = False,
+    trace_summary: bool = False,
+    max_solutions: int = 2,
+    trace_sink: Any = None,
+    timing_sink: Any = None,
+    time_limit_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+):
+    """Solve a Sudoku as exact cover with Dancing Links; detect up to 2 solutions.
+
+    `time_limit_ms` / `max_nodes` stop the search with ``status="timeout"``
+    (see `solver.limits`). The matrix is built for 9x9 only: other sizes
+    raise ValueError.
+    """
+    if grid.size != 9:
+        raise ValueError(f"dlx 仅支持 9x9 网格（当前为 {grid.size}x{grid.size}），请使用 bits/cp/bt")
+    limits = SearchLimits(time_limit_ms, max_nodes, CHECK_EVERY)
+    limits.start()
+    metrics = MetricsCollector()
+    rec, trace_json = _instrument(metrics, trace_enabled, trace_summary, trace_sink, timing_sink)
+
+    rec.phase.begin("validate")
+    m = _Matrix()
+    cells = grid.to_lists()
+    ok = not grid.givens_conflict()
+    if ok:
+        for r in range(9):
+            for c in range(9):
+                v = cells[r][c]
+                if v and not m.select_row_of_header(r * 9 + c + 1, (r * 9 + c) * 9 + v - 1):
+                    ok = False
+    rec.phase.end("validate")
+    if not ok:
+        stats = Stats(calls=0, assignments=0, backtracks=0, max_depth=0)
+        return SolveResult(status="unsat", solution=None, stats=stats, trace=trace_json()), metrics.finalize("unsat")
+
+    ctr = _Counter()
+    solutions: List[List[List[int]]] = []
+    rec.phase.begin("search")
+    finished = _search(m, cells, 0, rec, ctr, solutions, max_solutions, limits)
+    rec.phase.end("search")
+
+    if not finished:
+        status = TIMEOUT
+        solution = solutions[0] if solutions else None
+    elif len(solutions) == 0:
+        status = "unsat"
+        solution = None
+    elif len(solutions) == 1:
+        status = "unique"
+        solution = solutions[0]
+    else:
+        status = "multiple"
+        solution = solutions[0]
+
+    stats = Stats(calls=ctr.calls, assignments=ctr.assignments, backtracks=ctr.backtracks, max_depth=ctr.max_depth)
+    metrics_dict = metrics.finalize(status)
+    if not finished:
+        metrics_dict["stop_reason"] = limits.reason
+    return SolveResult(status=status, solution=solution, stats=stats, trace=trace_json()), metrics_dict
@@ -0,0 +1,305 @@
+"""Puzzle generation with incremental uniqueness checking.
+
+A puzzle is made in two steps:
+
+1. a random full grid is filled by MRV search over candidate masks with the
+   candidates of every branch shuffled;
+2. clues are removed one symmetry orbit at a time (in random order) as long
+   as the puzzle keeps a unique solution.
+
+The full grid ``S`` is known throughout, so uniqueness never needs a full
+enumeration. The current puzzle is unique, hence a second solution of the
+puzzle without orbit ``O`` must differ from ``S`` inside ``O``; the check
+searches only for such a solution, splitting on the first orbit cell that
+differs (cells before it keep their ``S`` digit, that cell loses it).
+Candidates equal to ``S`` are tried last, so an alternative is found early
+when one exists.
+
+Rejected orbits stay clues for good (removing more clues never restores
+uniqueness), so one pass over the orbits gives a puzzle that is minimal
+for its symmetry.
+
+With ``clues`` set, orbits that would go below the target are skipped and a
+pass that ends above it is retried with a new orbit order on the same full
+grid (a new grid every ``GRID_PASSES`` passes). Search state is carried
+between these removals as a set of *unavoidable sets* of the full grid:
+every alternative ``T`` found marks the cells where ``T`` differs from
+``S``, and any puzzle with no clue among them has ``T`` as a second
+solution. A removal that would clear all clues of a known set is rejected
+without searching. Every puzzle is
+generated from its own RNG seeded by ``(seed, index)``, so a seed
+reproduces the stream and any single puzzle of it.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from sudoku_solver.board.grid import ALL_DIGITS
+from sudoku_solver.solver.counting import propagate
+
+# Clue-removal symmetries: cell (r, c) -> the cells removed together with it
+SYMMETRIES = ("none", "rot180", "rot90", "mirror", "diagonal")
+
+# Removal passes per puzzle before a clue target is given up
+MAX_ATTEMPTS = 100
+
+# Removal passes on one full grid before a new one is filled
+GRID_PASSES = 8
+
+# No 9x9 puzzle with fewer clues has a unique solution
+MIN_CLUES = 17
+
+_ALL_CELLS = (1 << 81) - 1
+
+
+def _images(r: int, c: int, symmetry: str) -> Tuple[Tuple[int, int], ...]:
+    if symmetry == "rot180":
+        return ((r, c), (8 - r, 8 - c))
+    if symmetry == "rot90":
+        return ((r, c), (c, 8 - r), (8 - r, 8 - c), (8 - c, r))
+    if symmetry == "mirror":
+        return ((r, c), (r, 8 - c))
+    if symmetry == "diagonal":
+        return ((r, c), (c, r))
+    return ((r, c),)
+
+
+def orbits(symmetry: str) -> List[Tuple[int, ...]]:
+    """Partition the 81 cell indices into the orbits of `symmetry`."""
+    if symmetry not in SYMMETRIES:
+        raise ValueError(f"未知的对称方式：{symmetry}（可选 {', '.join(SYMMETRIES)}）")
+    seen = set()
+    out: List[Tuple[int, ...]] = []
+    for r in range(9):
+        for c in range(9):
+            orbit = tuple(sorted({rr * 9 + cc for rr, cc in _images(r, c, symmetry)}))
+            if orbit not in seen:
+                seen.add(orbit)
+                out.append(orbit)
+    return out
+
+
+def _reachable(orbit_list: List[Tuple[int, ...]]) -> set:
+    """Clue counts obtainable by removing some of the orbits."""
+    counts = {81}
+    for orbit in orbit_list:
+        counts |= {n - len(orbit) for n in counts}
+    return counts
+
+
+@dataclass
+class GeneratedPuzzle:
+    index: int
+    puzzle: bytes  # 81 raw values 0..9, row-major (see io.line_io)
+    solution: bytes
+    clues: int
+    attempts: int  # removal passes
+    checks: int  # uniqueness searches run
+    pruned: int  # removals rejected by a known unavoidable set
+    nodes: int  # search nodes (fill + checks)
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return [list(self.puzzle[r * 9 : r * 9 + 9]) for r in range(9)]
+
+    @property
+    def solution_grid(self) -> List[List[int]]:
+        return [list(self.solution[r * 9 : r * 9 + 9]) for r in range(9)]
+
+
+class PuzzleGenerator:
+    """Generates puzzles with a unique solution; counters accumulate across puzzles."""
+
+    def __init__(self, clues: Optional[int] = None, symmetry: str = "none", max_attempts: int = MAX_ATTEMPTS) -> None:
+        if clues is not None and not MIN_CLUES <= clues <= 81:
+            raise ValueError(f"提示数必须在 {MIN_CLUES}..81 之间")
+        self.clues = clues
+        self.symmetry = symmetry
+        self.max_attempts = max(1, max_attempts)
+        self._orbits = orbits(symmetry)
+        if clues is not None and clues not in _reachable(self._orbits):
+            raise ValueError(f"对称方式 {symmetry} 下无法得到 {clues} 个提示数")
+        self.nodes = 0
+        self.checks = 0
+        self.pruned = 0
+
+    def generate(self, rng: random.Random, index: int = 0) -> GeneratedPuzzle:
+        """Generate one puzzle; ValueError when `clues` is not reached within `max_attempts` passes."""
+        nodes, checks, pruned = self.nodes, self.checks, self.pruned
+        full: List[int] = []
+        unavoidable: List[int] = []
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt % GRID_PASSES == 1 or GRID_PASSES == 1:
+                full = self._fill(rng)
+                unavoidable = []
+            clue_mask, n = self._remove(full, rng, unavoidable)
+            if self.clues is None or n == self.clues:
+                return GeneratedPuzzle(
+                    index=index,
+                    puzzle=bytes(full[i].bit_length() - 1 if clue_mask >> i & 1 else 0 for i in range(81)),
+                    solution=bytes(b.bit_length() - 1 for b in full),
+                    clues=n,
+                    attempts=attempt,
+                    checks=self.checks - checks,
+                    pruned=self.pruned - pruned,
+                    nodes=self.nodes - nodes,
+                )
+        raise ValueError(f"{self.max_attempts} 次尝试内未能生成 {self.clues} 个提示数的唯一解谜题（对称方式 {self.symmetry}）")
+
+    def _fill(self, rng: random.Random) -> List[int]:
+        """A random full grid as 81 digit bits."""
+        placed = [0] * 81
+        res = self._search([ALL_DIGITS] * 81, placed, rng=rng)
+        assert res is not None  # the empty grid always has a completion
+        return res
+
+    def _remove(self, full: List[int], rng: random.Random, unavoidable: List[int]) -> Tuple[int, int]:
+        """Remove orbits while the solution stays unique; return (clue mask, clue count).
+
+        `unavoidable` holds the known unavoidable sets of `full` (cell
+        masks) and is extended with every alternative solution found.
+        """
+        order = self._orbits[:]
+        rng.shuffle(order)
+        clue_mask = _ALL_CELLS
+        n = 81
+        for orbit in order:
+            if self.clues is not None and n - len(orbit) < self.clues:
+                continue
+            omask = 0
+            for i in orbit:
+                omask |= 1 << i
+            rest = clue_mask & ~omask
+            if any(not u & rest for u in unavoidable):
+                self.pruned += 1
+                continue
+            other = self._other_solution(full, rest, orbit)
+            if other is not None:
+                unavoidable.append(other)
+                continue
+            clue_mask = rest
+            n -= len(orbit)
+            if n == self.clues:
+                break
+        return clue_mask, n
+
+    def _other_solution(self, full: List[int], clue_mask: int, orbit: Tuple[int, ...]) -> Optional[int]:
+        """Cells where a solution of `clue_mask` other than `full` differs from it, or None if unique.
+
+        `clue_mask` plus `orbit` is assumed unique, so a second solution
+        differs from `full` in `orbit`: branch ``k`` keeps the first ``k``
+        orbit cells at their `full` digit and forbids it at cell ``k``.
+        """
+        for k, cell in enumerate(orbit):
+            self.checks += 1
+            state = [ALL_DIGITS] * 81
+            queue = []
+            for i in range(81):
+                if clue_mask >> i & 1:
+                    state[i] = full[i]
+                    queue.append((i, full[i]))
+            for i in orbit[:k]:
+                state[i] = full[i]
+                queue.append((i, full[i]))
+            state[cell] = ALL_DIGITS & ~full[cell]
+            placed = [0] * 81
+            if not propagate(state, queue, (1 << 27) - 1, placed):
+                continue
+            res = self._search(state, placed, known=full)
+            if res is not None:
+                diff = 0
+                for i in range(81):
+                    if res[i] != full[i]:
+                        diff |= 1 << i
+                return diff
+        return None
+
+    def _search(self, state: List[int], placed: List[int], rng: Optional[random.Random] = None, known: Optional[List[int]] = None) -> Optional[List[int]]:
+        """First completion of a propagated state (MRV), or None.
+
+        `rng` shuffles the candidates of each branch; otherwise the digit of
+        `known` is tried last at every cell.
+        """
+        self.nodes += 1
+        best = -1
+        best_n = 10
+        for i in range(81):
+            m = state[i]
+            if m:
+                n = m.bit_count()
+                if n < best_n:
+                    best, best_n = i, n
+                    if n == 2:
+                        break
+        if best < 0:
+            return placed
+        mask = state[best]
+        bits = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            bits.append(bit)
+        if rng is not None:
+            rng.shuffle(bits)
+        elif known is not None and known[best] in bits:
+            bits.remove(known[best])
+            bits.append(known[best])
+        for bit in bits:
+            child = state[:]
+            child[best] = bit
+            child_placed = placed[:]
+            if propagate(child, [(best, bit)], 0, child_placed):
+                res = self._search(child, child_placed, rng, known)
+                if res is not None:
+                    return res
+        return None
+
+
+def puzzle_rng(seed: int, index: int) -> random.Random:
+    """The RNG of puzzle `index` of the stream of `seed`."""
+    return random.Random(f"{seed}/{index}")
+
+
+def generate(
+    count: Optional[int] = None,
+    clues: Optional[int] = None,
+    symmetry: str = "none",
+    seed: int = 0,
+    max_attempts: int = MAX_ATTEMPTS,
+    start: int = 0,
+) -> Iterator[GeneratedPuzzle]:
+    """Yield `count` puzzles (endless when None) of the stream of `seed`, from index `start`."""
+    gen = PuzzleGenerator(clues=clues, symmetry=symmetry, max_attempts=max_attempts)
+    index = start
+    while count is None or index < start + count:
+        yield gen.generate(puzzle_rng(seed, index), index)
+        index += 1
+
+
+@dataclass
+class GenerationSummary:
+    count: int = 0
+    total_clues: int = 0
+    attempts: int = 0
+    checks: int = 0
+    pruned: int = 0
+    nodes: int = 0
+    time_s: float = 0.0
+    puzzles_per_s: float = 0.0
+    avg_clues: float = 0.0
+
+    def add(self, p: GeneratedPuzzle) -> None:
+        self.count += 1
+        self.total_clues += p.clues
+        self.attempts += p.attempts
+        self.checks += p.checks
+        self.pruned += p.pruned
+        self.nodes += p.nodes
+
+    def finish(self, elapsed_s: float) -> GenerationSummary:
+        self.time_s = round(elapsed_s, 3)
+        self.puzzles_per_s = round(self.count / elapsed_s, 2) if elapsed_s > 0 else 0.0
+        self.avg_clues = round(self.total_clues / self.count, 2) if self.count else 0.0
+        return self
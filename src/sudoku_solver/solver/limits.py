@@ -0,0 +1,72 @@
+"""Deadline and node-budget limits for the search engines.
+
+`SearchLimits` is checked by every engine at node entry with a single
+integer comparison (``ctr.calls >= limits.poll_at``); only when that fires
+is the node budget compared and the clock read, so the per-node cost stays
+one compare whatever the limits are. ``poll_at`` advances by the engine's
+``check_every`` (its nodes differ widely in cost) and never past
+``max_nodes``, so the node budget is exact: a stopped search has visited
+exactly ``max_nodes`` nodes. The deadline overshoots by at most
+``check_every`` nodes.
+
+A stopped search reports ``status="timeout"`` with the partial `Stats` /
+metrics and ``metrics["stop_reason"]`` set to ``"time_limit"`` or
+``"max_nodes"``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Optional
+
+STATUS = "timeout"
+
+# Stop reasons (metrics["stop_reason"], results.stop_reason)
+TIME_LIMIT = "time_limit"
+MAX_NODES = "max_nodes"
+
+# poll_at while no limit is set: the per-node compare never fires
+NEVER = sys.maxsize
+
+
+class SearchLimits:
+    def __init__(self, time_limit_ms: Optional[float] = None, max_nodes: Optional[int] = None, check_every: int = 1024) -> None:
+        if time_limit_ms is not None and time_limit_ms < 0:
+            raise ValueError("time_limit_ms 不能为负数")
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError("max_nodes 不能为负数")
+        self.time_limit_ms = time_limit_ms
+        self.max_nodes = max_nodes
+        self.check_every = max(1, check_every)
+        self.reason: Optional[str] = None
+        self.poll_at = NEVER
+        self._deadline: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return self.time_limit_ms is not None or self.max_nodes is not None
+
+    def start(self, calls: int = 0) -> None:
+        """Arm the deadline (measured from now) and the first poll."""
+        if self.time_limit_ms is not None:
+            self._deadline = time.perf_counter_ns() + int(self.time_limit_ms * 1_000_000)
+        self.poll_at = self._next(calls)
+
+    def _next(self, calls: int) -> int:
+        if not self.active:
+            return NEVER
+        n = calls + self.check_every
+        if self.max_nodes is not None and n > self.max_nodes:
+            n = self.max_nodes
+        return n
+
+    def exceeded(self, calls: int) -> bool:
+        """Called once ``calls >= poll_at``; True (and `reason` set) means stop."""
+        if self.max_nodes is not None and calls >= self.max_nodes:
+            self.reason = MAX_NODES
+            return True
+        if self._deadline is not None and time.perf_counter_ns() >= self._deadline:
+            self.reason = TIME_LIMIT
+            return True
+        self.poll_at = self._next(calls)
+        return False
@@ -0,0 +1,288 @@
+"""Parallel backtracking: one puzzle's search tree split across processes.
+
+Work is a queue of *prefixes*: assignments ``(row, col, value)`` made on top
+of the givens, each naming one subtree of the ``bt`` search. A task runs the
+explicit-stack engine (`backtracking._search`) on one prefix with a node
+budget of ``task_nodes``. A task that finishes reports its solutions and
+counters. One that exhausts its budget stops at a node boundary and hands
+back the rest of its subtree as new prefixes, read off its stack: the node it
+was about to enter plus, for every frame, the values not tried yet. Nothing
+is searched twice; large subtrees keep being split while small ones finish
+in one task, so workers never sit idle behind one huge subtree.
+
+The root task runs in the calling process, so a puzzle that finishes within
+one budget never starts the pool. Prefixes are dispatched in serial DFS
+order. Once ``max_solutions`` solutions are known, queued prefixes are
+dropped and running tasks are cancelled through a shared event that their
+`SearchLimits` poll checks. Per-task `MetricsCollector` totals are merged
+(sums; depths offset by the prefix length). A task that splits also counts
+the frame-level events serial ``bt`` emits while finishing its frames, so
+stats and metrics equal the serial run's whenever the whole tree is searched
+(``unique`` / ``unsat``). ``metrics["parallel"]`` reports the task count
+and the nodes searched per worker process.
+
+With ``max_solutions`` reached the reported solution is the smallest of the
+solutions found in row-major order (the one serial ``bt`` finds first when it
+is among them). Trace and checkpoints are not supported.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.instrumentation.recorder import Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver.backtracking import CHECK_EVERY, _Counter, _search
+from sudoku_solver.solver.limits import MAX_NODES, STATUS as TIMEOUT, TIME_LIMIT, SearchLimits
+from sudoku_solver.trace.tracer import Tracer
+from sudoku_solver.types import SolveResult, Stats
+
+# Node budget of one task (~0.1 s of bt search)
+TASK_NODES = 20_000
+
+# Stop reason of a task cancelled because the solution cap was reached
+CANCELLED = "cancelled"
+
+_Prefix = Tuple[Tuple[int, int, int], ...]
+
+_CANCEL: Any = None  # per-worker multiprocessing.Event, set by _init_worker
+
+
+def _init_worker(cancel: Any) -> None:
+    global _CANCEL
+    _CANCEL = cancel
+
+
+class _TaskLimits(SearchLimits):
+    """Task budget plus the pool-wide cancel event."""
+
+    def exceeded(self, calls: int) -> bool:
+        if _CANCEL is not None and _CANCEL.is_set():
+            self.reason = CANCELLED
+            return True
+        return super().exceeded(calls)
+
+
+def run_task(givens: List[List[int]], prefix: _Prefix, max_solutions: int, max_nodes: int, time_limit_ms: Optional[float] = None) -> Dict[str, Any]:
+    """Search the subtree below `prefix`; return counters, solutions and unsearched prefixes."""
+    grid = Grid([row[:] for row in givens])
+    for r, c, v in prefix:
+        grid.set_cell(r, c, v)
+    metrics = MetricsCollector()
+    ctr = _Counter()
+    solutions: List[List[List[int]]] = []
+    stack: List[List[int]] = []
+    limits = _TaskLimits(time_limit_ms, max_nodes, CHECK_EVERY)
+    limits.start()
+    reason = _search(grid, Recorder([metrics]), ctr, solutions, max_solutions, stack, None, limits)
+
+    splits: List[_Prefix] = []
+    if reason is not None:
+        # Unsearched work in serial DFS order: the pending node, then untried values from the deepest frame up
+        path = list(prefix)
+        for r, c, _cand, v in stack:
+            path.append((r, c, v - 1))
+        splits.append(tuple(path))
+        for depth in range(len(stack) - 1, -1, -1):
+            r, c, cand, v = stack[depth]
+            base = path[: len(prefix) + depth]
+            untried = [w for w in range(v, grid.size + 1) if cand >> w & 1]
+            splits.extend(tuple(base + [(r, c, w)]) for w in untried)
+            # Frame-level events the serial engine emits while finishing this frame:
+            # one backtrack per value, an assignment per untried candidate, a contradiction per non-candidate
+            ctr.assignments += len(untried)
+            ctr.backtracks += 1 + len(untried)
+            metrics.assignments += len(untried)
+            metrics.guessed_assignments += len(untried)
+            metrics.backtracks += 1 + len(untried)
+            metrics.contradictions += grid.size + 1 - v - len(untried)
+    return {
+        "pid": os.getpid(),
+        "depth": len(prefix),
+        "counters": vars(ctr),
+        "metrics": vars(metrics),
+        "solutions": solutions,
+        "splits": splits,
+        "reason": reason,
+    }
+
+
+class _Merge:
+    """Running totals over task results."""
+
+    def __init__(self) -> None:
+        self.ctr = _Counter()
+        self.metrics = MetricsCollector()
+        self.solutions: List[List[List[int]]] = []
+        self.tasks = 0
+        self.worker_nodes: Dict[int, int] = {}
+
+    def add(self, res: Dict[str, Any]) -> None:
+        depth = res["depth"]
+        self.tasks += 1
+        for name, value in res["counters"].items():
+            if name == "max_depth":
+                self.ctr.max_depth = max(self.ctr.max_depth, value + depth)
+            else:
+                setattr(self.ctr, name, getattr(self.ctr, name) + value)
+        m = self.metrics
+        for name, value in res["metrics"].items():
+            if name == "max_depth":
+                m.max_depth = max(m.max_depth, value + depth)
+            elif name == "first_guess_depth":
+                if value is not None and (m.first_guess_depth is None or value + depth < m.first_guess_depth):
+                    m.first_guess_depth = value + depth
+            else:
+                setattr(m, name, getattr(m, name) + value)
+        self.solutions.extend(res["solutions"])
+        pid = res["pid"]
+        self.worker_nodes[pid] = self.worker_nodes.get(pid, 0) + res["counters"]["calls"]
+
+
+class _Scheduler:
+    """Prefix queue, merged totals and limits of one parallel solve."""
+
+    def __init__(self, givens: List[List[int]], max_solutions: int, task_nodes: int, time_limit_ms: Optional[float], max_nodes: Optional[int]) -> None:
+        self.givens = givens
+        self.max_solutions = max_solutions
+        self.task_nodes = task_nodes
+        self.max_nodes = max_nodes
+        self.deadline = time.perf_counter_ns() + int(time_limit_ms * 1_000_000) if time_limit_ms is not None else None
+        self.total = _Merge()
+        self.queue: Deque[_Prefix] = deque([()])
+
+    @property
+    def capped(self) -> bool:
+        return len(self.total.solutions) >= self.max_solutions
+
+    def time_left(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, (self.deadline - time.perf_counter_ns()) / 1_000_000)
+
+    def budget(self, outstanding: int = 0) -> int:
+        """Node budget for the next task; `outstanding` is the budget of running tasks."""
+        if self.max_nodes is None:
+            return self.task_nodes
+        return min(self.task_nodes, self.max_nodes - self.total.ctr.calls - outstanding)
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.perf_counter_ns() >= self.deadline
+
+    def task_args(self, budget: int) -> Tuple[Any, ...]:
+        return (self.givens, self.queue.popleft(), self.max_solutions - len(self.total.solutions), budget, self.time_left())
+
+    def absorb(self, res: Dict[str, Any]) -> None:
+        self.total.add(res)
+        self.queue.extendleft(reversed(res["splits"]))
+
+    def run_inline(self) -> Optional[str]:
+        """Run queued tasks in this process until done; return a stop reason or None."""
+        while self.queue and not self.capped:
+            if self.expired():
+                return TIME_LIMIT
+            b = self.budget()
+            if b <= 0:
+                return MAX_NODES
+            self.absorb(run_task(*self.task_args(b)))
+        return None
+
+    def run_pool(self, jobs: int) -> Optional[str]:
+        """Drain the queue over a process pool; return a stop reason or None."""
+        ctx = multiprocessing.get_context()
+        cancel = ctx.Event()
+        pending: Dict[Future, int] = {}
+        pool = ProcessPoolExecutor(max_workers=jobs, mp_context=ctx, initializer=_init_worker, initargs=(cancel,))
+        try:
+            while not self.capped:
+                if self.expired():
+                    return TIME_LIMIT
+                # Keep every worker busy plus one queued task each
+                while self.queue and len(pending) < 2 * jobs:
+                    b = self.budget(sum(pending.values()))
+                    if b <= 0:
+                        break
+                    pending[pool.submit(run_task, *self.task_args(b))] = b
+                if not pending:
+                    return MAX_NODES if self.queue else None
+                left = self.time_left()
+                done, _ = wait(pending, timeout=None if left is None else left / 1000 + 0.05, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    del pending[fut]
+                    self.absorb(fut.result())
+            return None
+        finally:
+            cancel.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def solve_parallel(
+    grid: Grid,
+    jobs: Optional[int] = None,
+    max_solutions: int = 2,
+    timing_sink: Any = None,
+    time_limit_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    task_nodes: int = TASK_NODES,
+):
+    """Solve with the ``bt`` engine over `jobs` processes (default: CPU count).
+
+    Returns ``(SolveResult, metrics_dict)`` like the serial solvers;
+    `time_limit_ms` / `max_nodes` give ``status="timeout"`` as in
+    `solver.limits` (``max_nodes`` bounds the nodes of all tasks together).
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    rec = Recorder([timing_sink] if timing_sink is not None else [])
+    trace = Tracer(enabled=False).to_json_obj()
+
+    rec.phase.begin("validate")
+    conflict = grid.givens_conflict()
+    rec.phase.end("validate")
+    if conflict:
+        stats = Stats(calls=0, assignments=0, backtracks=0, max_depth=0)
+        return SolveResult(status="unsat", solution=None, stats=stats, trace=trace), MetricsCollector().finalize("unsat")
+
+    sched = _Scheduler(grid.to_lists(), max_solutions, max(1, task_nodes), time_limit_ms, max_nodes)
+    rec.phase.begin("search")
+    # The root task runs in-process: puzzles finishing within one budget never start the pool
+    stop_reason = sched.run_inline() if jobs == 1 else None
+    if jobs > 1:
+        b = sched.budget()
+        if b > 0:
+            sched.absorb(run_task(*sched.task_args(b)))
+        if sched.queue and not sched.capped:
+            stop_reason = sched.run_pool(jobs)
+    rec.phase.end("search")
+
+    total = sched.total
+    solutions = sorted(total.solutions)[:max_solutions]
+    if sched.capped:
+        stop_reason = None
+    elif sched.queue and stop_reason is None:
+        stop_reason = MAX_NODES if sched.budget() <= 0 else TIME_LIMIT
+    if stop_reason is not None:
+        status = TIMEOUT
+    elif not solutions:
+        status = "unsat"
+    elif len(solutions) == 1:
+        status = "unique"
+    else:
+        status = "multiple"
+
+    ctr, metrics = total.ctr, total.metrics
+    metrics.solutions_found = len(solutions)
+    stats = Stats(calls=ctr.calls, assignments=ctr.assignments, backtracks=ctr.backtracks, max_depth=ctr.max_depth)
+    metrics_dict = metrics.finalize(status)
+    if stop_reason is not None:
+        metrics_dict["stop_reason"] = stop_reason
+    metrics_dict["parallel"] = {
+        "jobs": jobs,
+        "tasks": total.tasks,
+        "worker_nodes": sorted(total.worker_nodes.values(), reverse=True),
+    }
+    return SolveResult(status=status, solution=solutions[0] if solutions else None, stats=stats, trace=trace), metrics_dict
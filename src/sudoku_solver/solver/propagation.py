@@ -0,0 +1,214 @@
+"""Constraint-propagation solver (v1.1): singles to a fixpoint + MRV branching.
+
+After every assignment the engine applies naked singles (a cell with one
+candidate left) and hidden singles (a digit with one possible cell left in
+a row/column/box) until nothing changes, then branches on the empty cell
+with the fewest candidates. Deductions are reported with
+``source="deduced"``, branch values with ``source="guess"``. Multi-solution
+detection follows docs/design/solver_backtracking.md (stop at
+``max_solutions``).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from sudoku_solver.board.geometry import geometry
+from sudoku_solver.board.grid import Grid, mask_values
+from sudoku_solver.instrumentation.recorder import Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.solver.backtracking import _Counter, _instrument
+from sudoku_solver.solver.limits import STATUS as TIMEOUT, SearchLimits
+from sudoku_solver.types import SolveResult, Stats
+
+
+@lru_cache(maxsize=None)
+def units_for(size: int) -> Tuple[Tuple[Tuple[int, int, int], ...], ...]:
+    """The 3·size units (rows, columns, boxes) of a board as tuples of (row, col, flat index)."""
+    return tuple(tuple((*divmod(i, size), i) for i in unit) for unit in geometry(size).units)
+
+
+# Nodes between two SearchLimits polls (each node runs a full propagation pass)
+CHECK_EVERY = 16
+
+
+def _assign(grid: Grid, r: int, c: int, v: int, depth: int, rec: Recorder, ctr: _Counter, trail: List[Tuple[int, int, int]]) -> None:
+    grid.set_cell(r, c, v)
+    trail.append((r, c, v))
+    ctr.assignments += 1
+    rec.attempt.assign(r, c, v, source="deduced", depth=depth)
+
+
+def _undo(grid: Grid, trail: List[Tuple[int, int, int]], depth: int, rec: Recorder) -> None:
+    while trail:
+        r, c, v = trail.pop()
+        grid.clear_cell(r, c)
+        rec.state.unassign(r, c, v, reason="undo_deduction", depth=depth)
+
+
+def _propagate(grid: Grid, depth: int, rec: Recorder, ctr: _Counter, trail: List[Tuple[int, int, int]]) -> bool:
+    """Apply naked/hidden singles until fixpoint. Return False on contradiction."""
+    data = grid.data
+    size = grid.size
+    all_digits = grid.all_digits
+    units = units_for(size)
+    while True:
+        progress = False
+
+        # Naked singles
+        m = grid.empty_mask
+        while m:
+            low = m & -m
+            m ^= low
+            r, c = divmod(low.bit_length() - 1, size)
+            cand = grid.candidates(r, c)
+            if not cand:
+                rec.attempt.contradiction(r, c, None, reason="no_candidates", depth=depth)
+                return False
+            if not cand & (cand - 1):
+                _assign(grid, r, c, cand.bit_length() - 1, depth, rec, ctr, trail)
+                progress = True
+
+        # Hidden singles
+        for unit in units:
+            once = 0
+            twice = 0
+            placed = 0
+            for r, c, i in unit:
+                v = data[i]
+                if v:
+                    placed |= 1 << v
+                    continue
+                cand = grid.candidates(r, c)
+                twice |= once & cand
+                once |= cand
+            if (once | placed) != all_digits:
+                r, c, _ = unit[0]
+                rec.attempt.contradiction(r, c, None, reason="no_place_for_digit", depth=depth)
+                return False
+            singles = once & ~twice & ~placed
+            for v in mask_values(singles):
+                for r, c, i in unit:
+                    if data[i] == 0 and grid.candidates(r, c) >> v & 1:
+                        _assign(grid, r, c, v, depth, rec, ctr, trail)
+                        progress = True
+                        break
+                else:
+                    r, c, _ = unit[0]
+                    rec.attempt.contradiction(r, c, v, reason="no_place_for_digit", depth=depth)
+                    return False
+
+        if not progress:
+            return True
+
+
+def _choose_mrv(grid: Grid) -> Tuple[int, int, int]:
+    """Return (r, c, candidates) of the empty cell with fewest candidates."""
+    best = (-1, -1, 0)
+    size = grid.size
+    best_n = size + 1
+    m = grid.empty_mask
+    while m:
+        low = m & -m
+        m ^= low
+        r, c = divmod(low.bit_length() - 1, size)
+        cand = grid.candidates(r, c)
+        n = cand.bit_count()
+        if n < best_n:
+            best, best_n = (r, c, cand), n
+            if n <= 2:
+                break
+    return best
+
+
+def _search(grid: Grid, depth: int, rec: Recorder, ctr: _Counter, solutions: List[List[List[int]]], max_solutions: int, limits: SearchLimits) -> bool:
+    """Return False when `limits` stopped the search (the grid is restored either way)."""
+    if len(solutions) >= max_solutions:
+        return True
+    if ctr.calls >= limits.poll_at and limits.exceeded(ctr.calls):
+        return False
+
+    ctr.calls += 1
+    ctr.max_depth = max(ctr.max_depth, depth)
+    rec.search.update_depth(depth)
+
+    trail: List[Tuple[int, int, int]] = []
+    if not _propagate(grid, depth, rec, ctr, trail):
+        _undo(grid, trail, depth, rec)
+        return True
+
+    if grid.empty_mask == 0:
+        solutions.append(grid.to_lists())
+        rec.result.solution_found()
+        _undo(grid, trail, depth, rec)
+        return True
+
+    r, c, cand = _choose_mrv(grid)
+    rec.decision.choose_cell(r, c, depth)
+    rec.decision.guess_point(depth)
+    ok = True
+    for v in mask_values(cand):
+        grid.set_cell(r, c, v)
+        ctr.assignments += 1
+        rec.attempt.assign(r, c, v, source="guess", depth=depth)
+        ok = _search(grid, depth + 1, rec, ctr, solutions, max_solutions, limits)
+        grid.clear_cell(r, c)
+        if not ok or len(solutions) >= max_solutions:
+            break
+        ctr.backtracks += 1
+        rec.state.unassign(r, c, v, reason="backtrack", depth=depth)
+    _undo(grid, trail, depth, rec)
+    return ok
+
+
+def solve_propagation(
+    grid: Grid,
+    trace_enabled: bool = False,
+    trace_summary: bool = False,
+    max_solutions: int = 2,
+    trace_sink: Any = None,
+    timing_sink: Any = None,
+    time_limit_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+):
+    """Solve a Sudoku with singles propagation + MRV branching; detect up to 2 solutions.
+
+    `time_limit_ms` / `max_nodes` stop the search with ``status="timeout"``
+    (see `solver.limits`).
+    """
+    limits = SearchLimits(time_limit_ms, max_nodes, CHECK_EVERY)
+    limits.start()
+    metrics = MetricsCollector()
+    rec, trace_json = _instrument(metrics, trace_enabled, trace_summary, trace_sink, timing_sink)
+    rec.phase.begin("validate")
+    conflict = grid.givens_conflict()
+    rec.phase.end("validate")
+    if conflict:
+        stats = Stats(calls=0, assignments=0, backtracks=0, max_depth=0)
+        return SolveResult(status="unsat", solution=None, stats=stats, trace=trace_json()), metrics.finalize("unsat")
+
+    ctr = _Counter()
+    solutions: List[List[List[int]]] = []
+    rec.phase.begin("search")
+    finished = _search(grid, 0, rec, ctr, solutions, max_solutions, limits)
+    rec.phase.end("search")
+
+    if not finished:
+        status = TIMEOUT
+        solution = solutions[0] if solutions else None
+    elif len(solutions) == 0:
+        status = "unsat"
+        solution = None
+    elif len(solutions) == 1:
+        status = "unique"
+        solution = solutions[0]
+    else:
+        status = "multiple"
+        solution = solutions[0]
+
+    stats = Stats(calls=ctr.calls, assignments=ctr.assignments, backtracks=ctr.backtracks, max_depth=ctr.max_depth)
+    metrics_dict = metrics.finalize(status)
+    if not finished:
+        metrics_dict["stop_reason"] = limits.reason
+    return SolveResult(status=status, solution=solution, stats=stats, trace=trace_json()), metrics_dict
@@ -0,0 +1,181 @@
+"""NumPy batch propagation: singles elimination on N puzzles at once.
+
+The batch is held as an ``(N, 81)`` array of values plus ``uint16``
+candidate bitmasks (bit ``v`` set means digit ``v`` is still possible).
+Each round applies naked singles and hidden singles (rows, columns, boxes)
+to the whole batch with array operations, revisiting only the puzzles that
+changed, until a fixpoint. Singles are sound deductions, so a puzzle
+completed this way is ``unique`` and a puzzle that hits a contradiction is
+``unsat``. Only puzzles that remain unresolved are handed to a scalar
+engine from `SOLVERS` (``cp`` by default), starting from the propagated
+grid.
+
+It is not a per-puzzle solver in `SOLVERS`: ``solve-batch`` and ``bench``
+select it as method `METHOD` (``vec``) and hand it whole chunks.
+
+NumPy is an optional dependency (``pip install sudoku-solver[numpy]``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sudoku_solver.board.grid import ALL_DIGITS, BOX_OF, Grid
+from sudoku_solver.metrics.collector import MetricsCollector
+from sudoku_solver.trace.tracer import Tracer
+from sudoku_solver.types import SolveResult, Stats
+
+try:  # optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+if np is not None:
+    # UNITS[u] = the 9 flat cell indices of unit u (rows, columns, boxes)
+    UNITS = np.array(
+        [[r * 9 + c for c in range(9)] for r in range(9)]
+        + [[r * 9 + c for r in range(9)] for c in range(9)]
+        + [[r * 9 + c for r in range(9) for c in range(9) if BOX_OF[r][c] == b] for b in range(9)],
+        dtype=np.intp,
+    )
+    # CELL_UNITS[i] = the row, column and box unit of flat cell i
+    CELL_UNITS = np.array([[i // 9, 9 + i % 9, 18 + BOX_OF[i // 9][i % 9]] for i in range(81)], dtype=np.intp)
+    _POP = np.array([m.bit_count() for m in range(1024)], dtype=np.uint8)
+    _LOW_DIGIT = np.array([(m & -m).bit_length() - 1 if m else 0 for m in range(1024)], dtype=np.int8)
+    _BIT = np.array([0] + [1 << v for v in range(1, 10)], dtype=np.uint16)
+
+
+# Method id of the batch engine (``solve-batch`` / ``bench`` / results.method)
+METHOD = "vec"
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("向量化求解需要 numpy：pip install 'sudoku-solver[numpy]'")
+
+
+def _or_reduce(a: "np.ndarray", axis: int) -> "np.ndarray":
+    return np.bitwise_or.reduce(a, axis=axis)
+
+
+def _unit_state(values: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Per-unit digit masks (N, 27) and a per-puzzle duplicate flag."""
+    bits = _BIT[values][:, UNITS]  # (n, 27, 9)
+    used = _or_reduce(bits, 2)
+    filled = (values[:, UNITS] != 0).sum(axis=2, dtype=np.uint8)
+    dup = (_POP[used] != filled).any(axis=1)
+    return used, dup
+
+
+def propagate_batch(values: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Run naked/hidden singles on an (N, 9, 9) or (N, 81) array until fixpoint.
+
+    Returns ``(values, dead, deduced)``: the propagated values as a new
+    (N, 81) int8 array, a per-puzzle contradiction flag and the number of
+    cells each puzzle filled by deduction.
+    """
+    _require_numpy()
+    values = np.array(values, dtype=np.int8, copy=True).reshape(-1, 81)
+    _, dead = _unit_state(values)
+    deduced = np.zeros(values.shape[0], dtype=np.int64)
+    active = np.flatnonzero(~dead & (values == 0).any(axis=1))
+
+    while active.size:
+        sub = values[active]
+        used, _ = _unit_state(sub)
+        empty = sub == 0
+        cand = np.where(empty, ALL_DIGITS & ~_or_reduce(used[:, CELL_UNITS], 2), 0).astype(np.uint16)
+        pop = _POP[cand]
+
+        # Hidden singles: digits seen exactly once among a unit's candidates
+        per_unit = cand[:, UNITS]  # (n, 27, 9)
+        once = np.zeros(used.shape, dtype=np.uint16)
+        twice = np.zeros(used.shape, dtype=np.uint16)
+        for k in range(9):
+            col = per_unit[:, :, k]
+            twice |= once & col
+            once |= col
+        single = once & ~twice
+
+        # Contradictions: empty cell without candidates, or a missing digit with no place
+        bad = (empty & (pop == 0)).any(axis=1)
+        bad |= ((ALL_DIGITS & ~(once | used)) != 0).any(axis=1)
+
+        assign = np.where(pop == 1, cand, 0).astype(np.uint16)
+        assign |= _or_reduce(single[:, CELL_UNITS], 2) & cand
+        # Two different digits forced into the same cell
+        bad |= (_POP[assign] > 1).any(axis=1)
+
+        new_cells = (assign != 0) & ~bad[:, None]
+        sub = np.where(new_cells, _LOW_DIGIT[assign], sub)
+        # The same digit forced twice into one unit
+        bad |= _unit_state(sub)[1]
+
+        values[active] = sub
+        dead[active] |= bad
+        deduced[active] += new_cells.sum(axis=1)
+        changed = new_cells.any(axis=1) & ~bad & (sub == 0).any(axis=1)
+        active = active[changed]
+
+    return values, dead, deduced
+
+
+def _deduced_only_result(status: str, grid_values: List[List[int]] | None, deduced: int) -> Tuple[SolveResult, Dict[str, Any]]:
+    metrics = MetricsCollector()
+    metrics.assignments = deduced
+    metrics.deduced_assignments = deduced
+    if status == "unsat":
+        metrics.contradictions = 1
+    else:
+        metrics.solutions_found = 1
+    stats = Stats(calls=1, assignments=deduced, backtracks=0, max_depth=0)
+    trace = Tracer(enabled=False).to_json_obj()
+    return SolveResult(status=status, solution=grid_values, stats=stats, trace=trace), metrics.finalize(status)
+
+
+def solve_batch_vectorized(
+    grids: Sequence[Grid],
+    fallback: str = "cp",
+    max_solutions: int = 2,
+    time_limit_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+) -> List[Tuple[SolveResult, Dict[str, Any]]]:
+    """Solve a batch of puzzles; return ``(SolveResult, metrics)`` per input grid.
+
+    Puzzles resolved by vectorized singles are reported directly; the rest
+    are finished by ``SOLVERS[fallback]`` (with `time_limit_ms` / `max_nodes`
+    per puzzle) and their metrics include the batch-phase deductions as
+    ``deduced_assignments``. 9x9 boards only (ValueError otherwise).
+    """
+    _require_numpy()
+    from sudoku_solver.solver import SOLVERS
+
+    if not grids:
+        return []
+    if any(g.size != 9 for g in grids):
+        raise ValueError("向量化批量求解仅支持 9x9 网格")
+    values = np.frombuffer(b"".join(g.data for g in grids), dtype=np.uint8)
+    out_values, dead, deduced = propagate_batch(values)
+    solved = (out_values != 0).all(axis=1) & ~dead
+
+    results: List[Tuple[SolveResult, Dict[str, Any]]] = []
+    scalar = SOLVERS[fallback]
+    for i in range(len(grids)):
+        k = int(deduced[i])
+        if dead[i]:
+            results.append(_deduced_only_result("unsat", None, k))
+            continue
+        cells = out_values[i].reshape(9, 9).tolist()
+        if solved[i]:
+            results.append(_deduced_only_result("unique", cells, k))
+            continue
+        sr, metrics = scalar(Grid(cells), max_solutions=max_solutions, time_limit_ms=time_limit_ms, max_nodes=max_nodes)
+        sr.stats.assignments += k
+        metrics["assignments"] += k
+        metrics["deduced_assignments"] += k
+        results.append((sr, metrics))
+    return results
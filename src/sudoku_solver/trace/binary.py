@@ -0,0 +1,192 @@
+"""Streaming binary trace: fixed-width records written as events happen.
+
+File layout (optionally gzip-compressed as a whole)::
+
+    header  b"SDKT" + version (u8) + 3 reserved bytes
+    record  type (u8) | reason (u8) | row (u8) | col (u8) | value (u8) | depth (u16 LE)
+
+Rows/cols are 0-based in the file and 1-based once decoded, matching the
+JSON steps of docs/design/trace.md; ``value`` 0 means "no value". Reasons
+are stored as codes from `REASONS`; unknown reason strings decode as
+``"other"``. `BinaryTraceSink` is a Recorder sink that keeps only a write
+buffer and summary counters, so memory stays flat however long the search
+runs; `iter_steps` / `summarize` decode a file lazily.
+"""
+from __future__ import annotations
+
+import gzip
+import struct
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Tuple
+
+MAGIC = b"SDKT"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+RECORD = struct.Struct("<BBBBBH")
+
+EVENT_TYPES: Tuple[str, ...] = ("CHOOSE_CELL", "ASSIGN", "UNASSIGN", "CONTRADICTION", "SOLUTION_FOUND")
+_CHOOSE, _ASSIGN, _UNASSIGN, _CONTRADICTION, _SOLUTION = range(5)
+# Summary counter names, aligned with Tracer.counts
+COUNT_KEYS: Tuple[str, ...] = ("choose_cell", "assign", "unassign", "contradiction", "solution_found")
+
+REASONS: Tuple[str, ...] = (
+    "other",
+    "first_empty",
+    "try_value",
+    "backtrack",
+    "conflict",
+    "invalid_candidate",
+    "no_candidates",
+    "no_place_for_digit",
+    "empty_column",
+    "undo_deduction",
+    "propagation",
+)
+_REASON_CODE = {name: i for i, name in enumerate(REASONS)}
+_DEPTH_MAX = 0xFFFF
+
+
+class BinaryTraceSink:
+    """Recorder sink that streams events to a binary trace file.
+
+    Call `close()` (or use as a context manager) to flush the tail of the
+    buffer; `to_json_obj()` returns the summary embedded in result JSON.
+    """
+
+    def __init__(self, path: str | Path, compress: bool = False, buffer_bytes: int = 1 << 16) -> None:
+        self.path = Path(path)
+        self.compress = compress
+        self._fh: IO[bytes] = gzip.open(self.path, "wb") if compress else open(self.path, "wb")
+        self._fh.write(HEADER)
+        self._buf = bytearray()
+        self._limit = buffer_bytes
+        self._pack = RECORD.pack
+        self.counts = [0] * len(EVENT_TYPES)
+        self.closed = False
+
+    def _emit(self, etype: int, reason: str, r: int, c: int, v: int | None, depth: int | None) -> None:
+        self.counts[etype] += 1
+        d = depth or 0
+        self._buf += self._pack(etype, _REASON_CODE.get(reason, 0), r, c, v or 0, d if d < _DEPTH_MAX else _DEPTH_MAX)
+        if len(self._buf) >= self._limit:
+            self._fh.write(self._buf)
+            self._buf.clear()
+
+    # Recorder sink handlers
+    def decision_choose_cell(self, r: int, c: int, depth: int) -> None:
+        self._emit(_CHOOSE, "first_empty", r, c, None, depth)
+
+    def attempt_assign(self, r: int, c: int, v: int, source: str, depth: int) -> None:  # noqa: ARG002
+        self._emit(_ASSIGN, "try_value", r, c, v, depth)
+
+    def attempt_contradiction(self, r: int, c: int, v: int | None = None, reason: str = "invalid_candidate", depth: int | None = None) -> None:  # noqa: ARG002
+        self._emit(_CONTRADICTION, reason, r, c, None, depth)
+
+    def state_unassign(self, r: int, c: int, v: int, reason: str = "backtrack", depth: int | None = None) -> None:
+        self._emit(_UNASSIGN, reason, r, c, v, depth)
+
+    def result_solution_found(self) -> None:
+        self._emit(_SOLUTION, "other", 0, 0, None, 0)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._buf:
+            self._fh.write(self._buf)
+            self._buf.clear()
+        self._fh.close()
+        self.closed = True
+
+    def __enter__(self) -> BinaryTraceSink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def to_json_obj(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "mode": "binary",
+            "file": str(self.path),
+            "compressed": self.compress,
+            "events": sum(self.counts),
+            "counts": dict(zip(COUNT_KEYS, self.counts)),
+        }
+
+
+def _open_trace(path: str | Path) -> IO[bytes]:
+    fh: IO[bytes] = open(path, "rb")
+    if fh.read(2) == b"\x1f\x8b":
+        fh.close()
+        fh = gzip.open(path, "rb")
+    else:
+        fh.seek(0)
+    header = fh.read(len(HEADER))
+    if header[:4] != MAGIC:
+        fh.close()
+        raise ValueError("不是二进制 trace 文件")
+    if header[4] != VERSION:
+        fh.close()
+        raise ValueError(f"不支持的 trace 版本：{header[4]}")
+    return fh
+
+
+def iter_records(path: str | Path, chunk_records: int = 8192) -> Iterator[Tuple[int, int, int, int, int, int]]:
+    """Yield raw ``(type, reason, row, col, value, depth)`` tuples lazily."""
+    size = RECORD.size
+    records = 0
+    with _open_trace(path) as fh:
+        tail = b""
+        while True:
+            chunk = fh.read(size * chunk_records)
+            if not chunk:
+                break
+            data = tail + chunk
+            usable = len(data) - len(data) % size
+            yield from RECORD.iter_unpack(data[:usable])
+            records += usable // size
+            tail = data[usable:]
+        if tail:
+            raise ValueError(f"trace 文件被截断（偏移 {_offset(records)} 处剩余 {len(tail)} 字节）")
+
+
+def _offset(index: int) -> int:
+    """Byte offset of record `index` in the (uncompressed) file."""
+    return len(HEADER) + index * RECORD.size
+
+
+def _bad_type(index: int, etype: int) -> ValueError:
+    return ValueError(f"trace 记录类型无效：{etype}（第 {index} 条记录，偏移 {_offset(index)}）")
+
+
+def iter_steps(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Decode a binary trace into JSON steps (docs/design/trace.md) lazily."""
+    for index, (etype, reason, r, c, v, depth) in enumerate(iter_records(path)):
+        if etype >= len(EVENT_TYPES):
+            raise _bad_type(index, etype)
+        if etype == _SOLUTION:
+            yield {"type": "SOLUTION_FOUND"}
+            continue
+        step: Dict[str, Any] = {"type": EVENT_TYPES[etype], "cell": (r + 1, c + 1)}
+        if etype in (_ASSIGN, _UNASSIGN):
+            step["value"] = v
+        step["depth"] = depth
+        step["reason"] = REASONS[reason] if reason < len(REASONS) else "other"
+        yield step
+
+
+def summarize(path: str | Path) -> Dict[str, Any]:
+    """Counts per event type, total events and max depth of a binary trace."""
+    counts = [0] * len(EVENT_TYPES)
+    max_depth = 0
+    for index, (etype, _reason, _r, _c, _v, depth) in enumerate(iter_records(path)):
+        if etype >= len(EVENT_TYPES):
+            raise _bad_type(index, etype)
+        counts[etype] += 1
+        if depth > max_depth:
+            max_depth = depth
+    return {
+        "events": sum(counts),
+        "max_depth": max_depth,
+        "counts": dict(zip(COUNT_KEYS, counts)),
+    }
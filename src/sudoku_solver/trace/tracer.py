@@ -2,19 +2,50 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 
 class Tracer:
-    def __init__(self, enabled: bool = False, mode: str = "steps"):
+    def __init__(
+        self,
+        enabled: bool = False,
+        mode: str = "steps",
+        tail: Optional[int] = None,
+        sample: Optional[int] = None,
+        depth_max: Optional[int] = None,
+    ):
         """Tracer supports two modes when enabled:
 
         - "steps": record every step into steps list
         - "summary": only keep aggregated counts
+
+        In "steps" mode memory can be bounded:
+
+        - `tail`: keep only the last N steps (fixed-capacity ring buffer)
+        - `sample`: keep every K-th event (deterministic, by event index)
+        - `depth_max`: keep only events at depth <= D (shallow decisions)
+
+        Events not kept are counted in `dropped`; counts stay exact.
+        `tail` and `sample` must be >= 1 (``sample=1`` keeps every event);
+        `depth_max` must be >= 0.
         """
+        if tail is not None and tail < 1:
+            raise ValueError(f"tail 必须 >= 1，实际为 {tail}")
+        if sample is not None and sample < 1:
+            raise ValueError(f"sample 必须 >= 1，实际为 {sample}")
+        if depth_max is not None and depth_max < 0:
+            raise ValueError(f"depth_max 必须 >= 0，实际为 {depth_max}")
         self.enabled = enabled
         self.mode = mode if enabled else "disabled"
-        self.steps: List[Dict[str, Any]] = []
+        self.tail = tail
+        self.sample = sample if sample is not None and sample > 1 else None
+        self.depth_max = depth_max
+        self.bounded = tail is not None or self.sample is not None or depth_max is not None
+        self.steps: List[Dict[str, Any]] | Deque[Dict[str, Any]] = deque(maxlen=tail) if tail is not None else []
+        self.dropped = 0
+        self._seen = 0
+        self._record = enabled and self.mode == "steps"
         self.counts: Dict[str, int] = {  # summary counters
             "choose_cell": 0,
             "assign": 0,
@@ -23,11 +54,25 @@ class Tracer:
             "solution_found": 0,
         }
 
+    def _keep(self, depth: int) -> bool:
+        """Decide before building the event dict whether it will be stored."""
+        if not self._record:
+            return False
+        if not self.bounded:
+            return True
+        self._seen += 1
+        if self.depth_max is not None and depth > self.depth_max:
+            self.dropped += 1
+            return False
+        if self.sample is not None and (self._seen - 1) % self.sample:
+            self.dropped += 1
+            return False
+        return True
+
     def _add(self, event: Dict[str, Any]) -> None:
-        if not self.enabled:
-            return
-        if self.mode == "steps":
-            self.steps.append(event)
+        if self.tail is not None and len(self.steps) == self.tail:
+            self.dropped += 1  # oldest step falls out of the ring buffer
+        self.steps.append(event)
 
     @staticmethod
     def _cell_1b(r: int, c: int) -> Tuple[int, int]:
@@ -35,61 +80,71 @@ class Tracer:
 
     def choose_cell(self, r: int, c: int, depth: int) -> None:
         self.counts["choose_cell"] += 1
-        self._add({"type": "CHOOSE_CELL", "cell": self._cell_1b(r, c), "depth": depth, "reason": "first_empty"})
+        if self._keep(depth):
+            self._add({"type": "CHOOSE_CELL", "cell": self._cell_1b(r, c), "depth": depth, "reason": "first_empty"})
 
     def assign(self, r: int, c: int, v: int, depth: int) -> None:
         self.counts["assign"] += 1
-        self._add({"type": "ASSIGN", "cell": self._cell_1b(r, c), "value": v, "depth": depth, "reason": "try_value"})
+        if self._keep(depth):
+            self._add({"type": "ASSIGN", "cell": self._cell_1b(r, c), "value": v, "depth": depth, "reason": "try_value"})
 
     def unassign(self, r: int, c: int, v: int, depth: int) -> None:
         self.counts["unassign"] += 1
-        self._add({"type": "UNASSIGN", "cell": self._cell_1b(r, c), "value": v, "depth": depth, "reason": "backtrack"})
+        if self._keep(depth):
+            self._add({"type": "UNASSIGN", "cell": self._cell_1b(r, c), "value": v, "depth": depth, "reason": "backtrack"})
 
     def contradiction(self, r: int, c: int, depth: int, reason: str = "conflict") -> None:
         self.counts["contradiction"] += 1
-        self._add({"type": "CONTRADICTION", "cell": self._cell_1b(r, c), "depth": depth, "reason": reason})
+        if self._keep(depth):
+            self._add({"type": "CONTRADICTION", "cell": self._cell_1b(r, c), "depth": depth, "reason": reason})
 
     def solution_found(self) -> None:
         self.counts["solution_found"] += 1
-        self._add({"type": "SOLUTION_FOUND"})
+        if self._keep(0):
+            self._add({"type": "SOLUTION_FOUND"})
 
     def to_json_obj(self) -> Dict[str, Any]:
         if not self.enabled:
             return {"enabled": False, "steps": []}
         if self.mode == "summary":
             return {"enabled": True, "mode": "summary", "counts": dict(self.counts)}
-        return {"enabled": True, "mode": "steps", "steps": list(self.steps)}
+        obj: Dict[str, Any] = {"enabled": True, "mode": "steps", "steps": list(self.steps)}
+        if self.bounded:
+            obj["dropped"] = self.dropped
+            obj["limits"] = {"tail": self.tail, "sample": self.sample, "depth_max": self.depth_max}
+            obj["counts"] = dict(self.counts)
+        return obj
 
 
 class TraceSink:
-    """Adapter sink that maps Recorder events to a Tracer instance."""
+    """Adapter sink that maps Recorder events to a Tracer instance.
+
+    Only attach it when tracing is enabled; a disabled Tracer records nothing.
+    """
 
     def __init__(self, tracer: Tracer) -> None:
         self._t = tracer
 
+    def to_json_obj(self) -> Dict[str, Any]:
+        return self._t.to_json_obj()
+
     # decision
     def decision_choose_cell(self, r: int, c: int, depth: int) -> None:
         self._t.choose_cell(r, c, depth)
 
-    def decision_guess_point(self, depth: int) -> None:  # noqa: ARG002
-        # Not a dedicated tracer event; represented implicitly by choose_cell
-        pass
+    # decision_guess_point: not a dedicated tracer event; represented implicitly by choose_cell
 
     # attempt
     def attempt_assign(self, r: int, c: int, v: int, source: str, depth: int) -> None:  # noqa: ARG002
         self._t.assign(r, c, v, depth=depth)
 
-    def attempt_contradiction(self, r: int, c: int, v: int | None, reason: str, depth: int | None) -> None:  # noqa: ARG002
+    def attempt_contradiction(self, r: int, c: int, v: int | None = None, reason: str = "invalid_candidate", depth: int | None = None) -> None:  # noqa: ARG002
         self._t.contradiction(r, c, depth=depth or 0, reason=reason)
 
     # state
-    def state_unassign(self, r: int, c: int, v: int, reason: str, depth: int | None) -> None:  # noqa: ARG002
+    def state_unassign(self, r: int, c: int, v: int, reason: str = "backtrack", depth: int | None = None) -> None:  # noqa: ARG002
         self._t.unassign(r, c, v, depth=depth or 0)
 
-    # search
-    def search_update_depth(self, depth: int) -> None:  # noqa: ARG002
-        pass
-
     # result
     def result_solution_found(self) -> None:
         self._t.solution_found()
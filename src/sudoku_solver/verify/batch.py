@@ -0,0 +1,209 @@
+"""Streaming verification of puzzle/solution pairs (``verify-batch``).
+
+Pairs are read lazily from either
+
+- the line format (`io.line_io`): ``puzzle,solution`` per line, 81
+  characters each (e.g. ``generate --with-solution``); the ID is the
+  line number;
+- JSONL: one object per line with ``grid`` (the puzzle) and ``solution``
+  (NxN arrays of any supported size), and an optional ``id`` (default: the
+  line number). Records without a
+  ``grid`` (e.g. ``solve-batch`` output) take the puzzle from
+  ``<puzzles_dir>/<id>``; records whose ``solution`` is null (unsat,
+  timeout) are skipped;
+- packed binary files (`io.packed_io`) written with solutions; the ID is
+  the record number. Records of files without solutions are skipped.
+
+Pairs are verified in chunks: with NumPy through `verify.vectorized`
+(one array per board size in the chunk), otherwise one `verify_packed`
+call each. Failures are written as JSON lines
+``{"id", "reason"}`` with ``reason`` one of ``size`` (puzzle and solution
+sizes differ), ``invalid`` (not a valid full grid), ``givens`` (a given is
+overwritten) or the parse error.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sudoku_solver.board.geometry import SIZES
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.io.line_io import LINE_WIDTH, parse_line
+from sudoku_solver.io.packed_io import MAGIC as PACKED_MAGIC, iter_records
+from sudoku_solver.verify import vectorized
+from sudoku_solver.verify.verify import verify_packed
+
+CHUNK = 4096
+
+# (id, puzzle, solution, error): packed forms (size² bytes), or `error` set and both None
+Pair = Tuple[str, Optional[bytes], Optional[bytes], Optional[str]]
+
+_SKIP = "skip"  # error marker of records without a solution
+
+
+def _pack(grid: Any, name: str) -> bytes:
+    n = len(grid) if isinstance(grid, list) else 0
+    if n not in SIZES or not all(isinstance(r, list) and len(r) == n for r in grid):
+        raise ValueError(f"{name} 必须为 NxN 数组（N 为 {'/'.join(map(str, SIZES))}）")
+    if not all(type(v) is int and 0 <= v <= n for row in grid for v in row):
+        raise ValueError(f"{name} 元素必须为 0..{n} 的整数")
+    return bytes(v for row in grid for v in row)
+
+
+def _iter_line_pairs(path: Path) -> Iterator[Pair]:
+    with open(path, "rb") as fh:
+        for line_no, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line or line[0] == 35:  # '#'
+                continue
+            try:
+                puzzle = parse_line(line[:LINE_WIDTH], line_no)
+                rest = line[LINE_WIDTH:].lstrip(b", \t")
+                if not rest:
+                    raise ValueError(f"第 {line_no} 行：缺少 solution 列")
+                yield str(line_no), puzzle, parse_line(rest, line_no), None
+            except ValueError as e:
+                yield str(line_no), None, None, str(e)
+
+
+def _iter_jsonl_pairs(path: Path, puzzles_dir: Optional[Path]) -> Iterator[Pair]:
+    with open(path, "r", encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            rid = str(line_no)
+            try:
+                rec = json.loads(line)
+                if not isinstance(rec, dict):
+                    raise ValueError("记录必须为 JSON 对象")
+                rid = str(rec.get("id", line_no))
+                if rec.get("solution") is None:
+                    yield rid, None, None, _SKIP
+                    continue
+                if "grid" in rec:
+                    puzzle = _pack(rec["grid"], "grid")
+                elif puzzles_dir is not None:
+                    puzzle = load_puzzle(puzzles_dir / rid).digits()
+                else:
+                    raise ValueError("记录缺少 grid 字段（可用 --puzzles 指定谜题目录）")
+                yield rid, puzzle, _pack(rec["solution"], "solution"), None
+            except ValueError as e:
+                yield rid, None, None, str(e)
+
+
+def _iter_packed_pairs(path: Path) -> Iterator[Pair]:
+    index = 0
+    try:
+        for index, puzzle, solution in iter_records(path):
+            yield (str(index), puzzle, solution, None) if solution is not None else (str(index), None, None, _SKIP)
+    except ValueError as e:
+        # Bad header or truncated tail: reported once, the rest is unreadable
+        yield str(index + 1), None, None, str(e)
+
+
+def iter_pairs(path: str | Path, fmt: str = "auto", puzzles_dir: str | Path | None = None) -> Iterator[Pair]:
+    """Yield ``(id, puzzle, solution, error)`` for every record of `path`, lazily.
+
+    `fmt` is ``line``, ``jsonl``, ``packed`` or ``auto`` (packed-file magic,
+    else by suffix, else by the first non-blank byte).
+    """
+    path = Path(path)
+    if fmt == "auto":
+        with open(path, "rb") as fh:
+            head = fh.read(4096)
+        if head[: len(PACKED_MAGIC)] == PACKED_MAGIC:
+            fmt = "packed"
+        elif path.suffix in (".jsonl", ".json"):
+            fmt = "jsonl"
+        else:
+            fmt = "jsonl" if head.lstrip()[:1] == b"{" else "line"
+    if fmt == "packed":
+        return _iter_packed_pairs(path)
+    if fmt == "jsonl":
+        return _iter_jsonl_pairs(path, Path(puzzles_dir) if puzzles_dir is not None else None)
+    return _iter_line_pairs(path)
+
+
+def _reason(puzzle: bytes, solution: bytes) -> str:
+    if len(puzzle) != len(solution):
+        return "size"
+    return "givens" if verify_packed(bytes(len(solution)), solution) else "invalid"
+
+
+def verify_chunk(pairs: List[Pair], use_numpy: bool) -> List[bool]:
+    """Validity of each (well-formed) pair of `pairs`."""
+    if not use_numpy:
+        return [verify_packed(p[1], p[2]) for p in pairs]
+    # One array per board size; a puzzle/solution size mismatch is invalid
+    np = vectorized.np
+    flags = [False] * len(pairs)
+    groups: Dict[int, List[int]] = {}
+    for k, p in enumerate(pairs):
+        if len(p[1]) == len(p[2]):  # type: ignore[arg-type]
+            groups.setdefault(len(p[2]), []).append(k)  # type: ignore[arg-type]
+    for cells, idx in groups.items():
+        puzzles = np.frombuffer(b"".join(pairs[k][1] for k in idx), dtype=np.uint8).reshape(-1, cells)  # type: ignore[misc]
+        solutions = np.frombuffer(b"".join(pairs[k][2] for k in idx), dtype=np.uint8).reshape(-1, cells)  # type: ignore[misc]
+        for k, ok in zip(idx, vectorized.verify_batch(puzzles, solutions).tolist()):
+            flags[k] = ok
+    return flags
+
+
+@dataclass
+class VerifySummary:
+    pairs: int = 0
+    ok: int = 0
+    failed: int = 0
+    skipped: int = 0
+    engine: str = "scalar"
+    wall_s: float = 0.0
+    pairs_per_sec: float = 0.0
+
+
+def run_verify_batch(pairs: Iterator[Pair], out: TextIO, *, chunk: int = CHUNK, use_numpy: Optional[bool] = None) -> VerifySummary:
+    """Verify `pairs`, write one JSON line per failure to `out` and return a summary.
+
+    `use_numpy` defaults to whether NumPy is installed.
+    """
+    if use_numpy is None:
+        use_numpy = vectorized.available()
+    summary = VerifySummary(engine="numpy" if use_numpy else "scalar")
+    chunk = max(1, chunk)
+
+    def _fail(rid: str, reason: str) -> None:
+        summary.failed += 1
+        out.write(json.dumps({"id": rid, "reason": reason}, ensure_ascii=False) + "\n")
+
+    def _flush(buf: List[Pair]) -> None:
+        # Failures keep input order: parse errors are reported in place
+        good = [p for p in buf if p[3] is None]
+        flags = iter(verify_chunk(good, use_numpy) if good else [])
+        for pair in buf:
+            if pair[3] is not None:
+                _fail(pair[0], pair[3])
+            elif next(flags):
+                summary.ok += 1
+            else:
+                _fail(pair[0], _reason(pair[1], pair[2]))  # type: ignore[arg-type]
+        buf.clear()
+
+    t0 = time.perf_counter()
+    buf: List[Pair] = []
+    for pair in pairs:
+        if pair[3] == _SKIP:
+            summary.skipped += 1
+            continue
+        summary.pairs += 1
+        buf.append(pair)
+        if len(buf) >= chunk:
+            _flush(buf)
+    if buf:
+        _flush(buf)
+    out.flush()
+    summary.wall_s = round(time.perf_counter() - t0, 6)
+    summary.pairs_per_sec = round(summary.pairs / summary.wall_s, 2) if summary.wall_s > 0 else 0.0
+    return summary
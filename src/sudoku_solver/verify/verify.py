@@ -1,36 +1,65 @@
-"""Verify a solved grid meets Sudoku constraints and respects givens."""
+"""Verify a solved grid meets Sudoku constraints and respects givens.
+
+Checks are a single pass over the cells accumulating per-row, per-column
+and per-box digit bitmasks: a valid solution places every digit ``1..n``
+exactly once per unit, so a digit bit already set in one of the cell's
+three masks is a duplicate. Any supported board side (`board.geometry`)
+is accepted. `verify_packed` does the same on the packed form of
+`io.line_io` (size² raw values); `verify.vectorized` checks whole arrays
+of solutions with NumPy.
+"""
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, List, Optional
 
+from sudoku_solver.board.geometry import SIZES, geometry
 from sudoku_solver.board.grid import Grid
 
+_SIZE_OF_CELLS = {n * n: n for n in SIZES}
+
 
-def _valid_full_solution(grid: List[List[int]]) -> bool:
-    # Check rows
-    for r in range(9):
+def _valid_full_solution(grid: List[List[int]], givens: Optional[bytes | bytearray] = None) -> bool:
+    """`givens`: the puzzle's flat row-major values (`Grid.data`), if any."""
+    if not isinstance(grid, (list, tuple)) or len(grid) not in SIZES:
+        return False
+    n = len(grid)
+    if givens is None:
+        givens = bytes(n * n)
+    elif len(givens) != n * n:
+        return False
+    box_of = geometry(n).box_of
+    cols = [0] * n
+    boxes = [0] * n
+    for r in range(n):
         row = grid[r]
-        if sorted(row) != list(range(1, 10)):
+        if not isinstance(row, (list, tuple)) or len(row) != n:
             return False
-    # Check columns
-    for c in range(9):
-        col = [grid[r][c] for r in range(9)]
-        if sorted(col) != list(range(1, 10)):
-            return False
-    # Check boxes
-    for br in range(0, 9, 3):
-        for bc in range(0, 9, 3):
-            box = [grid[r][c] for r in range(br, br + 3) for c in range(bc, bc + 3)]
-            if sorted(box) != list(range(1, 10)):
+        box_row = box_of[r]
+        base = r * n
+        m = 0
+        for c in range(n):
+            v = row[c]
+            if type(v) is not int or not 1 <= v <= n:
+                return False
+            g = givens[base + c]
+            if g and g != v:
+                return False
+            bit = 1 << v
+            b = box_row[c]
+            if (m | cols[c] | boxes[b]) & bit:
                 return False
+            m |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
     return True
 
 
 def verify_solution_respects_givens(puzzle: Grid, solution: List[List[int]]) -> bool:
-    for r in range(9):
-        for c in range(9):
-            given = puzzle.cells[r][c]
+    n = puzzle.size
+    for r in range(n):
+        for c in range(n):
+            given = puzzle.data[r * n + c]
             if given != 0 and solution[r][c] != given:
                 return False
     return True
@@ -38,7 +67,34 @@ def verify_solution_respects_givens(puzzle: Grid, solution: List[List[int]]) ->
 
 def verify(puzzle: Grid, solution: List[List[int]]) -> bool:
     """Return True if `solution` is a valid Sudoku solution for `puzzle`."""
-    if not _valid_full_solution(solution):
-        return False
-    return verify_solution_respects_givens(puzzle, solution)
+    return _valid_full_solution(solution, puzzle.data)
+
 
+def verify_packed(puzzle: Any, solution: Any) -> bool:
+    """`verify` on packed forms: size² row-major raw values each (bytes or a sequence)."""
+    cells = len(solution)
+    if len(puzzle) != cells or cells not in _SIZE_OF_CELLS:
+        return False
+    n = _SIZE_OF_CELLS[cells]
+    cell_box = geometry(n).cell_box
+    cols = [0] * n
+    boxes = [0] * n
+    m = 0
+    for i in range(cells):
+        v = solution[i]
+        if type(v) is not int or not 1 <= v <= n:
+            return False
+        g = puzzle[i]
+        if g and g != v:
+            return False
+        c = i % n
+        if c == 0:
+            m = 0
+        bit = 1 << v
+        b = cell_box[i]
+        if (m | cols[c] | boxes[b]) & bit:
+            return False
+        m |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+    return True
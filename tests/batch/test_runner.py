@@ -0,0 +1,80 @@
+import io
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.batch.runner import collect_puzzle_paths, drop_partial_tail, iter_results, read_done_ids, run_batch
+from sudoku_solver.solver import SOLVERS
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _corpus(tmp_path: Path) -> Path:
+    d = tmp_path / "corpus"
+    d.mkdir()
+    for name in ("001.json", "002.json", "template.json"):
+        shutil.copy(ROOT / "data" / name, d / name)
+    (d / "bad.json").write_text('{"grid": 1}')
+    return d
+
+
+def test_run_batch_streams_one_line_per_puzzle(tmp_path):
+    paths = collect_puzzle_paths(str(_corpus(tmp_path)))
+    out = io.StringIO()
+    summary = run_batch(paths, out, method="cp", jobs=2, chunksize=1, ordered=True)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["id"] for r in records] == [p.name for p in paths]
+    assert summary.puzzles == 4
+    assert summary.status_counts == {"unique": 2, "multiple": 1, "error": 1}
+    assert all(r["verify_ok"] for r in records if r["status"] != "error")
+
+
+def test_resume_skips_done_ids(tmp_path):
+    corpus = _corpus(tmp_path)
+    out_path = tmp_path / "out.jsonl"
+    out_path.write_text(json.dumps({"id": "001.json", "status": "unique"}) + "\n" + '{"id": "002.js')
+    drop_partial_tail(out_path)
+    done = read_done_ids(out_path)
+    assert done == {"001.json"}
+    with out_path.open("a") as fh:
+        summary = run_batch(collect_puzzle_paths(str(corpus / "*.json")), fh, method="dlx", skip_ids=done)
+    assert summary.skipped == 1
+    ids = [json.loads(line)["id"] for line in out_path.read_text().splitlines()]
+    assert sorted(ids) == ["001.json", "002.json", "bad.json", "template.json"]
+
+
+def test_solver_crash_becomes_an_error_record(tmp_path, monkeypatch):
+    def crash(puzzle, **kwargs):
+        raise RecursionError("maximum recursion depth exceeded")
+
+    monkeypatch.setitem(SOLVERS, "cp", crash)
+    paths = collect_puzzle_paths(str(_corpus(tmp_path)))
+    out = io.StringIO()
+    summary = run_batch(paths, out, method="cp", jobs=1, ordered=True)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert summary.status_counts == {"error": 4}
+    assert records[0]["error"] == "RecursionError: maximum recursion depth exceeded"
+
+
+def test_vec_method_solves_chunks_as_numpy_batches(tmp_path):
+    pytest.importorskip("numpy")
+    corpus = _corpus(tmp_path)
+    shutil.copy(ROOT / "examples/puzzle_16x16.json", corpus / "big.json")
+    paths = collect_puzzle_paths(str(corpus))
+    expected = {}
+    for rec in iter_results(paths, method="cp", jobs=1):
+        expected[rec["id"]] = rec["status"]
+    for jobs in (1, 2):
+        out = io.StringIO()
+        summary = run_batch(paths, out, method="vec", jobs=jobs, chunksize=3, ordered=True)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["id"] for r in records] == [p.name for p in paths]
+        assert summary.status_counts == {"unique": 2, "multiple": 1, "error": 2}
+        for r in records:
+            if r["id"] == "big.json":
+                assert r["status"] == "error" and "9x9" in r["error"]
+            elif r["status"] != "error":
+                assert r["status"] == expected[r["id"]] and r["verify_ok"]
+                assert r["metrics"]["timing"]["search_ns"] > 0
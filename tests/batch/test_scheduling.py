@@ -0,0 +1,60 @@
+import io
+import json
+import shutil
+from pathlib import Path
+
+from sudoku_solver.batch.runner import collect_puzzle_paths, iter_results, run_batch
+from sudoku_solver.batch.scheduling import calibrate, features, plan_chunks, predict_costs, predict_ms
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_features_and_prediction():
+    easy = load_puzzle(ROOT / "data" / "001.json")
+    hard = load_puzzle(ROOT / "data" / "002.json")
+    f = features(easy)
+    assert f.givens == sum(1 for v in easy.data if v)
+    assert f.bivalue <= 81 - f.givens and f.probe_open <= 81 - f.givens
+    assert f.probe_candidates <= f.candidates and not f.probe_contradiction
+    for method in ("bt", "cp", "dlx", "bits"):
+        assert predict_ms(features(hard), method) > predict_ms(f, method)
+    cells = [[0] * 9 for _ in range(9)]
+    cells[0][:8] = range(1, 9)
+    cells[1][8] = 9  # (0, 8) has no candidate left
+    assert features(Grid(cells)).probe_contradiction
+
+
+def test_plan_chunks_longest_first_and_guided():
+    costs = [1.0] * 40 + [100.0, 50.0] + [0.5] * 40
+    chunks = plan_chunks(costs, jobs=2, max_chunk=8)
+    assert sorted(i for c in chunks for i in c) == list(range(len(costs)))
+    assert chunks[0] == [40] and chunks[1] == [41]
+    assert max(len(c) for c in chunks) == 8 and len(chunks[-1]) < 8
+
+
+def test_calibrate_with_history():
+    paths = [f"{i}.json" for i in range(10)]
+    predicted = [1.0] * 10
+    history = {f"{i}.json": 4.0 for i in range(8)}
+    assert calibrate(paths, predicted, history) == [4.0] * 10
+    assert calibrate(paths, predicted, {"0.json": 9.0}) == [9.0] + [1.0] * 9
+
+
+def test_cost_schedule_keeps_records_and_order(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for name in ("001.json", "002.json", "template.json"):
+        shutil.copy(ROOT / "data" / name, corpus / name)
+    (corpus / "bad.json").write_text('{"grid": 1}')
+    paths = collect_puzzle_paths(str(corpus))
+    assert predict_costs(paths, "cp")[paths.index(corpus / "bad.json")] == 0.0
+    fifo = list(iter_results(paths, method="cp", jobs=2, chunksize=1, ordered=True))
+    cost = list(iter_results(paths, method="cp", jobs=2, chunksize=1, ordered=True, schedule="cost"))
+    assert [r["id"] for r in cost] == [p.name for p in paths]
+    assert [(r["status"], r.get("solution")) for r in cost] == [(r["status"], r.get("solution")) for r in fifo]
+    out = io.StringIO()
+    summary = run_batch(paths, out, method="dlx", jobs=2, schedule="cost", history={"002.json": 50.0})
+    assert summary.puzzles == 4 and len(out.getvalue().splitlines()) == 4
+    assert {json.loads(line)["id"] for line in out.getvalue().splitlines()} == {p.name for p in paths}
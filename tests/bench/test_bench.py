@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.bench.runner import compare_runs, load_corpus, percentile, run_bench
+from sudoku_solver.cli import main
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 95) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_bench_reports_latency_and_rate():
+    corpus, errors = load_corpus(str(ROOT / "data" / "001.json"))
+    assert not errors and len(corpus) == 1
+    run = run_bench(corpus, ["cp"], warmup=0, repeat=2)
+    cp = run["methods"]["cp"]
+    assert cp["solves"] == 2 and cp["verify_failures"] == 0
+    assert cp["p50_us"] <= cp["p95_us"] <= cp["max_us"]
+    assert cp["puzzles_per_sec"] > 0
+
+
+def test_run_bench_vec_matches_cp_statuses():
+    pytest.importorskip("numpy")
+    corpus, _ = load_corpus(str(ROOT / "data"))
+    run = run_bench(corpus, ["cp", "vec"], warmup=0, repeat=1)
+    vec = run["methods"]["vec"]
+    assert vec["status_counts"] == run["methods"]["cp"]["status_counts"]
+    assert vec["solves"] == len(corpus) and vec["verify_failures"] == 0
+
+
+def test_compare_runs_flags_regressions_only_beyond_threshold():
+    base = {"methods": {"cp": {"puzzles_per_sec": 100.0, "p95_us": 1000.0}}}
+    cur = {"methods": {"cp": {"puzzles_per_sec": 95.0, "p95_us": 1300.0}}}
+    by_metric = {c["metric"]: c for c in compare_runs(cur, base, threshold_pct=10)}
+    assert by_metric["puzzles_per_sec"]["change_pct"] == 5.0 and not by_metric["puzzles_per_sec"]["regression"]
+    assert by_metric["p95_us"]["regression"]
+
+
+def test_bench_cli_exits_non_zero_on_regression(tmp_path, capsys):
+    runs = tmp_path / "runs"
+    runs.mkdir()
+    impossible = {"methods": {"cp": {"puzzles_per_sec": 1e12, "p95_us": 1e-6}}}
+    (runs / "fast.json").write_text(json.dumps(impossible))
+    puzzle = str(ROOT / "data" / "001.json")
+    assert main(["bench", puzzle, "--repeat", "1", "--baseline", "fast", "--runs-dir", str(runs)]) == 1
+    assert main(["bench", puzzle, "--repeat", "1", "--name", "now", "--runs-dir", str(runs)]) == 0
+    assert (runs / "now.json").exists()
+    capsys.readouterr()
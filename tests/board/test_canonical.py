@@ -0,0 +1,35 @@
+import random
+from pathlib import Path
+
+from sudoku_solver.board.canonical import Transform, apply_transform, canonicalize, invert_transform
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _random_transform(rng: random.Random) -> Transform:
+    bands = rng.sample(range(3), 3)
+    stacks = rng.sample(range(3), 3)
+    rows = tuple(b * 3 + i for b in bands for i in rng.sample(range(3), 3))
+    cols = tuple(s * 3 + i for s in stacks for i in rng.sample(range(3), 3))
+    digits = list(range(1, 10))
+    rng.shuffle(digits)
+    return Transform(rng.random() < 0.5, rows, cols, tuple([0] + digits))
+
+
+def test_equivalent_puzzles_share_canonical_form():
+    rng = random.Random(7)
+    for name in ("001.json", "002.json"):
+        grid = load_puzzle(ROOT / "data" / name)
+        key, transform = canonicalize(grid)
+        assert "".join(str(v) for row in apply_transform(grid.cells, transform) for v in row) == key
+        for _ in range(5):
+            twin = Grid(apply_transform(grid.cells, _random_transform(rng)))
+            assert canonicalize(twin)[0] == key
+
+
+def test_invert_transform_round_trips():
+    grid = load_puzzle(ROOT / "data" / "002.json")
+    t = _random_transform(random.Random(3))
+    assert invert_transform(apply_transform(grid.cells, t), t) == grid.to_lists()
@@ -0,0 +1,43 @@
+import pytest
+
+from sudoku_solver.board.geometry import SIZES, geometry, size_of_cells
+from sudoku_solver.board.grid import BOX_OF, Grid
+from sudoku_solver.io.json_io import parse_puzzle
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_tables_are_consistent(size):
+    geo = geometry(size)
+    assert geo.box * geo.box == size and geo.cells == size * size
+    assert len(geo.units) == 3 * size and all(len(u) == size for u in geo.units)
+    for i in range(geo.cells):
+        assert all(i in geo.units[u] for u in geo.units_of[i])
+        assert len(geo.peers[i]) == 3 * (size - 1) - 2 * (geo.box - 1)
+    assert geo.all_digits == sum(1 << v for v in range(1, size + 1))
+
+
+def test_9x9_matches_grid_constants():
+    assert geometry(9).box_of == BOX_OF
+    assert size_of_cells(81) == 9
+
+
+def test_unsupported_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        geometry(10)
+    with pytest.raises(ValueError):
+        size_of_cells(100)
+    with pytest.raises(ValueError):
+        parse_puzzle({"grid": [[0] * 10 for _ in range(10)]})
+    with pytest.raises(ValueError):
+        parse_puzzle({"grid": [[17] + [0] * 15 for _ in range(16)]})
+
+
+def test_16x16_grid_masks():
+    g = parse_puzzle({"grid": [[0] * 16 for _ in range(16)]})
+    assert g.size == 16 and g.empty_count() == 256
+    g.set_cell(5, 6, 16)
+    assert not g.is_valid_placement(5, 15, 16)  # row
+    assert not g.is_valid_placement(15, 6, 16)  # column
+    assert not g.is_valid_placement(7, 4, 16)  # box (rows 4..7, columns 4..7)
+    assert g.is_valid_placement(8, 8, 16)
+    assert Grid([row[:] for row in g.cells]).box_masks == g.box_masks
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from sudoku_solver.board.grid import Grid, mask_values
+
+
+def _naive_valid(cells, r, c, v):
+    if any(cells[r][cc] == v for cc in range(9)):
+        return False
+    if any(cells[rr][c] == v for rr in range(9)):
+        return False
+    br, bc = (r // 3) * 3, (c // 3) * 3
+    return all(cells[rr][cc] != v for rr in range(br, br + 3) for cc in range(bc, bc + 3))
+
+
+def test_masks_track_set_and_clear():
+    rng = random.Random(7)
+    g = Grid([[0] * 9 for _ in range(9)])
+    for _ in range(400):
+        r, c = rng.randrange(9), rng.randrange(9)
+        if g.cells[r][c]:
+            g.clear_cell(r, c)
+            continue
+        cand = g.candidate_values(r, c)
+        if cand:
+            g.set_cell(r, c, rng.choice(cand))
+        for v in range(1, 10):
+            assert g.is_valid_placement(r, c, v) == _naive_valid(g.cells, r, c, v) or g.cells[r][c]
+    fresh = Grid([row[:] for row in g.cells])
+    assert fresh.row_masks == g.row_masks
+    assert fresh.col_masks == g.col_masks
+    assert fresh.box_masks == g.box_masks
+    assert fresh.empty_mask == g.empty_mask
+
+
+def test_first_empty_is_row_major():
+    cells = [[0] * 9 for _ in range(9)]
+    g = Grid(cells)
+    assert g.first_empty() == (0, 0)
+    g.set_cell(0, 0, 5)
+    assert g.first_empty() == (0, 1)
+    assert g.candidates(0, 1) & (1 << 5) == 0
+    assert 5 not in mask_values(g.candidates(1, 1))
+    g.clear_cell(0, 0)
+    assert g.first_empty() == (0, 0)
+    assert g.empty_count() == 81
+
+
+def test_givens_conflict():
+    cells = [[0] * 9 for _ in range(9)]
+    cells[0][0] = 3
+    cells[2][2] = 3
+    assert Grid(cells).givens_conflict()
+    cells[2][2] = 4
+    assert not Grid(cells).givens_conflict()
+
+
+def test_clone_is_independent():
+    g = Grid([[0] * 9 for _ in range(9)])
+    h = g.clone()
+    h.set_cell(4, 4, 9)
+    assert g.cells[4][4] == 0
+    assert g.is_valid_placement(4, 4, 9)
+    assert not h.is_valid_placement(4, 5, 9)
+
+
+def test_flat_storage_hash_and_pickle():
+    import pickle
+
+    cells = [[0] * 9 for _ in range(9)]
+    cells[3][5] = 7
+    g = Grid(cells)
+    assert len(g.data) == 81 and g.data[3 * 9 + 5] == 7
+    with pytest.raises(TypeError):
+        g.cells[0][0] = 9  # read-only view: stale writes fail loudly
+    rows = g.to_lists()
+    rows[0][0] = 9
+    assert g.value(0, 0) == 0 and rows[3][5] == 7  # to_lists is a copy
+    h = pickle.loads(pickle.dumps(g))
+    assert h == g and hash(h) == hash(g) and h.row_masks == g.row_masks
+    assert Grid.from_digits(g.digits()) == g
+    h.set_cell(0, 0, 1)
+    assert h != g and len({g, h, g.clone()}) == 2
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+
+import pytest
+
+from sudoku_solver.cli import main
+from sudoku_solver.db.report import case_history, compare_methods, open_db, render, window_summary
+from sudoku_solver.db.sqlite_writer import SQLiteResultWriter
+from sudoku_solver.db.writer import build_row_from_outputs
+
+
+def _row(case, method, status, time_ms, hour, assignments=10):
+    return build_row_from_outputs(
+        test_case_id=case,
+        method=method,
+        status=status,
+        metrics={"solutions_found": 1, "assignments": assignments, "backtracks": 2, "max_depth": 5},
+        time_ms=time_ms,
+        created_at=f"2024-01-0{1 + hour // 24}T{hour % 24:02d}:30:00Z",
+    )
+
+
+def _rows():
+    rows = []
+    for h in range(30):
+        rows.append(_row(f"{h % 3}.json", "bt", "unique" if h % 5 else "timeout", 40 + h, h, assignments=100))
+        rows.append(_row(f"{h % 3}.json", "cp", "unique", 10, h))
+    return rows
+
+
+def _rollups(path):
+    with sqlite3.connect(path) as con:
+        return (
+            sorted(con.execute("SELECT * FROM results_rollup")),
+            sorted(con.execute("SELECT * FROM results_rollup_hourly")),
+        )
+
+
+def test_rollups_match_raw_rows_and_backfill(tmp_path):
+    db = tmp_path / "r.sqlite3"
+    with SQLiteResultWriter(db, batch_size=7) as w:
+        w.ensure_schema()
+        w.write_many(_rows())
+    incremental = _rollups(db)
+    with sqlite3.connect(db) as con:
+        con.execute("DROP TABLE results_rollup")
+    with SQLiteResultWriter(db) as w:
+        w.ensure_schema()  # rebuilt from results
+    assert _rollups(db) == incremental
+    assert len(incremental[1]) == 30 * 2  # one (hour, method, status) key per row here
+    assert sum(r[2] for r in incremental[0]) == 60
+
+
+def test_reports(tmp_path):
+    db = tmp_path / "r.sqlite3"
+    with SQLiteResultWriter(db, background=True, batch_size=16) as w:
+        w.ensure_schema()
+        w.write_many(_rows())
+    con = open_db(db)
+    methods = {r["method"]: r for r in compare_methods(con, baseline="cp")}
+    assert methods["bt"]["runs"] == 30 and methods["bt"]["timeout"] == 6 and methods["bt"]["unique"] == 24
+    assert methods["bt"]["mean_time_ms"] == 40 + 14.5 and methods["bt"]["max_time_ms"] == 69
+    assert methods["cp"]["speedup"] == 1.0 and methods["bt"]["speedup"] == round(10 / 54.5, 3)
+    history = case_history(con, "1.json", method="cp", limit=3)
+    assert [r["created_at"] for r in history] == ["2024-01-02T04:30:00Z", "2024-01-02T01:30:00Z", "2024-01-01T22:30:00Z"]
+    days = window_summary(con, since="2024-01-01T12", until="2024-01-02", by="day", method="bt")
+    assert days == [{"period": "2024-01-01", "method": "bt", "runs": 12, "timeouts": 2, "mean_time_ms": 57.5, "max_time_ms": 63, "mean_assignments": 100.0, "mean_backtracks": 2.0}]
+    con.close()
+    assert render([], "table") == "（无结果）"
+    assert render(history, "csv").splitlines()[0].startswith("created_at,method,status")
+
+
+def test_report_cli(tmp_path, capsys):
+    db = tmp_path / "r.sqlite3"
+    with SQLiteResultWriter(db) as w:
+        w.ensure_schema()
+        w.write_many(_rows())
+    assert main(["report", "methods", "--db", str(db), "--format", "json"]) == 0
+    assert [r["method"] for r in json.loads(capsys.readouterr().out)] == ["bt", "cp"]
+    assert main(["report", "window", "--db", str(db), "--by", "all"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split()[:3] == ["period", "method", "runs"] and len(lines) == 4
+    assert main(["report", "history", "0.json", "--db", str(tmp_path / "missing.sqlite3")]) == 2
+
+
+def test_reports_open_the_db_read_only(tmp_path, capsys):
+    db = tmp_path / "r.sqlite3"
+    with SQLiteResultWriter(db) as w:
+        w.ensure_schema()
+        w.write_many(_rows())
+    expected = {}
+    for cmd in (["methods"], ["window", "--by", "hour"]):
+        assert main(["report", *cmd, "--db", str(db), "--format", "json"]) == 0
+        expected[cmd[0]] = json.loads(capsys.readouterr().out)
+    # A DB without rollups is summarized from results and left untouched
+    with sqlite3.connect(db) as con:
+        con.execute("DROP TABLE results_rollup")
+        con.execute("DROP TABLE results_rollup_hourly")
+        con.execute("DROP INDEX idx_results_created_at")
+        before = sorted(con.execute("SELECT type, name FROM sqlite_master"))
+    for cmd in (["methods"], ["window", "--by", "hour"]):
+        assert main(["report", *cmd, "--db", str(db), "--format", "json"]) == 0
+        assert json.loads(capsys.readouterr().out) == expected[cmd[0]]
+    con = open_db(db)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            con.execute("DELETE FROM results")
+    finally:
+        con.close()
+    with sqlite3.connect(db) as con:
+        assert sorted(con.execute("SELECT type, name FROM sqlite_master")) == before
+
+    assert main(["report", "rebuild", "--db", str(db)]) == 0
+    capsys.readouterr()
+    rebuilt = _rollups(db)
+    with SQLiteResultWriter(tmp_path / "fresh.sqlite3") as w:
+        w.ensure_schema()
+        w.write_many(_rows())
+    assert rebuilt == _rollups(tmp_path / "fresh.sqlite3")
+    assert main(["report", "rebuild", "--db", str(tmp_path / "missing.sqlite3")]) == 2
@@ -0,0 +1,31 @@
+import random
+from pathlib import Path
+
+from sudoku_solver.board.canonical import Transform, apply_transform
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.db.solution_cache import SolutionCache
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.verify.verify import verify
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_isomorphic_puzzle_hits_cache_with_untransformed_solution(tmp_path):
+    db = tmp_path / "r.sqlite3"
+    grid = load_puzzle(ROOT / "data" / "002.json")
+    rng = random.Random(5)
+    digits = list(range(1, 10))
+    rng.shuffle(digits)
+    twin = Grid(apply_transform(grid.cells, Transform(True, (3, 5, 4, 0, 2, 1, 8, 6, 7), (6, 7, 8, 1, 0, 2, 4, 3, 5), tuple([0] + digits))))
+
+    with SolutionCache(db) as cache:
+        sr, metrics = cache.solve(grid, "cp")
+        assert sr.status == "unique" and metrics["cache_hit"] is False
+        sr2, metrics2 = cache.solve(twin, "cp")
+    assert metrics2["cache_hit"] is True
+    assert sr2.status == "unique" and verify(twin, sr2.solution)
+
+    # Persistent table: a fresh cache (empty LRU) still hits
+    with SolutionCache(db) as cache:
+        sr3, metrics3 = cache.solve(grid, "cp")
+    assert metrics3["cache_hit"] is True and sr3.solution == sr.solution
@@ -0,0 +1,86 @@
+import sqlite3
+
+from sudoku_solver.db.sqlite_writer import SQLiteResultWriter
+from sudoku_solver.db.writer import ResultWriter, build_row_from_outputs
+
+
+def _row(i: int):
+    return build_row_from_outputs(
+        test_case_id=f"{i:03d}.json",
+        method="cp",
+        status="unique",
+        metrics={"solutions_found": 1, "assignments": i},
+        time_ms=i,
+        created_at="2024-01-01T00:00:00Z",
+    )
+
+
+def _count(path) -> int:
+    with sqlite3.connect(path) as con:
+        return con.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def test_batched_writes_commit_on_flush_and_close(tmp_path):
+    db = tmp_path / "r.sqlite3"
+    writer = SQLiteResultWriter(db, batch_size=4)
+    assert isinstance(writer, ResultWriter)
+    writer.ensure_schema()
+    writer.write_many(_row(i) for i in range(3))
+    assert _count(db) == 0  # still buffered
+    writer.write(_row(3))
+    assert _count(db) == 4  # batch filled
+    writer.write(_row(4))
+    writer.close()
+    assert _count(db) == 5
+
+    with sqlite3.connect(db) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {"idx_results_case_method_time", "idx_results_method_time", "idx_results_created_at"} <= names
+    assert not {"idx_results_test_case_id", "idx_results_method"} & names
+
+
+def test_background_writer_drains_queue(tmp_path):
+    db = tmp_path / "r.sqlite3"
+    with SQLiteResultWriter(db, batch_size=50, background=True, queue_size=8) as writer:
+        writer.ensure_schema()
+        for i in range(120):
+            writer.write(_row(i))
+        writer.flush()
+        assert _count(db) == 120
+        writer.write(_row(120))
+    assert _count(db) == 121
+
+
+def test_ensure_schema_adds_timing_columns_to_old_table(tmp_path):
+    db = tmp_path / "old.sqlite3"
+    with sqlite3.connect(db) as con:
+        con.execute(
+            "CREATE TABLE results (id INTEGER PRIMARY KEY AUTOINCREMENT, test_case_id TEXT NOT NULL, method TEXT NOT NULL, "
+            "status TEXT NOT NULL, solutions_found INTEGER NOT NULL, assignments INTEGER NOT NULL, backtracks INTEGER NOT NULL, "
+            "contradictions INTEGER NOT NULL, max_depth INTEGER NOT NULL, num_guess_points INTEGER NOT NULL, "
+            "first_guess_depth INTEGER, deduced_assignments INTEGER NOT NULL, guessed_assignments INTEGER NOT NULL, "
+            "time_ms INTEGER, created_at TEXT NOT NULL)"
+        )
+    with SQLiteResultWriter(db) as writer:
+        writer.ensure_schema()
+        writer.write(_row(1))
+    with sqlite3.connect(db) as con:
+        assert con.execute("SELECT search_ns, peak_alloc_bytes, stop_reason FROM results").fetchone() == (None, None, None)
+
+
+def test_timeout_row_records_stop_reason(tmp_path):
+    db = tmp_path / "r.sqlite3"
+    row = build_row_from_outputs(
+        test_case_id="t.json",
+        method="bt",
+        status="timeout",
+        metrics={"assignments": 10, "stop_reason": "max_nodes"},
+        time_ms=1,
+        created_at="2024-01-01T00:00:00Z",
+    )
+    with SQLiteResultWriter(db) as writer:
+        writer.ensure_schema()
+        writer.write(row)
+    with sqlite3.connect(db) as con:
+        assert con.execute("SELECT status, stop_reason FROM results").fetchone() == ("timeout", "max_nodes")
@@ -0,0 +1,46 @@
+from sudoku_solver.instrumentation.recorder import NullRecorder, Recorder
+from sudoku_solver.metrics.collector import MetricsCollector
+
+
+class _Log:
+    def __init__(self):
+        self.events = []
+
+    def attempt_assign(self, r, c, v, source, depth):
+        self.events.append(("assign", r, c, v, source, depth))
+
+
+def test_single_sink_is_bound_directly():
+    m = MetricsCollector()
+    rec = Recorder([m])
+    assert rec.attempt.assign == m.attempt_assign
+    rec.attempt.assign(0, 0, 1, source="deduced", depth=0)
+    rec.attempt.contradiction(0, 0)
+    rec.decision.choose_cell(0, 0, 0)  # not implemented by MetricsCollector: no-op
+    out = m.finalize("unique")
+    assert out["deduced_assignments"] == 1
+    assert out["contradictions"] == 1
+
+
+def test_fan_out_and_null_recorder():
+    m, log = MetricsCollector(), _Log()
+    rec = Recorder([m, log])
+    rec.attempt.assign(1, 2, 3, source="guess", depth=4)
+    rec._call("attempt_assign", 1, 2, 4, "guess", 5)
+    assert log.events == [("assign", 1, 2, 3, "guess", 4), ("assign", 1, 2, 4, "guess", 5)]
+    assert m.finalize("unique")["guessed_assignments"] == 2
+    assert rec.active
+
+    null = NullRecorder()
+    assert not null.active
+    null.attempt.assign(0, 0, 1, source="guess", depth=0)
+    null.state.unassign(0, 0, 1, reason="backtrack", depth=0)
+    # Disabled events bind fixed-arity no-ops accepting the call-site forms
+    null.attempt.contradiction(0, 0, None, reason="no_candidates", depth=0)
+    null.attempt.contradiction(0, 0)
+    null.decision.choose_cell(0, 0, 0)
+    null.decision.guess_point(0)
+    null.search.update_depth(0)
+    null.result.solution_found()
+    null.phase.begin("search")
+    assert null.attempt.assign is not null.state.unassign
@@ -0,0 +1,40 @@
+import pytest
+
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.io.line_io import LineWriter, format_line, iter_grids, iter_packed, parse_line
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_roundtrip_and_line_numbers(tmp_path):
+    puzzle = load_puzzle(ROOT / "data/001.json")
+    line = format_line(puzzle.cells)
+    dotted = line.replace("0", ".")
+    path = tmp_path / "corpus.txt"
+    path.write_text(f"# comment\n{line}\n\n{dotted},extra\r\n{line}")
+    items = list(iter_grids(path))
+    assert [n for n, _ in items] == [2, 4, 5]
+    assert all(g.cells == puzzle.cells for _, g in items)
+    assert not items[0][1].givens_conflict()
+
+    out = tmp_path / "out.txt"
+    with LineWriter(out, buffer_lines=2) as w:
+        w.write_many(p for _, p in iter_packed(path))
+    assert out.read_text().splitlines() == [line] * 3
+
+
+def test_malformed_lines_report_line_number(tmp_path):
+    path = tmp_path / "bad.txt"
+    path.write_text("1" * 81 + "\n" + "12x" + "0" * 78 + "\n")
+    with pytest.raises(ValueError, match="第 2 行"):
+        list(iter_packed(path))
+    with pytest.raises(ValueError):
+        parse_line("123")
+
+
+def test_empty_file_yields_nothing(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(iter_packed(path)) == []
@@ -0,0 +1,76 @@
+import io
+
+import pytest
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.cli import main
+from sudoku_solver.io.packed_io import (
+    HEADER_SIZE,
+    PackedWriter,
+    iter_grids,
+    iter_records,
+    pack,
+    packed_size,
+    read_record,
+    unpack,
+)
+from sudoku_solver.solver.generator import generate
+from sudoku_solver.verify.batch import iter_pairs
+
+
+def test_pack_roundtrip_sizes():
+    puzzles = list(generate(5, seed=3))
+    for p in puzzles:
+        raw = pack(p.puzzle)
+        assert len(raw) == packed_size(9) == 41
+        assert unpack(raw) == p.puzzle
+        assert pack(Grid.from_digits(p.solution)) == pack(Grid.from_digits(p.solution).cells)
+    small = [[1, 2, 3, 4], [3, 4, 1, 2], [2, 1, 4, 3], [4, 3, 2, 1]]
+    assert unpack(pack(small), 4) == bytes(v for row in small for v in row)
+    with pytest.raises(ValueError):
+        packed_size(16)
+    with pytest.raises(ValueError):
+        unpack(b"\xff" * 41)
+    with pytest.raises(ValueError):
+        unpack(b"\x00" * 40 + b"\x01")  # trailing nibble must be 0
+
+
+def test_writer_reader_with_solution(tmp_path):
+    puzzles = list(generate(7, seed=5))
+    path = tmp_path / "corpus.sdkp"
+    with PackedWriter(path, with_solution=True, buffer_records=3) as w:
+        for p in puzzles:
+            w.write(p.puzzle, p.solution)
+        with pytest.raises(ValueError):
+            w.write(p.puzzle)
+    assert path.stat().st_size == HEADER_SIZE + 7 * 82
+    records = list(iter_records(path, buffer_records=2))
+    assert [(i, q, s) for i, q, s in records] == [(i + 1, p.puzzle, p.solution) for i, p in enumerate(puzzles)]
+    assert read_record(path, 4) == (puzzles[3].puzzle, puzzles[3].solution)
+    with pytest.raises(ValueError):
+        read_record(path, 8)
+    assert [g.digits() for _, g in iter_grids(path)] == [p.puzzle for p in puzzles]
+    pairs = list(iter_pairs(path))
+    assert [e for *_, e in pairs] == [None] * 7
+
+
+def test_bad_header_and_truncation(tmp_path):
+    path = tmp_path / "bad.sdkp"
+    path.write_bytes(b"SDKX" + bytes(4))
+    with pytest.raises(ValueError, match="SDKP"):
+        list(iter_records(path))
+    buf = io.BytesIO()
+    with PackedWriter(buf) as w:
+        w.write_many(p.puzzle for p in generate(2, seed=1))
+    path.write_bytes(buf.getvalue()[:-5])
+    with pytest.raises(ValueError, match="第 2 条记录"):
+        list(iter_records(path))
+    pairs = list(iter_pairs(path))
+    assert pairs[-1][0] == "2" and "截断" in pairs[-1][3]
+
+
+def test_generate_packed_cli(tmp_path, capsys):
+    out = tmp_path / "gen.sdkp"
+    assert main(["generate", "--count", "3", "--seed", "9", "--format", "packed", "--with-solution", "--out", str(out)]) == 0
+    assert main(["verify-batch", str(out)]) == 0
+    assert main(["generate", "--format", "packed"]) == 2
@@ -0,0 +1,74 @@
+import json
+import math
+import random
+import shutil
+from pathlib import Path
+
+from sudoku_solver.cli import main
+from sudoku_solver.metrics.aggregate import FIELDS, Distribution, MetricsAggregate, merge_all
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _metrics(rng):
+    return {
+        "assignments": rng.randrange(100000),
+        "backtracks": rng.randrange(5000),
+        "max_depth": rng.randrange(60),
+        "num_guess_points": rng.randrange(300),
+        "timing": {"validate_ns": rng.randrange(10**4), "search_ns": rng.randrange(10**9)},
+    }
+
+
+def test_distribution_moments_and_quantiles():
+    rng = random.Random(1)
+    values = [int(rng.lognormvariate(8, 2)) for _ in range(5000)]
+    d = Distribution()
+    for v in values:
+        d.add(v)
+    n = len(values)
+    mean = sum(values) / n
+    assert d.mean == mean and (d.min, d.max) == (min(values), max(values))
+    assert abs(d.variance - sum((v - mean) ** 2 for v in values) / (n - 1)) <= 1e-6 * d.variance
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[math.ceil(q * n) - 1]
+        assert abs(d.quantile(q) - exact) <= 0.07 * exact + 1
+    small = Distribution()
+    for v in (0, 3, 3, 15):
+        small.add(v)
+    assert [small.quantile(q) for q in (0.25, 0.5, 1.0)] == [0, 3, 15]
+
+
+def test_sharded_merge_is_exact_and_roundtrips():
+    rng = random.Random(2)
+    rows = [(rng.choice(["bt", "cp"]), rng.choice(["unique", "timeout"]), _metrics(rng)) for _ in range(600)]
+    whole = MetricsAggregate()
+    shards = [MetricsAggregate() for _ in range(4)]
+    for i, (method, status, m) in enumerate(rows):
+        whole.add(method, status, m)
+        shards[i % 4].add(method, status, m)
+    whole.add("cp", "error")
+    shards[3].add("cp", "error")
+    # Merge in another order, through the JSON form
+    revived = [MetricsAggregate.from_dict(json.loads(json.dumps(s.to_dict()))) for s in reversed(shards)]
+    assert merge_all(revived).to_dict() == whole.to_dict()
+    by_method = {g["method"]: g for g in whole.rollup("method").to_dict()["groups"]}
+    assert by_method["cp"]["count"] == sum(1 for m, *_ in rows if m == "cp") + 1
+    assert set(by_method["bt"]["fields"]) == set(FIELDS)
+
+
+def test_solve_batch_metrics_out_and_merge(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for name in ("001.json", "template.json"):
+        shutil.copy(ROOT / "data" / name, corpus / name)
+    a, b, merged = tmp_path / "a.json", tmp_path / "b.json", tmp_path / "m.json"
+    for method, out in (("cp", a), ("dlx", b)):
+        assert main(["solve-batch", str(corpus), "--method", method, "--jobs", "1", "--no-db", "--out", str(tmp_path / "r.jsonl"), "--metrics-out", str(out)]) == 0
+    assert main(["metrics-merge", str(a), str(b), "--out", str(merged)]) == 0
+    groups = json.loads(merged.read_text())["groups"]
+    assert sorted((g["method"], g["status"], g["count"]) for g in groups) == [
+        ("cp", "multiple", 1), ("cp", "unique", 1), ("dlx", "multiple", 1), ("dlx", "unique", 1)
+    ]
+    assert groups[0]["fields"]["solve_ns"]["count"] == 1
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from sudoku_solver.db.writer import build_row_from_outputs
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.metrics.timing import PHASES, TimingSink
+from sudoku_solver.solver import SOLVERS
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_solvers_report_validate_and_search_phases():
+    for method, solve in SOLVERS.items():
+        if method == "bt":
+            continue  # data/002.json is slow for plain backtracking
+        timing = TimingSink()
+        with timing.phase("parse"):
+            puzzle = load_puzzle(ROOT / "data" / "002.json")
+        solve(puzzle, timing_sink=timing)
+        d = timing.to_dict()
+        assert set(d) == {f"{p}_ns" for p in PHASES} | {"peak_alloc_bytes"}
+        assert d["parse_ns"] > 0 and d["validate_ns"] > 0 and d["search_ns"] > 0
+        assert d["verify_ns"] is None and d["peak_alloc_bytes"] is None
+
+
+def test_memory_tracking_and_row_mapping():
+    timing = TimingSink(track_memory=True)
+    with timing.phase("search"):
+        blob = [bytearray(1024) for _ in range(64)]
+    timing.stop()
+    del blob
+    d = timing.to_dict()
+    assert d["peak_alloc_bytes"] >= 64 * 1024
+    row = build_row_from_outputs(
+        test_case_id="x", method="cp", status="unique", metrics={"timing": d}, time_ms=1, created_at="t"
+    )
+    assert row.search_ns == d["search_ns"] and row.peak_alloc_bytes == d["peak_alloc_bytes"]
+    assert row.persist_ns is None
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.cli import main
+from sudoku_solver.service import server
+from sudoku_solver.service.server import SolverService
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _grid(name: str):
+    return json.loads((ROOT / "data" / name).read_text())["grid"]
+
+
+def test_service_round_trip_over_unix_socket(tmp_path):
+    sock = str(tmp_path / "s.sock")
+
+    async def run():
+        service = SolverService(method="cp", jobs=1, max_pending=4)
+        await service.start()
+        server = await asyncio.start_unix_server(service._serve_connection, path=sock)
+        try:
+            reader, writer = await asyncio.open_unix_connection(sock)
+            responses = []
+            for req in ({"id": 1, "grid": _grid("001.json")}, {"id": 2, "grid": [[1]]}, "nope"):
+                writer.write((json.dumps(req) + "\n").encode())
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.close()
+            return responses
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    ok, invalid, not_obj = asyncio.run(run())
+    assert ok["id"] == 1 and ok["status"] == "unique" and ok["verify_ok"] is True
+    assert "timing" in ok["metrics"]
+    assert invalid == {"id": 2, "error": "invalid", "message": invalid["message"]}
+    assert not_obj["error"] == "invalid"
+
+
+def test_admission_control_rejects_when_full():
+    async def run():
+        service = SolverService(method="cp", jobs=1, max_pending=1)
+        await service.start()
+        service.in_flight = 1
+        try:
+            return await service.handle({"id": "x", "grid": _grid("001.json")})
+        finally:
+            service.close()
+
+    assert asyncio.run(run())["error"] == "overloaded"
+
+
+def test_invalid_timeout_ms_is_rejected():
+    async def run():
+        service = SolverService(method="cp", jobs=1)
+        await service.start()
+        try:
+            return [await service.handle({"id": t, "grid": _grid("001.json"), "timeout_ms": t}) for t in ("100", -5, 0, 1.5, True)]
+        finally:
+            service.close()
+
+    responses = asyncio.run(run())
+    assert [r["error"] for r in responses] == ["invalid"] * 5
+
+
+def test_timed_out_request_holds_its_slot_until_the_worker_finishes(monkeypatch):
+    # A negative grace makes the parent give up before the worker's own time limit
+    monkeypatch.setattr(server, "TIMEOUT_GRACE_S", -0.045)
+
+    async def run():
+        service = SolverService(method="bt", jobs=1, max_pending=1)
+        await service.start()
+        try:
+            timed_out = await service.handle({"id": "slow", "grid": _grid("002.json"), "timeout_ms": 50})
+            rejected = await service.handle({"id": "next", "grid": _grid("001.json")})
+            for _ in range(200):
+                if service.in_flight == 0:
+                    break
+                await asyncio.sleep(0.01)
+            return timed_out, rejected, service.in_flight
+        finally:
+            service.close()
+
+    timed_out, rejected, in_flight = asyncio.run(run())
+    assert timed_out["error"] == "timeout"
+    assert rejected["error"] == "overloaded"
+    assert in_flight == 0
+
+
+def test_unknown_or_non_string_method_is_rejected():
+    service = SolverService(method="cp", jobs=1)
+    responses = [asyncio.run(service.handle({"id": m, "grid": _grid("001.json"), "method": m})) for m in ("nope", ["cp"], {"m": 1})]
+    assert [r["error"] for r in responses] == ["invalid"] * 3
+
+
+def test_non_positive_server_defaults_are_rejected(capsys):
+    for kwargs in ({"max_pending": 0}, {"max_pending": -1}, {"timeout_ms": 0}, {"timeout_ms": -5}):
+        with pytest.raises(ValueError):
+            SolverService(method="cp", **kwargs)
+    for flag in ("--max-pending", "--timeout-ms"):
+        for value in ("0", "-5"):
+            with pytest.raises(SystemExit) as exc:
+                main(["serve", "--port", "0", flag, value, "--no-db"])
+            assert exc.value.code == 2
+    assert "必须 >= 1" in capsys.readouterr().err
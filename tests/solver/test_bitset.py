@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_bitset, solve_dlx, solve_propagation
+from sudoku_solver.verify.verify import verify
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_bits_matches_cp_on_9x9():
+    for name in ("data/001.json", "data/002.json", "examples/puzzle_easy.json"):
+        puzzle = load_puzzle(ROOT / name)
+        cp, _ = solve_propagation(puzzle.clone())
+        sr, metrics = solve_bitset(puzzle)
+        assert sr.status == cp.status == "unique"
+        assert sr.solution == cp.solution
+        assert metrics["assignments"] == metrics["deduced_assignments"] + metrics["guessed_assignments"]
+
+
+def test_bits_solves_16x16_example():
+    puzzle = load_puzzle(ROOT / "examples/puzzle_16x16.json")
+    sr, metrics = solve_bitset(puzzle)
+    assert sr.status == "unique"
+    assert len(sr.solution) == 16
+    assert verify(puzzle, sr.solution)
+    assert metrics["deduced_assignments"] > 0
+
+
+@pytest.mark.parametrize("size", [4, 16, 25])
+def test_bits_fills_empty_boards(size):
+    grid = Grid([[0] * size for _ in range(size)])
+    sr, metrics = solve_bitset(grid, max_solutions=1)
+    assert sr.status == "unique"  # only one solution was asked for
+    assert verify(grid, sr.solution)
+    sr, _ = solve_bitset(grid)
+    assert sr.status == "multiple"
+
+
+def test_bits_detects_unsat():
+    cells = [[0] * 4 for _ in range(4)]
+    cells[0][:3] = [1, 2, 3]
+    cells[1][3] = 4  # row 0 needs 4 in column 3, box 1 already has it
+    sr, _ = solve_bitset(Grid(cells))
+    assert sr.status == "unsat" and sr.solution is None
+
+
+def test_bits_unsat_when_a_deduction_overwrites_a_queued_given():
+    cells = [
+        [0, 4, 0, 0, 0, 7, 0, 0, 0], [0, 0, 5, 0, 0, 0, 6, 0, 8], [0, 0, 0, 3, 4, 6, 0, 0, 2],
+        [0, 6, 3, 0, 0, 0, 0, 0, 0], [0, 1, 0, 6, 0, 0, 8, 3, 0], [0, 0, 0, 0, 7, 4, 0, 0, 1],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0], [9, 0, 0, 0, 0, 1, 0, 0, 0], [0, 8, 1, 0, 2, 0, 7, 0, 0],
+    ]  # fmt: skip
+    assert not Grid(cells).givens_conflict()
+    sr, _ = solve_bitset(Grid(cells))
+    assert sr.status == solve_propagation(Grid(cells))[0].status == "unsat"
+
+
+def test_dlx_rejects_other_sizes():
+    with pytest.raises(ValueError):
+        solve_dlx(Grid([[0] * 4 for _ in range(4)]))
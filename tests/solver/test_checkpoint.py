@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.cli import main
+from sudoku_solver.db.report import case_history, open_db
+from sudoku_solver.solver.backtracking import solve_backtracking
+from sudoku_solver.solver.checkpoint import Checkpointer, load_checkpoint
+
+
+class _StopAfter(Checkpointer):
+    """Request a stop at the n-th poll."""
+
+    def __init__(self, path, n):
+        super().__init__(path)
+        self.n = n
+
+    def poll(self):
+        self.n -= 1
+        if self.n == 0:
+            self.request_stop()
+        return super().poll()
+
+
+def _empty():
+    return Grid([[0] * 9 for _ in range(9)])
+
+
+def test_interrupted_search_resumes_with_identical_results(tmp_path):
+    expected, expected_metrics = solve_backtracking(_empty(), max_solutions=300)
+
+    path = tmp_path / "ck.json"
+    grid = _empty()
+    sr, _ = solve_backtracking(grid, max_solutions=300, checkpoint=_StopAfter(path, 2))
+    assert sr.status == "interrupted"
+    assert grid.cells == _empty().cells  # givens restored
+
+    # Resume, interrupt once more, then finish
+    sr, _ = solve_backtracking(_empty(), checkpoint=_StopAfter(path, 3), resume_state=load_checkpoint(path))
+    assert sr.status == "interrupted"
+    state = load_checkpoint(path)
+    sr, metrics = solve_backtracking(Grid(state["puzzle"]), resume_state=state)
+
+    assert sr.status == expected.status == "multiple"
+    assert sr.solution == expected.solution
+    assert sr.stats == expected.stats
+    assert metrics == expected_metrics
+
+
+def test_periodic_checkpoint_does_not_stop_search(tmp_path):
+    path = tmp_path / "ck.json"
+    ck = Checkpointer(path, interval_s=1e-9)
+    sr, _ = solve_backtracking(_empty(), max_solutions=300, checkpoint=ck)
+    assert sr.status == "multiple" and ck.saves > 0 and path.exists()
+
+
+def test_timeout_saves_checkpoint_for_resume(tmp_path):
+    expected, expected_metrics = solve_backtracking(_empty(), max_solutions=300)
+
+    path = tmp_path / "ck.json"
+    sr, metrics = solve_backtracking(_empty(), max_solutions=300, checkpoint=Checkpointer(path), max_nodes=500)
+    assert sr.status == "timeout" and metrics["stop_reason"] == "max_nodes"
+    sr, metrics = solve_backtracking(_empty(), resume_state=load_checkpoint(path))
+    assert (sr.solution, sr.stats) == (expected.solution, expected.stats)
+    assert metrics == expected_metrics
+
+
+def test_resumed_solve_persists_under_the_puzzle_id(tmp_path):
+    puzzle = tmp_path / "case-7.json"
+    puzzle.write_text((Path(__file__).resolve().parents[2] / "data/001.json").read_text())
+    ck, db = tmp_path / "ck.json", tmp_path / "results.sqlite3"
+    assert main(["solve", str(puzzle), "--checkpoint", str(ck), "--max-nodes", "10", "--db", str(db)]) == 0
+    assert load_checkpoint(ck)["test_case_id"] == "case-7.json"
+    assert main(["solve", "--resume", str(ck), "--db", str(db)]) == 0
+
+    con = open_db(db)
+    try:
+        statuses = [r["status"] for r in case_history(con, "case-7.json")]
+        assert statuses == ["unique", "timeout"]
+        assert not case_history(con, "ck.json")
+    finally:
+        con.close()
@@ -0,0 +1,48 @@
+import random
+from pathlib import Path
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_dlx
+from sudoku_solver.solver.counting import SolutionCounter, count_solutions
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _thinned(keep, seed):
+    """Keep `keep` random cells of data/001.json's solution."""
+    solution = solve_dlx(load_puzzle(ROOT / "data/001.json"))[0].solution
+    cells = [(r, c) for r in range(9) for c in range(9)]
+    random.Random(seed).shuffle(cells)
+    grid = [[0] * 9 for _ in range(9)]
+    for r, c in cells[:keep]:
+        grid[r][c] = solution[r][c]
+    return grid
+
+
+def test_counts_match_enumeration():
+    for keep, seed in ((26, 1), (30, 2), (40, 3), (50, 4)):
+        cells = _thinned(keep, seed)
+        expected = solve_dlx(Grid([row[:] for row in cells]), max_solutions=10**6)[1]["solutions_found"]
+        result = count_solutions(Grid(cells))
+        assert result.exact and result.count == expected
+        assert count_solutions(Grid(cells), cache_size=0).count == expected
+
+
+def test_limit_truncates_without_caching_partial_counts():
+    cells = _thinned(26, 1)
+    total = count_solutions(Grid(cells)).count
+    assert total > 10
+    counter = SolutionCounter()
+    capped = counter.count(Grid(cells), limit=10)
+    assert (capped.count, capped.exact) == (10, False)
+    # The same counter then gives the exact total: no truncated entry was memoized
+    assert counter.count(Grid(cells)).count == total
+    assert count_solutions(Grid(cells), limit=total).exact
+
+
+def test_unique_and_unsat():
+    assert count_solutions(load_puzzle(ROOT / "data/001.json")).count == 1
+    cells = _thinned(81, 0)
+    cells[0][0], cells[0][1] = cells[0][1], cells[0][0]
+    assert count_solutions(Grid(cells)).count == 0
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_dlx, solve_propagation
+from sudoku_solver.verify.verify import verify
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_dlx_unique_matches_cp():
+    for name in ("data/001.json", "data/002.json", "examples/puzzle_easy.json"):
+        puzzle = load_puzzle(ROOT / name)
+        sr, metrics = solve_dlx(puzzle)
+        assert sr.status == "unique"
+        assert verify(puzzle, sr.solution)
+        assert sr.solution == solve_propagation(puzzle)[0].solution
+        assert metrics["solutions_found"] == 1
+
+
+def test_dlx_multiple_honors_max_solutions():
+    empty = load_puzzle(ROOT / "data/template.json")
+    sr, metrics = solve_dlx(empty)
+    assert sr.status == "multiple"
+    assert metrics["solutions_found"] == 2
+    sr, metrics = solve_dlx(empty, max_solutions=5)
+    assert metrics["solutions_found"] == 5
+
+
+def test_dlx_unsat():
+    puzzle = load_puzzle(ROOT / "examples/puzzle_easy.json")
+    solved, _ = solve_dlx(puzzle)
+    r, c = puzzle.first_empty()
+    wrong = next(v for v in puzzle.candidate_values(r, c) if v != solved.solution[r][c])
+    puzzle.set_cell(r, c, wrong)
+    sr, metrics = solve_dlx(puzzle)
+    assert sr.status == "unsat"
+    assert sr.solution is None
+    assert metrics["solutions_found"] == 0
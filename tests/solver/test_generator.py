@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.cli import main
+from sudoku_solver.solver.counting import count_solutions
+from sudoku_solver.solver.generator import PuzzleGenerator, generate, orbits, puzzle_rng
+
+
+@pytest.mark.parametrize("symmetry", ["none", "rot180", "rot90", "mirror", "diagonal"])
+def test_puzzles_are_unique_symmetric_and_minimal(symmetry):
+    for p in generate(3, symmetry=symmetry, seed=11):
+        grid = Grid(p.grid)
+        assert count_solutions(grid).count == 1
+        assert p.clues == sum(1 for v in p.puzzle if v)
+        assert all(p.puzzle[i] in (0, p.solution[i]) for i in range(81))
+        clue_orbits = [o for o in orbits(symmetry) if p.puzzle[o[0]]]
+        # Every orbit is all clues or all blanks, and no clue orbit can be removed
+        assert all(all(p.puzzle[i] for i in o) for o in clue_orbits)
+        for o in clue_orbits:
+            cells = bytearray(p.puzzle)
+            for i in o:
+                cells[i] = 0
+            assert count_solutions(Grid.from_digits(bytes(cells)), limit=1).exact is False
+
+
+def test_target_clues_and_seeded_reproducibility():
+    first = list(generate(4, clues=28, symmetry="rot180", seed=3))
+    assert [p.clues for p in first] == [28] * 4
+    assert all(count_solutions(Grid(p.grid)).count == 1 for p in first)
+    again = list(generate(2, clues=28, symmetry="rot180", seed=3, start=2))
+    assert [p.puzzle for p in again] == [p.puzzle for p in first[2:]]
+    assert next(generate(1, seed=4)).puzzle != first[0].puzzle
+
+
+def test_unreachable_target_is_rejected():
+    with pytest.raises(ValueError):
+        PuzzleGenerator(clues=16)
+    with pytest.raises(ValueError):
+        PuzzleGenerator(clues=30, symmetry="rot90")  # 81 - 4k or 80 - 4k only
+    with pytest.raises(ValueError):
+        PuzzleGenerator(clues=18, max_attempts=1).generate(puzzle_rng(0, 0))
+
+
+def test_cli_streams_json_and_reports_rate(tmp_path, capsys):
+    out = tmp_path / "gen.jsonl"
+    assert main(["generate", "--count", "3", "--seed", "9", "--format", "json", "--with-solution", "--out", str(out)]) == 0
+    recs = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in recs] == [1, 2, 3]
+    assert all(count_solutions(Grid(r["grid"])).count == 1 for r in recs)
+    summary = json.loads(capsys.readouterr().err)["summary"]
+    assert summary["seed"] == 9 and summary["count"] == 3 and summary["puzzles_per_s"] > 0
+
+    assert main(["generate", "--count", "3", "--seed", "9"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["".join(str(v) for row in r["grid"] for v in row) for r in recs]
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.cli import main
+from sudoku_solver.solver import SOLVERS
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _empty():
+    return Grid([[0] * 9 for _ in range(9)])
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+def test_max_nodes_stops_exactly_with_partial_stats(method):
+    grid = _empty()
+    sr, metrics = SOLVERS[method](grid, max_solutions=10**6, max_nodes=300)
+    assert sr.status == metrics["status"] == "timeout"
+    assert metrics["stop_reason"] == "max_nodes"
+    assert sr.stats.calls == 300
+    assert metrics["assignments"] == sr.stats.assignments > 0
+    assert grid.cells == _empty().cells  # search state unwound
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+def test_time_limit_stops_search(method):
+    sr, metrics = SOLVERS[method](_empty(), max_solutions=10**6, time_limit_ms=0)
+    assert sr.status == "timeout"
+    assert metrics["stop_reason"] == "time_limit"
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+def test_generous_limits_do_not_change_results(method):
+    expected, expected_metrics = SOLVERS[method](_empty(), max_solutions=20)
+    sr, metrics = SOLVERS[method](_empty(), max_solutions=20, time_limit_ms=60_000, max_nodes=10**9)
+    assert (sr.status, sr.solution, sr.stats) == (expected.status, expected.solution, expected.stats)
+    assert metrics == expected_metrics and "stop_reason" not in metrics
+
+
+@pytest.mark.parametrize("command", ["solve", "solve-batch"])
+@pytest.mark.parametrize("flag", ["--time-limit-ms", "--max-nodes"])
+def test_cli_rejects_negative_limits(command, flag, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([command, str(ROOT / "data/001.json"), flag, "-1", "--no-db"])
+    assert exc.value.code == 2
+    assert "必须 >= 0" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from sudoku_solver.board.grid import Grid
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_backtracking, solve_bitset
+from sudoku_solver.solver.parallel import solve_parallel
+from sudoku_solver.verify.verify import verify
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _empty():
+    return Grid([[0] * 9 for _ in range(9)])
+
+
+def test_split_search_matches_serial_on_unique_puzzle():
+    expected, expected_metrics = solve_backtracking(load_puzzle(ROOT / "data/001.json"))
+    for jobs in (1, 2):
+        sr, metrics = solve_parallel(load_puzzle(ROOT / "data/001.json"), jobs=jobs, task_nodes=50)
+        assert sr.status == "unique" and sr.solution == expected.solution
+        assert metrics["parallel"]["tasks"] > 1
+        # Splitting loses no nodes and searches none twice
+        assert sr.stats == expected.stats
+        assert {k: metrics[k] for k in expected_metrics} == expected_metrics
+
+
+
+def test_split_search_covers_values_above_9_on_16x16():
+    solution = solve_bitset(load_puzzle(ROOT / "examples/puzzle_16x16.json"))[0].solution
+    cells = [row[:] for row in solution]
+    for r in range(12, 16):
+        cells[r] = [v if c in (0, 5, 10) else 0 for c, v in enumerate(cells[r])]
+    expected, _ = solve_backtracking(Grid(cells))
+    assert expected.status == "multiple"
+    for jobs in (1, 2):
+        sr, metrics = solve_parallel(Grid(cells), jobs=jobs, task_nodes=3)
+        assert metrics["parallel"]["tasks"] > 1
+        assert sr.status == "multiple" and verify(Grid(cells), sr.solution)
+
+
+def test_solution_cap_cancels_remaining_work():
+    expected, _ = solve_backtracking(_empty(), max_solutions=50)
+    sr, metrics = solve_parallel(_empty(), jobs=2, max_solutions=50, task_nodes=200)
+    assert sr.status == "multiple" and metrics["solutions_found"] == 50
+    assert sr.solution == expected.solution
+
+
+def test_node_limit_spans_all_tasks():
+    sr, metrics = solve_parallel(load_puzzle(ROOT / "data/002.json"), jobs=2, max_nodes=3000, task_nodes=500)
+    assert sr.status == "timeout" and metrics["stop_reason"] == "max_nodes"
+    assert sr.stats.calls == 3000
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_backtracking, solve_propagation
+from sudoku_solver.verify.verify import verify
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_cp_matches_bt_on_easy_puzzles():
+    for name in ("data/001.json", "examples/puzzle_easy.json"):
+        puzzle = load_puzzle(ROOT / name)
+        bt, _ = solve_backtracking(puzzle.clone())
+        cp, metrics = solve_propagation(puzzle.clone())
+        assert cp.status == bt.status == "unique"
+        assert cp.solution == bt.solution
+        assert verify(puzzle, cp.solution)
+        assert metrics["deduced_assignments"] > 0
+        assert metrics["assignments"] == metrics["deduced_assignments"] + metrics["guessed_assignments"]
+
+
+def test_cp_solves_hard_puzzle_and_restores_grid():
+    puzzle = load_puzzle(ROOT / "data/002.json")
+    before = puzzle.cells
+    sr, metrics = solve_propagation(puzzle)
+    assert sr.status == "unique"
+    assert verify(puzzle, sr.solution)
+    assert puzzle.cells == before
+    assert metrics["solutions_found"] == 1
+
+
+def test_cp_detects_multiple_and_unsat():
+    empty = load_puzzle(ROOT / "data/template.json")
+    sr, metrics = solve_propagation(empty)
+    assert sr.status == "multiple"
+    assert metrics["solutions_found"] == 2
+
+    puzzle = load_puzzle(ROOT / "examples/puzzle_easy.json")
+    solved, _ = solve_propagation(puzzle.clone())
+    # Put a wrong digit (valid locally) into an empty cell: no completion exists
+    r, c = puzzle.first_empty()
+    wrong = next(v for v in puzzle.candidate_values(r, c) if v != solved.solution[r][c])
+    puzzle.set_cell(r, c, wrong)
+    sr, _ = solve_propagation(puzzle)
+    assert sr.status == "unsat"
+    assert sr.solution is None
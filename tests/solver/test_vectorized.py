@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_propagation
+from sudoku_solver.verify.verify import verify
+
+np = pytest.importorskip("numpy")
+
+from sudoku_solver.solver.vectorized import propagate_batch, solve_batch_vectorized  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _puzzles():
+    names = ("data/001.json", "data/002.json", "examples/puzzle_easy.json", "data/template.json")
+    return [load_puzzle(ROOT / n) for n in names]
+
+
+def test_batch_statuses_match_scalar_engine():
+    grids = _puzzles()
+    results = solve_batch_vectorized(grids)
+    for g, (sr, metrics) in zip(grids, results):
+        ref, _ = solve_propagation(g.clone())
+        assert sr.status == ref.status
+        assert verify(g, sr.solution)
+        assert metrics["assignments"] == metrics["deduced_assignments"] + metrics["guessed_assignments"]
+
+
+def test_singles_only_puzzle_is_resolved_in_batch():
+    easy = load_puzzle(ROOT / "examples/puzzle_easy.json")
+    values, dead, deduced = propagate_batch(np.array([easy.cells] * 3))
+    assert not dead.any()
+    assert (values != 0).all()
+    assert deduced.tolist() == [easy.empty_count()] * 3
+    sr, metrics = solve_batch_vectorized([easy])[0]
+    assert sr.status == "unique"
+    assert metrics["guessed_assignments"] == 0
+
+
+def test_contradiction_marks_unsat():
+    easy = load_puzzle(ROOT / "examples/puzzle_easy.json")
+    solved, _ = solve_propagation(easy.clone())
+    r, c = easy.first_empty()
+    easy.set_cell(r, c, next(v for v in easy.candidate_values(r, c) if v != solved.solution[r][c]))
+    sr, metrics = solve_batch_vectorized([easy])[0]
+    assert sr.status == "unsat"
+    assert sr.solution is None
+    assert metrics["solutions_found"] == 0
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_backtracking, solve_bitset, solve_propagation
+from sudoku_solver.trace.binary import HEADER, RECORD, BinaryTraceSink, iter_steps, summarize
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _norm(steps):
+    return [json.loads(json.dumps(s)) for s in steps]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_binary_trace_decodes_to_json_steps(tmp_path, compress):
+    puzzle = load_puzzle(ROOT / "data/001.json")
+    ref, _ = solve_backtracking(puzzle, trace_enabled=True)
+
+    path = tmp_path / "trace.bin"
+    with BinaryTraceSink(path, compress=compress) as sink:
+        sr, metrics = solve_backtracking(puzzle, trace_enabled=True, trace_sink=sink)
+    assert sr.trace["mode"] == "binary"
+    assert sr.trace["events"] == len(ref.trace["steps"])
+    assert _norm(iter_steps(path)) == _norm(ref.trace["steps"])
+
+    stats = summarize(path)
+    assert stats["counts"] == sr.trace["counts"]
+    assert stats["counts"]["assign"] == metrics["assignments"]
+
+
+def test_reasons_are_preserved_and_bad_files_rejected(tmp_path):
+    path = tmp_path / "cp.bin"
+    with BinaryTraceSink(path) as sink:
+        solve_propagation(load_puzzle(ROOT / "data/002.json"), trace_sink=sink)
+    reasons = {s.get("reason") for s in iter_steps(path)}
+    assert "undo_deduction" in reasons
+
+    # The bits engine reports failed propagation with its own reason
+    ref, _ = solve_bitset(load_puzzle(ROOT / "data/002.json"), trace_enabled=True)
+    path = tmp_path / "bits.bin"
+    with BinaryTraceSink(path) as sink:
+        solve_bitset(load_puzzle(ROOT / "data/002.json"), trace_sink=sink)
+    assert _norm(iter_steps(path)) == _norm(ref.trace["steps"])
+    assert "propagation" in {s.get("reason") for s in iter_steps(path)}
+
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        summarize(bad)
+
+
+def test_unknown_record_type_reports_its_offset(tmp_path):
+    path = tmp_path / "newer.bin"
+    path.write_bytes(HEADER + RECORD.pack(1, 2, 0, 0, 5, 1) + RECORD.pack(9, 0, 0, 0, 0, 1))
+    for read in (lambda: list(iter_steps(path)), lambda: summarize(path)):
+        with pytest.raises(ValueError, match="第 1 条记录，偏移 15"):
+            read()
+    path.write_bytes(HEADER + RECORD.pack(1, 2, 0, 0, 5, 1) + b"\x01\x02")
+    with pytest.raises(ValueError, match="偏移 15"):
+        summarize(path)
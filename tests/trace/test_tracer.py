@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_solver.cli import main
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.solver import solve_backtracking
+from sudoku_solver.trace.tracer import TraceSink, Tracer
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _full_steps():
+    sr, _ = solve_backtracking(load_puzzle(ROOT / "data/001.json"), trace_enabled=True)
+    return sr.trace["steps"]
+
+
+def _bounded(**limits):
+    sink = TraceSink(Tracer(enabled=True, mode="steps", **limits))
+    sr, _ = solve_backtracking(load_puzzle(ROOT / "data/001.json"), trace_sink=sink)
+    return sr.trace
+
+
+def test_tail_keeps_last_n_and_reports_dropped():
+    full = _full_steps()
+    trace = _bounded(tail=10)
+    assert trace["steps"] == full[-10:]
+    assert trace["dropped"] == len(full) - 10
+    assert sum(trace["counts"].values()) == len(full)
+
+
+def test_sample_and_depth_filters():
+    full = _full_steps()
+    sampled = _bounded(sample=7)
+    assert sampled["steps"] == full[::7]
+    assert sampled["dropped"] == len(full) - len(full[::7])
+
+    shallow = _bounded(depth_max=2)
+    expected = [s for s in full if s.get("depth", 0) <= 2]
+    assert shallow["steps"] == expected
+    assert shallow["dropped"] == len(full) - len(expected)
+
+
+def test_unbounded_output_unchanged():
+    trace = Tracer(enabled=True).to_json_obj()
+    assert trace == {"enabled": True, "mode": "steps", "steps": []}
+
+
+def test_invalid_trace_limits_are_rejected(capsys):
+    for limits in ({"tail": 0}, {"tail": -1}, {"sample": 0}, {"depth_max": -1}):
+        with pytest.raises(ValueError):
+            Tracer(enabled=True, **limits)
+    for flag in ("--trace-tail", "--trace-sample"):
+        with pytest.raises(SystemExit) as exc:
+            main(["solve", str(ROOT / "data/001.json"), flag, "0", "--no-db"])
+        assert exc.value.code == 2
+    assert "必须 >= 1" in capsys.readouterr().err
+    with pytest.raises(SystemExit) as exc:
+        main(["solve", str(ROOT / "data/001.json"), "--trace-depth-max", "-1", "--no-db"])
+    assert exc.value.code == 2
+    assert "必须 >= 0" in capsys.readouterr().err
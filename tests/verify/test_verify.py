@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+from sudoku_solver.cli import main
+from sudoku_solver.io.json_io import load_puzzle
+from sudoku_solver.io.line_io import format_line
+from sudoku_solver.solver import solve_bitset, solve_dlx
+from sudoku_solver.verify.batch import iter_pairs, run_verify_batch
+from sudoku_solver.verify.verify import verify, verify_packed
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _pair():
+    puzzle = load_puzzle(ROOT / "data/001.json")
+    return puzzle, solve_dlx(puzzle.clone())[0].solution
+
+
+def test_single_pass_verify_detects_each_violation():
+    puzzle, solution = _pair()
+    assert verify(puzzle, solution)
+    swapped = [row[:] for row in solution]
+    swapped[0][0], swapped[0][1] = swapped[0][1], swapped[0][0]  # row still fine, columns broken
+    assert not verify(puzzle, swapped)
+    assert not verify(puzzle, [row[:] for row in solution[:8]])
+    bad = [row[:] for row in solution]
+    bad[4][4] = 0
+    assert not verify(puzzle, bad)
+    # A valid grid that overwrites a given
+    relabel = {v: v % 9 + 1 for v in range(1, 10)}
+    other = [[relabel[v] for v in row] for row in solution]
+    assert not verify(puzzle, other)
+    flat_p = bytes(v for row in puzzle.cells for v in row)
+    assert verify_packed(flat_p, bytes(v for row in solution for v in row))
+    assert verify_packed(bytes(81), bytes(v for row in other for v in row))
+    assert not verify_packed(flat_p, bytes(v for row in other for v in row))
+
+
+def test_verify_batch_reports_failures_by_id(tmp_path):
+    puzzle, solution = _pair()
+    good = format_line(puzzle.cells) + "," + format_line(solution)
+    bad = [row[:] for row in solution]
+    bad[0][0], bad[0][1] = bad[0][1], bad[0][0]
+    src = tmp_path / "pairs.txt"
+    src.write_text("\n".join([good, format_line(puzzle.cells) + "," + format_line(bad), "# note", good[:81], good]) + "\n")
+    for use_numpy in (False, None):
+        out = tmp_path / "fail.jsonl"
+        with out.open("w") as fh:
+            summary = run_verify_batch(iter_pairs(src), fh, chunk=2, use_numpy=use_numpy)
+        fails = [json.loads(line) for line in out.read_text().splitlines()]
+        assert [f["id"] for f in fails] == ["2", "4"]
+        assert fails[0]["reason"] in ("invalid", "givens")
+        assert (summary.pairs, summary.ok, summary.failed) == (4, 2, 2)
+
+
+def test_cli_verifies_solve_batch_output(tmp_path, capsys):
+    out = tmp_path / "results.jsonl"
+    assert main(["solve-batch", str(ROOT / "data/001.json"), "--method", "dlx", "--jobs", "1", "--no-db", "--out", str(out)]) == 0
+    capsys.readouterr()
+    assert main(["verify-batch", str(out), "--puzzles", str(ROOT / "data")]) == 0
+    summary = json.loads(capsys.readouterr().err)["summary"]
+    assert (summary["pairs"], summary["ok"]) == (1, 1)
+    rec = json.loads(out.read_text())
+    rec["solution"][0][0], rec["solution"][0][1] = rec["solution"][0][1], rec["solution"][0][0]
+    out.write_text(json.dumps(rec) + "\n" + json.dumps({"id": "x", "solution": None}) + "\n")
+    assert main(["verify-batch", str(out), "--puzzles", str(ROOT / "data"), "--no-numpy"]) == 1
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["id"] == "001.json"
+    assert json.loads(captured.err)["summary"]["skipped"] == 1
+
+
+def test_verify_batch_mixes_board_sizes(tmp_path):
+    puzzle, solution = _pair()
+    big = load_puzzle(ROOT / "examples/puzzle_16x16.json")
+    big_solution = solve_bitset(big.clone())[0].solution
+    assert verify(big, big_solution)
+    bad = [row[:] for row in big_solution]
+    bad[0][0], bad[1][0] = bad[1][0], bad[0][0]
+    records = [
+        {"id": "a", "grid": big.cells, "solution": big_solution},
+        {"id": "b", "grid": puzzle.cells, "solution": solution},
+        {"id": "c", "grid": big.cells, "solution": bad},
+        {"id": "d", "grid": puzzle.cells, "solution": big_solution},
+    ]
+    src = tmp_path / "pairs.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in records))
+    for use_numpy in (False, None):
+        out = tmp_path / "fail.jsonl"
+        with out.open("w") as fh:
+            summary = run_verify_batch(iter_pairs(src), fh, use_numpy=use_numpy)
+        fails = [json.loads(line) for line in out.read_text().splitlines()]
+        assert [(f["id"], f["reason"]) for f in fails] == [("c", "invalid"), ("d", "size")]
+        assert (summary.pairs, summary.ok) == (4, 2)
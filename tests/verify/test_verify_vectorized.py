@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from sudoku_solver.solver.generator import generate
+from sudoku_solver.verify.verify import verify_packed
+
+np = pytest.importorskip("numpy")
+
+from sudoku_solver.verify.vectorized import verify_batch  # noqa: E402
+
+
+def test_batch_matches_scalar_verifier():
+    puzzles, solutions = [], []
+    rng = random.Random(0)
+    for p in generate(20, seed=2):
+        sol = bytearray(p.solution)
+        kind = rng.randrange(4)
+        if kind == 1:
+            i, j = rng.sample(range(81), 2)
+            sol[i], sol[j] = sol[j], sol[i]
+        elif kind == 2:
+            sol[rng.randrange(81)] = rng.choice([0, 10])
+        puzzles.append(p.puzzle)
+        solutions.append(bytes(sol))
+    got = verify_batch(
+        np.frombuffer(b"".join(puzzles), dtype=np.uint8).reshape(-1, 9, 9),
+        np.frombuffer(b"".join(solutions), dtype=np.uint8).reshape(-1, 9, 9),
+    )
+    assert got.tolist() == [verify_packed(p, s) for p, s in zip(puzzles, solutions)]
+    assert not all(got) and any(got)